@@ -20,6 +20,8 @@
 import base64
 import struct
 
+from numpy import frombuffer, empty
+
 
 def format_blob(blob):
     return base64.b64decode(blob)
@@ -44,4 +46,34 @@ def unpack(blob, fmt='>ff', step=8, decode=False):
 
     return zip(*[struct.unpack(fmt, blob[i:i + step]) for i in xrange(0, len(blob), step)])
 
+def unpack_xy(blob, endianness='>', reverse=False):
+    """
+    decode a blob of packed (x,y) float pairs into two arrays.
+
+    the arrays are views into ``blob``. if ``reverse`` the blob is packed as (y,x)
+
+    @param blob:
+    @param endianness: '>' or '<'
+    @param reverse:
+    @return: xs, ys
+    """
+    if len(blob) % 8:
+        raise ValueError('blob length {} is not a multiple of 8'.format(len(blob)))
+
+    a = frombuffer(blob, dtype='{}f4'.format(endianness)).reshape(-1, 2)
+    xs, ys = a[:, 0], a[:, 1]
+    if reverse:
+        xs, ys = ys, xs
+    return xs, ys
+
+
+def pack_xy(xs, ys, endianness='>'):
+    """
+    encode xs, ys as a blob of packed (x,y) float pairs. inverse of ``unpack_xy``
+    """
+    a = empty((len(xs), 2), dtype='{}f4'.format(endianness))
+    a[:, 0] = xs
+    a[:, 1] = ys
+    return a.tostring()
+
 # ============= EOF =============================================
@@ -0,0 +1,45 @@
+import struct
+import unittest
+
+from numpy import linspace
+
+from pychron.core.helpers.binpack import unpack_xy, pack_xy, unpack
+from pychron.processing.isotope import Isotope
+
+
+class BinpackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.xs = linspace(0, 100, 50)
+        self.ys = linspace(1000, 10, 50) ** 0.5
+        self.blob = ''.join([struct.pack('>ff', x, y) for x, y in zip(self.xs, self.ys)])
+
+    def test_pack(self):
+        self.assertEqual(pack_xy(self.xs, self.ys), self.blob)
+
+    def test_pack_little(self):
+        blob = ''.join([struct.pack('<ff', x, y) for x, y in zip(self.xs, self.ys)])
+        self.assertEqual(pack_xy(self.xs, self.ys, '<'), blob)
+
+    def test_unpack(self):
+        xs, ys = unpack_xy(self.blob)
+        exs, eys = unpack(self.blob)
+        self.assertEqual(list(xs), list(exs))
+        self.assertEqual(list(ys), list(eys))
+
+    def test_unpack_reverse(self):
+        xs, ys = unpack_xy(self.blob, reverse=True)
+        exs, eys = unpack(self.blob)
+        self.assertEqual(list(xs), list(eys))
+        self.assertEqual(list(ys), list(exs))
+
+    def test_unpack_bad_length(self):
+        self.assertRaises(ValueError, unpack_xy, self.blob[:-1])
+
+    def test_isotope_roundtrip(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.unpack_data(self.blob)
+        self.assertEqual(iso.pack(as_hex=False), self.blob)
+
+
+if __name__ == '__main__':
+    unittest.main()
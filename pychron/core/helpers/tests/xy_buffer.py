@@ -0,0 +1,63 @@
+import unittest
+
+from numpy import arange
+
+from pychron.core.helpers.xy_buffer import XYBuffer
+from pychron.processing.isotope import Isotope
+from pychron.processing.isotope_group import IsotopeGroup
+
+
+class XYBufferTestCase(unittest.TestCase):
+    def test_append(self):
+        b = XYBuffer(capacity=2)
+        for i in xrange(100):
+            b.append(i, i * 2)
+
+        self.assertEqual(len(b), 100)
+        self.assertEqual(list(b.xs), range(100))
+        self.assertEqual(list(b.ys), range(0, 200, 2))
+
+    def test_views(self):
+        b = XYBuffer(arange(3.), arange(3.))
+        xs = b.xs
+        for i in xrange(100):
+            b.append(i, i)
+        self.assertEqual(list(xs), [0, 1, 2])
+        self.assertFalse(xs.flags.owndata)
+
+    def test_reserve(self):
+        b = XYBuffer()
+        b.reserve(1000)
+        self.assertEqual(b.capacity, 1000)
+        b.reserve(10)
+        self.assertEqual(b.capacity, 1000)
+
+    def test_isotope(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.set_data([0, 1], [10, 11])
+        iso.reserve(10)
+        for i in xrange(2, 5):
+            iso.append_data(i, 10 + i)
+
+        self.assertEqual(list(iso.xs), [0, 1, 2, 3, 4])
+        self.assertEqual(list(iso.ys), [10, 11, 12, 13, 14])
+        self.assertEqual(iso.n, 5)
+
+        iso.xs = arange(2.)
+        iso.ys = arange(2.)
+        self.assertEqual(list(iso.xs), [0, 1])
+
+    def test_isotope_group(self):
+        ig = IsotopeGroup()
+        ig.isotopes['Ar40'] = iso = Isotope('Ar40', 'H1')
+        ig.reserve(10, 'baseline')
+        for i in xrange(3):
+            self.assertTrue(ig.append_data('Ar40', 'H1', i, i, 'baseline'))
+            self.assertTrue(ig.append_data('Ar40', 'H1', i, i * 2, 'signal'))
+
+        self.assertEqual(list(iso.baseline.ys), [0, 1, 2])
+        self.assertEqual(list(iso.ys), [0, 2, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from numpy import empty
+
+# ============= local library imports  ==========================
+MIN_CAPACITY = 64
+
+
+class XYBuffer(object):
+    """
+    growable buffer of (x,y) pairs.
+
+    capacity is doubled when full so appending n points copies O(n) values in total.
+    ``xs`` and ``ys`` are views of the filled part of the buffer. a point is written
+    before it is counted so views never expose unwritten values and are not changed by later appends
+    """
+
+    def __init__(self, xs=None, ys=None, capacity=0):
+        n = 0 if xs is None else len(xs)
+        self._data = empty((2, max(capacity, n, MIN_CAPACITY)))
+        if n:
+            self._data[0, :n] = xs
+            self._data[1, :n] = ys
+        self._n = n
+
+    @property
+    def xs(self):
+        return self._data[0, :self._n]
+
+    @property
+    def ys(self):
+        return self._data[1, :self._n]
+
+    @property
+    def capacity(self):
+        return self._data.shape[1]
+
+    def append(self, x, y):
+        n = self._n
+        if n == self._data.shape[1]:
+            self._grow(2 * n)
+
+        self._data[0, n] = x
+        self._data[1, n] = y
+        self._n = n + 1
+
+    def reserve(self, capacity):
+        if capacity > self._data.shape[1]:
+            self._grow(capacity)
+
+    def _grow(self, capacity):
+        n = self._n
+        data = empty((2, capacity))
+        data[:, :n] = self._data[:, :n]
+        self._data = data
+
+    def __len__(self):
+        return self._n
+
+# ============= EOF =============================================
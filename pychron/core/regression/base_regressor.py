@@ -83,11 +83,22 @@ class BaseRegressor(HasTraits):
         self.outlier_excluded = []
         self.dirty = True
         if fod.get('filter_outliers', False):
-            for _ in range(fod.get('iterations', 1)):
+            iterations = fod.get('iterations', 1)
+            nsigma = fod.get('std_devs', 2)
+
+            f = self._outlier_filter_factory()
+            if f is not None:
+                outliers = f.filter(iterations, nsigma)
+                if outliers is not None:
+                    self.outlier_excluded = outliers
+                    self.dirty = True
+                    return self.clean_xs, self.clean_ys
+
+            for _ in range(iterations):
                 self.calculate(filtering=True)
 
                 self.dirty = True
-                outliers = self.calculate_outliers(nsigma=fod.get('std_devs', 2))
+                outliers = self.calculate_outliers(nsigma=nsigma)
 
                 self.outlier_excluded = list(set(self.outlier_excluded + list(outliers)))
                 self.dirty = True
@@ -294,6 +305,16 @@ class BaseRegressor(HasTraits):
     def _delete_filtered_hook(self, outliers):
         pass
 
+    def _outlier_filter_factory(self):
+        """
+            return an OutlierFilter used by calculate_filtered_data instead of
+            refitting every iteration. return None to refit
+        """
+        return
+
+    def _get_base_excluded(self):
+        return set(self.user_excluded) ^ set(self.truncate_excluded)
+
     @cached_property
     def _get_pre_clean_xs(self):
         return self._pre_clean_array(self.xs)
@@ -0,0 +1,206 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from collections import namedtuple
+
+from numpy import zeros, ones, einsum, sqrt, where, abs as nabs, linalg, asarray, vander, eye, errstate
+
+# ============= local library imports  ==========================
+from pychron.core.helpers.fits import fit_to_degree
+from pychron.core.regression.outlier_filter import MAX_CONDITION
+
+BatchItem = namedtuple('BatchItem', 'xs ys fit error_type filter_outliers_dict excluded')
+BatchResult = namedtuple('BatchResult', 'value error n fn outliers')
+
+SEM_MSWD = 'SEM, but if MSWD>1 use SEM * sqrt(MSWD)'
+ERROR_TYPES = (None, 'SD', 'SEM', SEM_MSWD)
+CHUNK_SIZE = 2000
+
+
+def batch_fit(items, chunk_size=CHUNK_SIZE):
+    """
+    fit the intercepts (y at x=0) of many small regressions at once.
+
+    items: list of BatchItem. fit is linear, parabolic, cubic or average. excluded are the indices
+    excluded before outlier filtering i.e. user ^ truncate
+
+    items are grouped by fit and padded to a common length so each group is solved with stacked
+    array operations. outlier filtering matches BaseRegressor.calculate_filtered_data and the
+    errors match OLSRegressor/MeanRegressor.predict_error(0) without yserr i.e. the MSWD is undefined
+
+    returns a list of BatchResult, None for the items that cannot be fit in the batch and should be
+    fit individually e.g. too few points, singular fits or unsupported error types
+    """
+    results = [None] * len(items)
+    groups = {}
+    for i, item in enumerate(items):
+        key = _group_key(item)
+        if key is not None:
+            groups.setdefault(key, []).append(i)
+
+    for key, idxs in groups.iteritems():
+        for j in xrange(0, len(idxs), chunk_size):
+            chunk = idxs[j:j + chunk_size]
+            rs = _fit_group(key, [items[k] for k in chunk])
+            for k, r in zip(chunk, rs):
+                results[k] = r
+
+    return results
+
+
+def _group_key(item):
+    if len(item.xs) < 2 or len(item.xs) != len(item.ys):
+        return
+
+    fit = item.fit.lower() if item.fit else ''
+    if 'average' in fit:
+        error_type = item.error_type or 'SEM'
+        key = 0
+    else:
+        error_type = item.error_type
+        try:
+            key = fit_to_degree(fit)
+        except ValueError:
+            return
+
+    if error_type in ERROR_TYPES:
+        return key
+
+
+def _fit_group(degree, items):
+    m = len(items)
+    nmax = max(len(it.xs) for it in items)
+
+    # X, columns scaled by the max |x| of each item to keep X'X well conditioned
+    q = degree + 1
+    X = zeros((m, nmax, q))
+    Y = zeros((m, nmax))
+    valid = zeros((m, nmax), dtype=bool)
+    base = zeros((m, nmax), dtype=bool)
+    iterations = zeros(m, dtype=int)
+    nsigma = ones(m)
+
+    for i, it in enumerate(items):
+        xs = asarray(it.xs, dtype=float)
+        n = xs.shape[0]
+        scale = nabs(xs).max() or 1
+        X[i, :n] = vander(xs / scale, q, increasing=True)
+        Y[i, :n] = it.ys
+        valid[i, :n] = True
+
+        exc = [e for e in it.excluded if 0 <= e < n]
+        base[i, exc] = True
+
+        fod = it.filter_outliers_dict or {}
+        if fod.get('filter_outliers', False):
+            iterations[i] = fod.get('iterations', 1)
+            nsigma[i] = fod.get('std_devs', 2)
+
+    if degree:
+        solve = _solve_ols
+    else:
+        solve = _solve_mean
+
+    outliers = zeros((m, nmax), dtype=bool)
+    ok = ones(m, dtype=bool)
+    it = 0
+    while 1:
+        mask = valid & ~(base ^ outliers)
+        value, var, s, residuals, fok = solve(X, Y, mask)
+        ok &= fok
+
+        active = iterations > it
+        if not active.any():
+            break
+
+        threshold = (s * nsigma)[:, None]
+        if degree:
+            new = nabs(residuals) >= threshold
+        else:
+            new = nabs(residuals) > threshold
+
+        outliers |= new & valid & active[:, None]
+        it += 1
+
+    results = []
+    for i, item in enumerate(items):
+        r = None
+        if ok[i]:
+            error_type = item.error_type
+            if not degree:
+                error_type = error_type or 'SEM'
+
+            if error_type in ('SEM', SEM_MSWD):
+                e = s[i] * sqrt(var[i])
+            elif not degree:
+                e = s[i]
+            else:
+                e = sqrt(s[i] ** 2 + s[i] ** 2 * var[i])
+
+            r = BatchResult(value[i], e, int(valid[i].sum()), int(mask[i].sum()),
+                            list(where(outliers[i])[0]))
+        results.append(r)
+    return results
+
+
+def _solve_ols(X, Y, mask):
+    """
+    solve the stacked normal equations and return the intercept, the normalized variance of the
+    intercept, the standard error of the fit, the residuals of every point and a flag for the items
+    that were solved
+    """
+    m, nmax, q = X.shape
+    w = mask.astype(float)
+    n = w.sum(axis=1)
+
+    xtx = einsum('mni,mn,mnj->mij', X, w, X)
+    xty = einsum('mni,mn,mn->mi', X, w, Y)
+
+    with errstate(divide='ignore', invalid='ignore'):
+        ok = (n > q) & (linalg.cond(xtx) < MAX_CONDITION)
+    xtx[~ok] = eye(q)
+
+    beta = linalg.solve(xtx, xty[..., None])[..., 0]
+
+    # refine once against the clean points
+    r = (Y - einsum('mni,mi->mn', X, beta)) * w
+    beta += linalg.solve(xtx, einsum('mni,mn->mi', X, r)[..., None])[..., 0]
+
+    residuals = Y - einsum('mni,mi->mn', X, beta)
+    dof = (n - q).clip(1)
+    s = sqrt((residuals ** 2 * w).sum(axis=1) / dof)
+
+    # column 0 is not scaled so this is covar[0, 0] of the unscaled fit
+    var = linalg.inv(xtx)[:, 0, 0]
+    return beta[:, 0], var, s, residuals, ok
+
+
+def _solve_mean(X, Y, mask):
+    w = mask.astype(float)
+    n = w.sum(axis=1)
+    ok = n > 1
+    nn = n.clip(1)
+
+    mean = (Y * w).sum(axis=1) / nn
+    residuals = Y - mean[:, None]
+    s = sqrt((residuals ** 2 * w).sum(axis=1) / (n - 1).clip(1))
+
+    # the standard error of the mean is std/sqrt(n)
+    return mean, 1 / nn, s, residuals, ok
+
+# ============= EOF =============================================
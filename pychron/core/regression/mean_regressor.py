@@ -19,6 +19,7 @@
 from numpy import average, ones, asarray, where
 # ============= local library imports  ==========================
 from base_regressor import BaseRegressor
+from pychron.core.regression.outlier_filter import make_mean_filter
 from pychron.core.helpers.formatting import floatfmt
 
 
@@ -150,6 +151,9 @@ sem={}
     def calculate_standard_error_fit(self):
         return self.std
 
+    def _outlier_filter_factory(self):
+        return make_mean_filter(self.ys, self._get_base_excluded())
+
     def _check_integrity(self, x, y):
         nx, ny = x.shape[0], y.shape[0]
         if not nx or not ny:
@@ -181,5 +185,8 @@ class WeightedMeanRegressor(MeanRegressor):
         if self._check_integrity(e, e):
             return 1 / e ** 2
 
+    def _outlier_filter_factory(self):
+        return make_mean_filter(self.ys, self._get_base_excluded(), self.yserr)
+
 
 # ============= EOF =============================================
@@ -59,6 +59,10 @@ class YorkRegressor(OLSRegressor):
         self._calculate_correlation_coefficients()
         self._calculate()
 
+    def _outlier_filter_factory(self):
+        # outliers are relative to the york fit so refit every iteration
+        return
+
     def _calculate_correlation_coefficients(self):
 
         if len(self.xds):
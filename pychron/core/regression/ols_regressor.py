@@ -18,7 +18,7 @@
 import logging
 
 from numpy import asarray, column_stack, ones, \
-    matrix, sqrt, dot, linalg, zeros_like, hstack
+    sqrt, dot, linalg, zeros_like, hstack, einsum
 from statsmodels.api import OLS
 from traits.api import Int, Property
 
@@ -26,6 +26,7 @@ logger = logging.getLogger('Regressor')
 
 # ============= local library imports  ==========================
 from base_regressor import BaseRegressor
+from pychron.core.regression.outlier_filter import OLSOutlierFilter
 
 
 class OLSRegressor(BaseRegressor):
@@ -176,16 +177,24 @@ class OLSRegressor(BaseRegressor):
         Xbar = xs.mean()
         n = float(xs.shape[0])
 
-        def calc_error(Xk):
-            a = 1 / n + (Xk - Xbar) ** 2 / ((xs - Xbar) ** 2).sum()
-            if error_calc == 'sem':
-                var_Ypred = s * s * a
-            else:
-                var_Ypred = s * s * (1 + a)
+        a = 1 / n + (asarray(x) - Xbar) ** 2 / ((xs - Xbar) ** 2).sum()
+        if error_calc == 'sem':
+            var_Ypred = s * s * a
+        else:
+            var_Ypred = s * s * (1 + a)
 
-            return sqrt(var_Ypred)
+        return sqrt(var_Ypred)
+
+    def predict_variance(self, x):
+        """
+            return the variance of the predicted mean response at each x, normalized by the
+            variance of the fit, i.e. the diagonal of X*covar*X' without forming the full matrix
 
-        return [calc_error(xi) for xi in x]
+            X is the design matrix of x, one row (1, x, x**2...x) per point
+
+        """
+        X = self._get_X(self._get_prediction_xs(x))
+        return einsum('ij,jk,ik->i', X, self.var_covar, X)
 
     def predict_error_matrix(self, x, error_calc='SEM'):
         """
@@ -196,38 +205,21 @@ class OLSRegressor(BaseRegressor):
 
         """
         x = asarray(x)
-        sef = self.calculate_standard_error_fit()
-
-        def calc_hat(xi):
-            Xk = self._get_X(xi).T
-
-            covarM = matrix(self.var_covar)
-            varY_hat = (Xk.T * covarM * Xk)
+        if not self._result:
+            return zeros_like(x)
 
-            return varY_hat[0, 0]
+        sef = self.calculate_standard_error_fit()
+        varY_hat = self.predict_variance(x)
 
         if error_calc == 'SEM':
-            def func(xi):
-                varY_hat = calc_hat(xi)
-                return sef * sqrt(varY_hat)
+            e = sef * sqrt(varY_hat)
         elif error_calc == 'SEM, but if MSWD>1 use SEM * sqrt(MSWD)':
             mswd = self.mswd
-
-            def func(xi):
-                varY_hat = calc_hat(xi)
-                m = mswd ** 0.5 if mswd > 1 else 1
-                return sef * sqrt(varY_hat) * m
+            m = mswd ** 0.5 if mswd > 1 else 1
+            e = sef * sqrt(varY_hat) * m
         else:
-            def func(xi):
-                varY_hat = calc_hat(xi)
-                return sqrt(sef ** 2 + sef ** 2 * varY_hat)
-
-        if not self._result:
-            return zeros_like(x)
-        else:
-            return [func(xi) for xi in x]
-            # func = calc_sem if error_calc == 'SEM' else calc_sd
-            # return [func(xi) for xi in x]
+            e = sqrt(sef ** 2 + sef ** 2 * varY_hat)
+        return e
 
     def predict_error_al(self, x, error_calc='sem'):
         """
@@ -236,29 +228,21 @@ class OLSRegressor(BaseRegressor):
             only here for verification
 
         """
-        cov_varM = matrix(self.var_covar)
         se = self.calculate_standard_error_fit()
 
-        def predict_yi_err(xi):
-            """
-                bx= x**0,x**1,x**n where n= degree of fit linear=2, parabolic=3 etc
-            """
-            bx = asarray([pow(xi, i) for i in range(self.degree + 1)])
-            bx_covar = bx * cov_varM
-            bx_covar = asarray(bx_covar)[0]
-            var = sum(bx * bx_covar)
-            #            print var
-            s = se * var ** 0.5
-            if error_calc == 'sd':
-                s = (se ** 2 + s ** 2) ** 0.5
-
-            return s
-
         if isinstance(x, (float, int)):
             x = [x]
         x = asarray(x)
 
-        return [predict_yi_err(xi) for xi in x]
+        # bx= x**0,x**1,x**n where n= degree of fit linear=2, parabolic=3 etc
+        bx = column_stack([pow(x, i) for i in xrange(self.degree + 1)])
+        var = (dot(bx, self.var_covar) * bx).sum(axis=1)
+
+        s = se * var ** 0.5
+        if error_calc == 'sd':
+            s = (se ** 2 + s ** 2) ** 0.5
+
+        return s
 
         # def calculate_y(self, x):
         #     coeffs = self.coefficients
@@ -291,6 +275,11 @@ class OLSRegressor(BaseRegressor):
     def _engine_factory(self, fy, X, check_integrity=True):
         return OLS(fy, X)
 
+    def _outlier_filter_factory(self):
+        X = self._get_X(self.xs)
+        if X is not None and len(X) == len(self.ys):
+            return OLSOutlierFilter(X, self.ys, self._get_base_excluded())
+
     def _get_degree(self):
         return self._degree
 
@@ -321,6 +310,9 @@ class OLSRegressor(BaseRegressor):
     def _set_fit(self, v):
         self._set_degree(v)
 
+    def _get_prediction_xs(self, x):
+        return asarray(x)
+
     def _get_X(self, xs=None):
         """
             returns X matrix
@@ -353,6 +345,13 @@ class MultipleLinearRegressor(OLSRegressor):
         X=array(xy)
     """
 
+    def _get_prediction_xs(self, x):
+        """
+            flatten x so that [(x1,y1),...] and [[(x1,y1)],...] both give one row per point
+        """
+        x = asarray(x)
+        return x.reshape(-1, x.shape[-1])
+
     def _get_X(self, xs=None):
         if xs is None:
             xs = self.clean_xs
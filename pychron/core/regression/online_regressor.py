@@ -0,0 +1,128 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from numpy import zeros, arange, linalg, dot
+
+# ============= local library imports  ==========================
+from pychron.core.regression.outlier_filter import MAX_CONDITION
+
+MAX_DEGREE = 3
+POWERS = arange(2 * MAX_DEGREE + 1)
+
+
+class OnlineRegressor(object):
+    """
+    polynomial least squares fit updated one point at a time.
+
+    keeps the power sums of x and x*y up to MAX_DEGREE, so a point is added in O(1) and
+    any fit from average (degree 0) to cubic can be evaluated at any time.
+
+    x is scaled by a running maximum to keep the sums well conditioned and y is shifted by the
+    first value to limit cancellation in the sum of squares.
+
+    the state is replaced, not modified, when a point is added so predictions can be made
+    from another thread while points are added. outliers are not filtered
+    """
+
+    def __init__(self, xs=None, ys=None):
+        self._y0 = None
+        # n, sum(u**k), sum(u**k * dy), sum(dy**2), scale where u=x/scale and dy=y-y0
+        self._state = (0, zeros(2 * MAX_DEGREE + 1), zeros(MAX_DEGREE + 1), 0, 0)
+        self._cache = (None, {})
+
+        if xs is not None:
+            for x, y in zip(xs, ys):
+                self.add(x, y)
+
+    @property
+    def n(self):
+        return self._state[0]
+
+    def add(self, x, y):
+        if self._y0 is None:
+            self._y0 = y
+
+        n, sx, sxy, syy, scale = self._state
+        ax = abs(x)
+        if ax > scale:
+            rs = (scale / (2. * ax)) ** POWERS
+            sx = sx * rs
+            sxy = sxy * rs[:MAX_DEGREE + 1]
+            scale = 2. * ax
+
+        u = x / scale if scale else 0
+        dy = y - self._y0
+        us = u ** POWERS
+
+        self._state = (n + 1, sx + us, sxy + us[:MAX_DEGREE + 1] * dy, syy + dy * dy, scale)
+
+    def predict(self, x, degree):
+        r = self._solve(degree)
+        if r is not None:
+            beta, covar, sef, scale = r
+            return dot(self._get_xk(x, degree, scale), beta) + self._y0
+
+    def predict_error(self, x, degree, error_calc='SEM'):
+        """
+            matches OLSRegressor.predict_error for degree>0 and MeanRegressor.predict_error for degree=0
+        """
+        r = self._solve(degree)
+        if r is not None:
+            beta, covar, sef, scale = r
+            xk = self._get_xk(x, degree, scale)
+            var = dot(dot(xk, covar), xk)
+
+            if error_calc in ('SEM', 'SEM, but if MSWD>1 use SEM * sqrt(MSWD)'):
+                return sef * var ** 0.5
+            elif degree == 0:
+                return sef
+            else:
+                return (sef ** 2 + sef ** 2 * var) ** 0.5
+
+    def _get_xk(self, x, degree, scale):
+        u = x / scale if scale else 0
+        return u ** POWERS[:degree + 1]
+
+    def _solve(self, degree):
+        state = self._state
+        cstate, cache = self._cache
+        if cstate is not state:
+            cache = {}
+            self._cache = (state, cache)
+        elif degree in cache:
+            return cache[degree]
+
+        n, sx, sxy, syy, scale = state
+        q = degree + 1
+        r = None
+        if n > q:
+            a = zeros((q, q))
+            for i in xrange(q):
+                a[i] = sx[i:i + q]
+
+            if linalg.cond(a) < MAX_CONDITION:
+                covar = linalg.inv(a)
+                b = sxy[:q]
+                beta = dot(covar, b)
+                ss = max(syy - dot(beta, b), 0)
+                r = beta, covar, (ss / (n - q)) ** 0.5, scale
+
+        cache[degree] = r
+        return r
+
+# ============= EOF =============================================
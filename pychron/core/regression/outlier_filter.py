@@ -0,0 +1,183 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from numpy import asarray, ones, zeros, where, dot, abs as nabs, isfinite, linalg
+
+# ============= local library imports  ==========================
+MAX_CONDITION = 1e12
+
+
+class OutlierFilter(object):
+    """
+    iterative outlier filter that keeps the sufficient statistics of the clean points up to date
+    instead of refitting from scratch every iteration.
+
+    reproduces BaseRegressor.calculate_filtered_data, i.e. the points excluded are
+    user ^ truncate ^ outliers and outliers accumulate over the iterations.
+
+    ``filter`` returns None if the fit is degenerate and the caller should fall back to
+    a full refit
+    """
+
+    def __init__(self, n, excluded):
+        self._n = n
+        self._excluded = set(excluded)
+        self._mask = self._make_mask([])
+        self._update(where(self._mask)[0], 1)
+
+    def filter(self, iterations=1, nsigma=2):
+        outliers = []
+        for _ in xrange(iterations):
+            idx = self._calculate_outliers(nsigma)
+            if idx is None:
+                return
+
+            outliers = list(set(outliers + list(idx)))
+            self._set_mask(self._make_mask(outliers))
+
+        return outliers
+
+    def _make_mask(self, outliers):
+        mask = ones(self._n, dtype=bool)
+        exc = [i for i in self._excluded ^ set(outliers) if 0 <= i < self._n]
+        mask[exc] = False
+        return mask
+
+    def _set_mask(self, mask):
+        added = where(mask & ~self._mask)[0]
+        removed = where(self._mask & ~mask)[0]
+        if len(added):
+            self._update(added, 1)
+        if len(removed):
+            self._update(removed, -1)
+        self._mask = mask
+
+    def _update(self, idx, sign):
+        raise NotImplementedError
+
+    def _calculate_outliers(self, nsigma):
+        raise NotImplementedError
+
+
+class OLSOutlierFilter(OutlierFilter):
+    """
+    X'X and X'y are updated with the rows entering or leaving the fit so each iteration is a
+    (q x q) solve. columns of X are scaled to unit max to keep X'X well conditioned and the solution
+    is refined once against the clean points so the coefficients match a full least squares fit
+    """
+
+    def __init__(self, X, ys, excluded):
+        X = asarray(X, dtype=float)
+        scale = nabs(X).max(axis=0)
+        scale[scale == 0] = 1
+
+        self._X = X / scale
+        self._ys = asarray(ys, dtype=float)
+
+        q = X.shape[1]
+        self._xtx = zeros((q, q))
+        self._xty = zeros(q)
+        super(OLSOutlierFilter, self).__init__(len(self._ys), excluded)
+
+    def _update(self, idx, sign):
+        x = self._X[idx]
+        self._xtx += sign * dot(x.T, x)
+        self._xty += sign * dot(x.T, self._ys[idx])
+
+    def _calculate_outliers(self, nsigma):
+        X, ys, mask = self._X, self._ys, self._mask
+        n = mask.sum()
+        q = X.shape[1]
+        if n <= q or linalg.cond(self._xtx) > MAX_CONDITION:
+            return
+
+        xtx = self._xtx
+        beta = linalg.solve(xtx, self._xty)
+
+        cx, cy = X[mask], ys[mask]
+        beta += linalg.solve(xtx, dot(cx.T, cy - dot(cx, beta)))
+
+        # residuals for every point not just the clean points
+        residuals = ys - dot(X, beta)
+        s = ((residuals[mask] ** 2).sum() / (n - q)) ** 0.5
+        return where(nabs(residuals) >= s * nsigma)[0]
+
+
+class MeanOutlierFilter(OutlierFilter):
+    """
+    running sums of the clean points. values are shifted by their mean to avoid
+    cancellation when the spread is small relative to the values
+    """
+
+    def __init__(self, ys, excluded, weights=None):
+        ys = asarray(ys, dtype=float)
+        self._ys = ys
+        self._c = ys.mean() if len(ys) else 0
+        self._d = ys - self._c
+        self._weights = weights
+
+        self._sn = 0
+        self._s1 = 0
+        self._s2 = 0
+        self._sw = 0
+        self._swd = 0
+        super(MeanOutlierFilter, self).__init__(len(ys), excluded)
+
+    def _update(self, idx, sign):
+        d = self._d[idx]
+        self._sn += sign * len(idx)
+        self._s1 += sign * d.sum()
+        self._s2 += sign * (d * d).sum()
+        if self._weights is not None:
+            w = self._weights[idx]
+            self._sw += sign * w.sum()
+            self._swd += sign * (w * d).sum()
+
+    def _calculate_outliers(self, nsigma):
+        n = self._sn
+        if n < 2:
+            return
+
+        if self._weights is not None:
+            m = self._swd / self._sw
+        else:
+            m = self._s1 / n
+
+        var = (self._s2 - self._s1 ** 2 / n) / (n - 1)
+        std = max(var, 0) ** 0.5
+        return where(nabs(self._d - m) > std * nsigma)[0]
+
+
+def make_mean_filter(ys, excluded, yserr=None):
+    """
+    return a MeanOutlierFilter weighted by ``yserr`` if given.
+
+    return None if the weights are unusable
+    """
+    weights = None
+    if yserr is not None and len(yserr):
+        yserr = asarray(yserr, dtype=float)
+        if len(yserr) != len(ys):
+            return
+        weights = yserr ** -2
+        if not isfinite(weights).all():
+            return
+
+    return MeanOutlierFilter(ys, excluded, weights)
+
+# ============= EOF =============================================
@@ -21,12 +21,15 @@
 # ============= standard library imports ========================
 from unittest import TestCase
 
-from numpy import linspace, polyval
+from numpy import linspace, polyval, dot, sqrt
+from numpy.random import RandomState
 
 # ============= local library imports  ==========================
-from pychron.core.regression.mean_regressor import MeanRegressor  #, WeightedMeanRegressor
+from pychron.core.regression.mean_regressor import MeanRegressor, WeightedMeanRegressor
 from pychron.core.regression.new_york_regressor import ReedYorkRegressor, NewYorkRegressor
-from pychron.core.regression.ols_regressor import OLSRegressor
+from pychron.core.regression.batch_regressor import batch_fit, BatchItem
+from pychron.core.regression.ols_regressor import OLSRegressor, PolynomialRegressor
+from pychron.core.regression.online_regressor import OnlineRegressor
 # from pychron.core.regression.york_regressor import YorkRegressor
 from pychron.core.regression.tests.standard_data import mean_data, filter_data, ols_data, pearson
 
@@ -103,6 +106,21 @@ class OLSRegressionTest2(RegressionTestCase, TestCase):
                                       self.reg.coefficients[::-1])),
                              self.solution['coefficients'])
 
+    def testPredictErrorMatrix(self):
+        reg = self.reg
+        sef = reg.calculate_standard_error_fit()
+        covar = reg.var_covar
+        xs = linspace(-10, 110, 25)
+        es = reg.predict_error_matrix(xs, error_calc='SEM')
+        for xk, ei in zip(reg.get_exog(xs), es):
+            self.assertAlmostEqual(ei, sef * sqrt(dot(dot(xk, covar), xk)))
+
+    def testPredictErrorAl(self):
+        xs = linspace(-10, 110, 25)
+        for a, b in zip(self.reg.predict_error(xs, error_calc='SD'),
+                        self.reg.predict_error_al(xs, error_calc='sd')):
+            self.assertAlmostEqual(a, b)
+
 class FilterOLSRegressionTest(RegressionTestCase, TestCase):
     reg_klass = OLSRegressor
 
@@ -127,6 +145,151 @@ class FilterOLSRegressionTest(RegressionTestCase, TestCase):
         self.assertAlmostEqual(e, self.solution['pred_error'], 3)
 
 
+class RefitOLSRegressor(OLSRegressor):
+    def _outlier_filter_factory(self):
+        return
+
+
+class RefitMeanRegressor(MeanRegressor):
+    def _outlier_filter_factory(self):
+        return
+
+
+class RefitWeightedMeanRegressor(WeightedMeanRegressor):
+    def _outlier_filter_factory(self):
+        return
+
+
+class OutlierFilterTest(TestCase):
+    """
+    the outlier filters must exclude the same points as refitting every iteration
+    """
+
+    def setUp(self):
+        self.rs = RandomState(12345)
+
+    def _make_data(self, n=50):
+        rs = self.rs
+        xs = linspace(0, 100, n)
+        ys = 10 + 0.1 * xs - 0.001 * xs ** 2 + rs.normal(0, 0.5, n)
+        ys[rs.randint(0, n, 4)] += rs.normal(0, 5, 4)
+        return xs, ys, rs.uniform(0.1, 1, n)
+
+    def _assert_same(self, klass, refit_klass, **kw):
+        for i in range(20):
+            xs, ys, es = self._make_data()
+            fod = {'filter_outliers': True, 'iterations': 1 + i % 4, 'std_devs': 1 + i % 3}
+            ue = list(self.rs.randint(0, len(xs), i % 3))
+            a, b = klass(**kw), refit_klass(**kw)
+            for r in (a, b):
+                r.trait_set(xs=xs, ys=ys, yserr=es, user_excluded=ue, filter_outliers_dict=fod)
+                r.calculate()
+
+            self.assertEqual(sorted(a.outlier_excluded), sorted(b.outlier_excluded))
+            for ca, cb in zip(a.coefficients, b.coefficients):
+                self.assertAlmostEqual(ca, cb)
+
+    def test_linear(self):
+        self._assert_same(OLSRegressor, RefitOLSRegressor, fit='linear')
+
+    def test_parabolic(self):
+        self._assert_same(OLSRegressor, RefitOLSRegressor, fit='parabolic')
+
+    def test_mean(self):
+        self._assert_same(MeanRegressor, RefitMeanRegressor)
+
+    def test_weighted_mean(self):
+        self._assert_same(WeightedMeanRegressor, RefitWeightedMeanRegressor)
+
+
+class BatchRegressorTest(TestCase):
+    """
+    batch fits must match fitting each item with its own regressor
+    """
+
+    def setUp(self):
+        rs = RandomState(12345)
+        items = []
+        for i in range(48):
+            n = rs.randint(10, 60)
+            xs = linspace(5, 400, n)
+            ys = 100 + 0.1 * xs - 0.0001 * xs ** 2 + rs.normal(0, 0.5, n)
+            ys[rs.randint(0, n, 2)] += rs.normal(0, 5, 2)
+
+            fit = ('linear', 'parabolic', 'cubic', 'average')[i % 4]
+            error_type = ('SEM', 'SD', None)[i % 3]
+            fod = {'filter_outliers': bool(i % 5), 'iterations': 1 + i % 3, 'std_devs': 2}
+            items.append(BatchItem(xs, ys, fit, error_type, fod, list(rs.randint(0, n, i % 2))))
+        self.items = items
+
+    def _fit(self, item):
+        if item.fit == 'average':
+            reg = MeanRegressor(error_calc_type=item.error_type or 'SEM')
+        else:
+            reg = PolynomialRegressor(error_calc_type=item.error_type)
+            reg.set_degree(item.fit, refresh=False)
+
+        reg.trait_set(xs=item.xs, ys=item.ys, user_excluded=item.excluded,
+                      filter_outliers_dict=item.filter_outliers_dict)
+        reg.calculate()
+        return reg
+
+    def test_batch(self):
+        for item, r in zip(self.items, batch_fit(self.items, chunk_size=5)):
+            reg = self._fit(item)
+            self.assertAlmostEqual(r.value, reg.predict(0))
+            self.assertAlmostEqual(r.error, reg.predict_error(0))
+            self.assertEqual(r.fn, reg.clean_xs.shape[0])
+            self.assertEqual(sorted(r.outliers), sorted(reg.outlier_excluded))
+
+    def test_degenerate(self):
+        xs = linspace(0, 1, 3)
+        items = [BatchItem(xs, xs, 'cubic', 'SEM', {}, []),
+                 BatchItem(xs[:1], xs[:1], 'linear', 'SEM', {}, []),
+                 BatchItem(xs, xs, 'exponential', 'SEM', {}, []),
+                 BatchItem(xs, xs, 'linear', 'CI', {}, [])]
+        self.assertEqual(batch_fit(items), [None, None, None, None])
+
+
+class OnlineRegressorTest(TestCase):
+    """
+    online fits must match fitting all the points at once
+    """
+
+    def setUp(self):
+        rs = RandomState(12345)
+        self.xs = xs = linspace(0.5, 450, 200)
+        self.ys = 1000 - 0.2 * xs + 1e-4 * xs ** 2 + rs.normal(0, 0.05, 200)
+
+        reg = OnlineRegressor()
+        for x, y in zip(self.xs, self.ys):
+            reg.add(x, y)
+        self.reg = reg
+
+    def test_polynomial(self):
+        for degree in (1, 2):
+            reg = PolynomialRegressor(xs=self.xs - 3, ys=self.ys)
+            reg.set_degree(degree)
+            reg.calculate()
+
+            self.assertAlmostEqual(self.reg.predict(3, degree), reg.predict(0))
+            for ec in ('SEM', 'SD'):
+                self.assertAlmostEqual(self.reg.predict_error(3, degree, ec), reg.predict_error(0, error_calc=ec))
+
+    def test_mean(self):
+        reg = MeanRegressor(xs=self.xs, ys=self.ys)
+        reg.calculate()
+
+        self.assertAlmostEqual(self.reg.predict(0, 0), reg.predict(0))
+        for ec in ('SEM', 'SD'):
+            self.assertAlmostEqual(self.reg.predict_error(0, 0, ec), reg.predict_error(0, error_calc=ec))
+
+    def test_too_few(self):
+        reg = OnlineRegressor([1, 2, 3], [1, 2, 4])
+        self.assertIsNone(reg.predict(0, 2))
+        self.assertIsNotNone(reg.predict(0, 1))
+
+
 class PearsonRegressionTest(RegressionTestCase):
     kind = ''
     def setUp(self):
@@ -49,6 +49,10 @@ class WeightedPolynomialRegressor(OLSRegressor):
     def _delete_filtered_hook(self, outliers):
         self.yserr = delete(self.yserr, outliers)
 
+    def _outlier_filter_factory(self):
+        # weighted fits are refit every iteration
+        return
+
     def _engine_factory(self, fy, X, check_integrity=True):
         ws = self._get_weights()
         if not self._check_integrity(fy, X, ws):
@@ -16,44 +16,46 @@
 
 # ============= enthought library imports =======================
 # ============= standard library imports ========================
-from numpy import zeros, percentile, array
-from scipy.stats import norm
+from numpy import zeros, percentile, asarray
+from numpy.random import RandomState
+
 # ============= local library imports  ==========================
+CHUNK_SIZE = 1000
+
 
+def monte_carlo_error_estimation(reg, nominal_ys, pts, ntrials=100, seed=None, chunk_size=CHUNK_SIZE):
+    """
+        estimate the error of the predicted values at ``pts`` by refitting ``reg`` to ``ntrials``
+        gaussian perturbations of its ys (scaled by yserr).
 
-def monte_carlo_error_estimation(reg, nominal_ys, pts, ntrials=100):
+        all trials are solved at once with reg.fast_predict2. pts are processed in chunks of ``chunk_size``
+        so memory is bounded by ntrials * chunk_size
+
+        seed: seed for the random number generator. use to make the estimate reproducible
+    """
     exog = reg.get_exog(pts)
+    nominal_ys = asarray(nominal_ys)
     ys = reg.ys
     yserr = reg.yserr
-    n = len(ys)
-    yes = array((ys, yserr)).T
-    ga = norm().rvs((ntrials, n))
-    yp = zeros(n)
-    res = zeros((ntrials, len(pts)))
 
-    pred = reg.fast_predict2
-    for i in xrange(ntrials):
-        res[i] = perturb(pred, exog, nominal_ys, yes, ga[i], yp)
+    rs = RandomState(seed)
+    # ntrials x n perturbed ys
+    yp = ys + yserr * rs.standard_normal((ntrials, len(ys)))
 
-    res = res.T
-    ret = zeros(len(pts))
+    npts = len(pts)
+    ret = zeros(npts)
     pct = (15.87, 84.13)
-    for i, po in enumerate(pts):
-        ri = res[i]
-        ai, bi = percentile(ri, pct)
-        ret[i] = (abs(ai) + abs(bi)) * 0.5
+    pred = reg.fast_predict2
+    for i in xrange(0, npts, chunk_size):
+        j = i + chunk_size
+        # npts x ntrials
+        res = nominal_ys[i:j, None] - pred(yp.T, exog[i:j])
+        a, b = percentile(res, pct, axis=1)
+        ret[i:j] = (abs(a) + abs(b)) * 0.5
 
     return ret
 
 
-def perturb(pred, exog, nominal_ys, y_es, ga, yp):
-    for i, (y, e) in enumerate(y_es):
-        yp[i] = y + e * ga[i]
-
-    pys = pred(yp, exog)
-    return nominal_ys - pys
-
-
 # if __name__ == '__main__':
 #     from pychron.core.regression.flux_regressor import PlaneFluxRegressor
 #     from pychron.core.codetools.simple_timeit import timethis
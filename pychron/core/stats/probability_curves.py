@@ -19,41 +19,93 @@
 # ============= standard library imports ========================
 from math import pi
 
-from numpy import linspace, zeros, ones, exp
+from numpy import linspace, zeros, exp, asarray, arange, bincount, searchsorted, argsort, maximum
 
 
 # ============= local library imports  ==========================
+# maximum number of (age, bin) pairs evaluated at once
+CHUNK_SIZE = 1000000
 
 
-def cumulative_probability(ages, errors, xmi, xma, n=100):
+def _valid(ages, errors):
+    ages = asarray(ages, dtype=float)
+    errors = asarray(errors, dtype=float)
+    idx = (abs(ages) >= 1e-10) & (abs(errors) >= 1e-10)
+    return ages[idx], errors[idx]
+
+
+def cumulative_probability(ages, errors, xmi, xma, n=100, nsigma=None):
+    """
+        sum of the gaussian probability curves of ages +/- errors evaluated at n bins between xmi and xma
+
+        p=1/(2*pi*sigma2) *exp (-(x-u)**2)/(2*sigma2)
+        see http://en.wikipedia.org/wiki/Normal_distribution
+
+        if nsigma is not None each curve is only evaluated at the bins within nsigma errors of its age.
+        nsigma=6 changes the curve by less than 1e-7 of the height of a single peak
+    """
     bins = linspace(xmi, xma, n)
     probs = zeros(n)
 
-    for ai, ei in zip(ages, errors):
-        if abs(ai) < 1e-10 or abs(ei) < 1e-10:
-            continue
+    ages, errors = _valid(ages, errors)
+    if not ages.shape[0]:
+        return bins, probs
+
+    if nsigma is None:
+        step = max(1, CHUNK_SIZE / n)
+        for i in xrange(0, ages.shape[0], step):
+            a = ages[i:i + step, None]
+            es2 = 2 * errors[i:i + step, None] ** 2
+            gs = (es2 * pi) ** -0.5 * exp(-(bins - a) ** 2 / es2)
+            probs += gs.sum(axis=0)
+    else:
+        # sort by error so the windows in a chunk are similar widths
+        idx = argsort(errors)
+        ages, errors = ages[idx], errors[idx]
+
+        lo = searchsorted(bins, ages - nsigma * errors)
+        hi = searchsorted(bins, ages + nsigma * errors, side='right')
+        width = maximum.accumulate((hi - lo).clip(1))
+
+        i, m = 0, ages.shape[0]
+        while i < m:
+            # largest chunk whose padded window (k ages x widest window) fits in CHUNK_SIZE
+            ws = width[i:]
+            k = max(1, searchsorted(arange(1, m - i + 1) * ws, CHUNK_SIZE, side='right'))
+            j = i + k
+            w = ws[k - 1]
+
+            a = ages[i:j, None]
+            es2 = 2 * errors[i:j, None] ** 2
+
+            bi = lo[i:j, None] + arange(w)
+            valid = bi < hi[i:j, None]
+            bi = bi.clip(0, n - 1)
+
+            gs = (es2 * pi) ** -0.5 * exp(-(bins[bi] - a) ** 2 / es2)
+            probs += bincount(bi[valid], weights=gs[valid], minlength=n)
+            i = j
 
-        # calculate probability curve for ai+/-ei
-        # p=1/(2*pi*sigma2) *exp (-(x-u)**2)/(2*sigma2)
-        # see http://en.wikipedia.org/wiki/Normal_distribution
-        ds = (ones(n) * ai - bins) ** 2
-        es = ones(n) * ei
-        es2 = 2 * es * es
-        gs = (es2 * pi) ** -0.5 * exp(-ds / es2)
+    return bins, probs
 
-        # cumulate probabilities
-        # numpy element_wise addition
-        probs += gs
 
-    return bins, probs
+def kernel_density(ages, errors, xmi, xma, n=100, bw_method=None):
+    """
+        gaussian kernel density estimate of ages evaluated at n bins between xmi and xma.
 
+        the density is scaled by the number of ages so its area matches cumulative_probability.
+        errors are only used to exclude invalid ages. fewer than two distinct ages fall back to
+        cumulative_probability
+    """
+    from scipy.stats import gaussian_kde
 
-def kernel_density(self, ages, errors, xmi, xma, n=100):
-    from scipy.stats.kde import gaussian_kde
+    ages, errors = _valid(ages, errors)
+    if ages.shape[0] < 2 or ages.min() == ages.max():
+        return cumulative_probability(ages, errors, xmi, xma, n=n)
 
-    pdf = gaussian_kde(ages)
+    pdf = gaussian_kde(ages, bw_method=bw_method)
     x = linspace(xmi, xma, n)
-    y = pdf(x)
+    y = pdf(x) * ages.shape[0]
 
     return x, y
 
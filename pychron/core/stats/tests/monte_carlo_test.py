@@ -0,0 +1,52 @@
+from numpy import array, linspace, meshgrid, percentile, zeros
+from numpy.random import RandomState
+
+from pychron.core.regression.flux_regressor import PlaneFluxRegressor
+from pychron.core.stats.monte_carlo import monte_carlo_error_estimation
+
+__author__ = 'ross'
+
+import unittest
+
+
+class MonteCarloTestCase(unittest.TestCase):
+    def setUp(self):
+        rs = RandomState(123)
+        x, y = meshgrid(linspace(-1, 1, 5), linspace(-1, 1, 5))
+        xy = array((x.ravel(), y.ravel())).T
+        j = 0.01 + 0.001 * xy[:, 0] - 0.0005 * xy[:, 1] + rs.normal(0, 1e-5, len(xy))
+        je = j * 0.001
+
+        reg = PlaneFluxRegressor(xs=xy, ys=j, yserr=je, error_calc_type='SD')
+        reg.calculate()
+        self.reg = reg
+        self.pts = rs.uniform(-1, 1, (40, 2))
+        self.nominals = reg.predict(self.pts)
+
+    def test_trials(self):
+        """
+        match refitting each trial individually with the same perturbations
+        """
+        reg, pts = self.reg, self.pts
+        ntrials = 50
+        exog = reg.get_exog(pts)
+        ga = RandomState(1).standard_normal((ntrials, len(reg.ys)))
+
+        res = zeros((ntrials, len(pts)))
+        for i in xrange(ntrials):
+            res[i] = self.nominals - reg.fast_predict2(reg.ys + reg.yserr * ga[i], exog)
+        a, b = percentile(res, (15.87, 84.13), axis=0)
+        expected = (abs(a) + abs(b)) * 0.5
+
+        errors = monte_carlo_error_estimation(reg, self.nominals, pts, ntrials=ntrials, seed=1, chunk_size=7)
+        for e, ee in zip(errors, expected):
+            self.assertAlmostEqual(e, ee)
+
+    def test_seed(self):
+        a = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=100, seed=5)
+        b = monte_carlo_error_estimation(self.reg, self.nominals, self.pts, ntrials=100, seed=5)
+        self.assertEqual(list(a), list(b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+from math import pi
+
+from numpy import exp, zeros, trapz
+from numpy.random import RandomState
+
+from pychron.core.stats.probability_curves import cumulative_probability, kernel_density
+
+__author__ = 'ross'
+
+import unittest
+
+
+class ProbabilityCurvesTestCase(unittest.TestCase):
+    def setUp(self):
+        rs = RandomState(123)
+        self.ages = rs.uniform(10, 90, 200)
+        self.errors = rs.uniform(0.1, 5, 200)
+
+    def _expected(self, bins):
+        probs = zeros(bins.shape[0])
+        for ai, ei in zip(self.ages, self.errors):
+            es2 = 2 * ei * ei
+            probs += (es2 * pi) ** -0.5 * exp(-(ai - bins) ** 2 / es2)
+        return probs
+
+    def test_cumulative_probability(self):
+        bins, probs = cumulative_probability(self.ages, self.errors, 0, 100, n=500)
+        for a, b in zip(probs, self._expected(bins)):
+            self.assertAlmostEqual(a, b)
+
+    def test_truncated(self):
+        bins, probs = cumulative_probability(self.ages, self.errors, 0, 100, n=500, nsigma=6)
+        for a, b in zip(probs, self._expected(bins)):
+            self.assertAlmostEqual(a, b, 6)
+
+    def test_invalid(self):
+        bins, probs = cumulative_probability([0, 10], [1, 0], 0, 20, n=10, nsigma=6)
+        self.assertEqual(probs.sum(), 0)
+
+    def test_kernel_density(self):
+        x, y = kernel_density(self.ages, self.errors, -50, 150, n=1000)
+        self.assertAlmostEqual(trapz(y, x), len(self.ages), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,7 +19,7 @@ from pickle import dumps
 
 from pyface.qt import QtCore, QtGui
 from pyface.qt.QtGui import QColor, QHeaderView, QApplication
-from traits.api import Bool, Str, List, Any, Instance, Property, Int, HasTraits, Color, Either, Callable
+from traits.api import Bool, Str, List, Any, Instance, Property, Int, HasTraits, Color, Either, Callable, Event
 from traits.trait_base import SequenceTypes
 from traitsui.api import View, Item, TabularEditor, Handler
 from traitsui.mimedata import PyMimeData
@@ -35,6 +35,8 @@ class myTabularEditor(TabularEditor):
     rearranged = Str
     pasted = Str
     autoscroll = Bool(False)
+    # extended name of an Event fired when the user scrolls to the last row
+    scrolled_to_end = Str
     # copy_cache = Str
 
     # link_copyable = Bool(True)
@@ -546,6 +548,7 @@ class _TabularEditor(qtTabularEditor):
     # copy_cache = List
     col_widths = List
     key_pressed = Any
+    scrolled_to_end = Event
     model = Instance(_TabularModel)
     image_size = (32, 32)
 
@@ -668,6 +671,12 @@ class _TabularEditor(qtTabularEditor):
         QtCore.QObject.connect(control.horizontalHeader(), signal,
                                self._on_column_resize)
 
+        if factory.scrolled_to_end:
+            self.sync_value(factory.scrolled_to_end, 'scrolled_to_end', 'to')
+            # actionTriggered is only emitted for user actions, not when the view is scrolled programmatically
+            signal = QtCore.SIGNAL('actionTriggered(int)')
+            QtCore.QObject.connect(control.verticalScrollBar(), signal, self._on_scroll_action)
+
     # def dispose(self):
     #     # self.control._should_consume = False
     #     super(_TabularEditor, self).dispose()
@@ -699,6 +708,11 @@ class _TabularEditor(qtTabularEditor):
         cs = [header.sectionSize(i) for i in xrange(header.count())]
         self.col_widths = cs
 
+    def _on_scroll_action(self, action):
+        sb = self.control.verticalScrollBar()
+        if sb.sliderPosition() >= sb.maximum():
+            self.scrolled_to_end = True
+
     def _multi_selected_rows_changed(self, selected_rows):
         super(_TabularEditor, self)._multi_selected_rows_changed(selected_rows)
         if selected_rows:
@@ -16,7 +16,7 @@
 
 # ============= enthought library imports =======================
 
-from traits.api import Str, Bool, List, Instance, Event
+from traits.api import Str, Bool, List, Instance, Event, Float
 from traitsui.api import View, ListEditor, InstanceEditor, UItem, VGroup, HGroup, VSplit
 # ============= standard library imports ========================
 import random
@@ -29,6 +29,7 @@ from pychron.dashboard.conditional import DashboardConditional
 from pychron.dashboard.process_value import ProcessValue
 from pychron.globals import globalv
 from pychron.graph.stream_graph import StreamStackedGraph
+from pychron.hardware.core.communicators.scheduler import polling
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.loggable import Loggable
 from pychron.paths import paths
@@ -37,6 +38,8 @@ from pychron.paths import paths
 class DashboardDevice(Loggable):
     name = Str
     use = Bool
+    # seconds a read may take before it is reported as timed out
+    timeout = Float(10)
 
     values = List
     hardware_device = Instance(ICoreDevice)
@@ -88,6 +91,15 @@ class DashboardDevice(Loggable):
             elif dt > value.period:
                 self._trigger(value)
 
+    def poll_value(self, value, force=False):
+        """
+            read a new value now
+        """
+        if force:
+            self._trigger(value, force=True)
+        else:
+            self._trigger(value)
+
     def _trigger(self, value, **kw):
         try:
             self.debug('triggering value device={} value={} func={}'.format(self.hardware_device.name,
@@ -96,7 +108,8 @@ class DashboardDevice(Loggable):
             nv = None
             func = getattr(self.hardware_device, value.func_name)
             if func is not None:
-                nv = func(**kw)
+                with polling():
+                    nv = func(**kw)
 
             if nv is None and globalv.dashboard_simulation:
                 nv = random.random()
@@ -0,0 +1,287 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import heapq
+import time
+from itertools import count
+from multiprocessing.pool import ThreadPool
+from threading import Thread, Event, Lock
+
+# ============= local library imports  ==========================
+from pychron.loggable import Loggable
+
+MAX_WORKERS = 8
+# check for timed out reads at least this often
+CHECK_PERIOD = 1.0
+
+
+class PollStatistics(object):
+    """
+    npolls: number of reads
+    noverruns: number of periods missed because the scheduler was late
+    nskipped: number of polls skipped because the previous poll of the value had not finished
+    ntimeouts: number of reads that took longer than the device's timeout
+    """
+
+    def __init__(self):
+        self.npolls = 0
+        self.noverruns = 0
+        self.nskipped = 0
+        self.ntimeouts = 0
+        self.max_lateness = 0
+        self.total_duration = 0
+        self.max_duration = 0
+
+    @property
+    def mean_duration(self):
+        if self.npolls:
+            return self.total_duration / float(self.npolls)
+        return 0
+
+    def to_dict(self):
+        d = dict(self.__dict__)
+        d['mean_duration'] = self.mean_duration
+        return d
+
+
+class _Entry(object):
+    def __init__(self, device, value, deadline):
+        self.device = device
+        self.value = value
+        self.deadline = deadline
+        self.stats = PollStatistics()
+
+
+class PollScheduler(Loggable):
+    """
+    poll each ProcessValue at its own period.
+
+    values are kept in a heap ordered by deadline and their reads are run by a pool of worker threads so a
+    slow device does not delay the other devices. reads of one device are never run concurrently. a value
+    that is due while its device is busy is queued for that device, or skipped if the value is already queued.
+
+    deadlines advance by the value's period so polling does not drift. if a deadline is missed, the missed
+    periods are counted as overruns and the next deadline is a period from now.
+
+    "on_change" values are polled, with force=True, only if they have not changed for their timeout
+    """
+
+    def __init__(self, devices, nworkers=None, *args, **kw):
+        super(PollScheduler, self).__init__(*args, **kw)
+        self._devices = devices
+        if nworkers is None:
+            nworkers = max(1, min(len(devices), MAX_WORKERS))
+        self._nworkers = nworkers
+
+        self._entries = []
+        self._busy = {}
+        self._pending = {}
+        self._timed_out = set()
+        self._lock = Lock()
+        self._evt = Event()
+        self._pool = None
+        self._thread = None
+
+    def start(self):
+        self._evt.clear()
+        self._pool = ThreadPool(self._nworkers)
+
+        now = time.time()
+        self._entries = [_Entry(d, v, now) for d in self._devices for v in d.values]
+        self._thread = t = Thread(name='poll', target=self._run)
+        t.setDaemon(True)
+        t.start()
+
+    def stop(self, timeout=5):
+        """
+        stop polling. wait up to ``timeout`` seconds for the poll thread and the reads in progress, then
+        terminate the pool
+        """
+        self._evt.set()
+        st = time.time()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+        pool = self._pool
+        if pool:
+            self._pool = None
+            pool.close()
+            while time.time() - st < timeout:
+                with self._lock:
+                    if not self._busy:
+                        break
+                time.sleep(0.05)
+            else:
+                with self._lock:
+                    names = [d.name for d in self._busy]
+                self.warning('terminating poll. reads of {} did not finish'.format(', '.join(names)))
+                pool.terminate()
+                return
+
+            pool.join()
+
+    def statistics(self):
+        """
+        return a list of (device name, value name, statistics dict)
+        """
+        with self._lock:
+            return [(e.device.name, e.value.name, e.stats.to_dict()) for e in self._entries]
+
+    # private
+    def _run(self):
+        seq = count()
+        heap = [(e.deadline, next(seq), e) for e in self._entries]
+        heapq.heapify(heap)
+
+        evt = self._evt
+        while not evt.is_set():
+            timeout = CHECK_PERIOD
+            try:
+                now = time.time()
+                while heap and heap[0][0] <= now:
+                    _, _, entry = heapq.heappop(heap)
+                    try:
+                        deadline = self._dispatch(entry, now)
+                    except BaseException:
+                        self.debug_exception()
+                        # keep polling the value. try again later
+                        deadline = now + CHECK_PERIOD
+
+                    if deadline is not None:
+                        entry.deadline = deadline
+                        heapq.heappush(heap, (deadline, next(seq), entry))
+
+                self._report(self._check_timeouts(now))
+
+                if heap:
+                    timeout = min(timeout, max(0, heap[0][0] - time.time()))
+            except BaseException:
+                self.debug_exception()
+
+            evt.wait(timeout)
+
+    def _dispatch(self, entry, now):
+        """
+        start a read of ``entry`` if it is due and return its next deadline. return None to stop polling it
+        """
+        dev, value = entry.device, entry.value
+        period = value.period
+
+        force = False
+        if period == 'on_change':
+            timeout = value.timeout
+            if not timeout:
+                return
+
+            if value.last_time and now - value.last_time <= timeout:
+                # changed recently. check again when it would time out
+                return value.last_time + timeout
+
+            force = True
+            period = timeout
+
+        deadline = entry.deadline + period
+        if not dev.use or not value.enabled:
+            return max(deadline, now)
+
+        stats = entry.stats
+        with self._lock:
+            stats.max_lateness = max(stats.max_lateness, now - entry.deadline)
+            if deadline <= now:
+                stats.noverruns += int((now - entry.deadline) / period)
+                deadline = now + period
+
+            if dev in self._busy:
+                pending = self._pending.setdefault(dev, [])
+                if self._busy[dev][1] is entry or any(e is entry for e, _ in pending):
+                    stats.nskipped += 1
+                else:
+                    pending.append((entry, force))
+                return deadline
+
+            self._busy[dev] = (now, entry)
+
+        try:
+            self._pool.apply_async(self._read, (entry, force))
+        except (AttributeError, ValueError):
+            # stopped
+            self._busy.pop(dev, None)
+        return deadline
+
+    def _read(self, entry, force):
+        """
+        read ``entry`` then the values queued for its device
+        """
+        dev = entry.device
+        while entry:
+            st = time.time()
+            try:
+                dev.poll_value(entry.value, force=force)
+            except BaseException:
+                self.debug_exception()
+
+            dur = time.time() - st
+            messages = []
+            with self._lock:
+                stats = entry.stats
+                stats.npolls += 1
+                stats.total_duration += dur
+                stats.max_duration = max(stats.max_duration, dur)
+
+                if dev in self._timed_out:
+                    self._timed_out.remove(dev)
+                    messages.append(('info', '{} responded after {:0.1f}s'.format(dev.name, dur)))
+
+                pending = self._pending.get(dev)
+                if pending and not self._evt.is_set():
+                    entry, force = pending.pop(0)
+                    self._busy[dev] = (time.time(), entry)
+                else:
+                    entry = None
+                    self._pending.pop(dev, None)
+                    self._busy.pop(dev, None)
+
+            self._report(messages)
+
+    def _check_timeouts(self, now):
+        """
+        return a list of (level, message) for the reads that have timed out
+        """
+        messages = []
+        with self._lock:
+            for dev, (st, entry) in self._busy.items():
+                if dev not in self._timed_out and now - st > dev.timeout:
+                    self._timed_out.add(dev)
+                    entry.stats.ntimeouts += 1
+                    messages.append(('warning', '{} read of {} timed out after {}s'.format(dev.name,
+                                                                                         entry.value.name,
+                                                                                         dev.timeout)))
+        return messages
+
+    def _report(self, messages):
+        """
+        log ``messages``. called without the lock held. a failure to log does not stop polling
+        """
+        for level, msg in messages:
+            try:
+                getattr(self, level)(msg)
+            except BaseException:
+                self.debug_exception()
+
+# ============= EOF =============================================
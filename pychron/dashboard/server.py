@@ -17,13 +17,12 @@
 # ============= enthought library imports =======================
 from traits.api import Instance, on_trait_change, List, Button
 # ============= standard library imports ========================
-from threading import Thread
 import os
 import pickle
-import time
 # ============= local library imports  ==========================
 from pychron.dashboard.constants import CRITICAL, NOERROR, WARNING
 from pychron.dashboard.device import DashboardDevice
+from pychron.dashboard.scheduler import PollScheduler
 from pychron.globals import globalv
 from pychron.hardware.core.i_core_device import ICoreDevice
 from pychron.core.helpers.filetools import add_extension
@@ -74,6 +73,7 @@ class DashboardServer(Loggable):
 
     use_db = False
     _alive = False
+    _scheduler = None
 
     def activate(self):
         if not self.extraction_line_manager:
@@ -89,7 +89,7 @@ class DashboardServer(Loggable):
             self.labspy_client.start()
 
     def deactivate(self):
-        pass
+        self.stop_poll()
 
     # def deactivate(self):
     # if self.use_db:
@@ -115,15 +115,28 @@ class DashboardServer(Loggable):
         # self.url = '{}:{}'.format(host, port)
         # add a config request handler
         self.notifier.add_request_handler('config', self._handle_config)
+        self.notifier.add_request_handler('poll_statistics', self._handle_poll_statistics)
 
     def start_poll(self):
         self.info('starting dashboard poll')
         self._alive = True
-        t = Thread(name='poll',
-                   target=self._poll)
+        self._scheduler = s = PollScheduler([d for d in self.devices], name='DashboardPoll')
+        s.start()
 
-        t.setDaemon(1)
-        t.start()
+    def stop_poll(self):
+        self._alive = False
+        if self._scheduler:
+            self.info('stopping dashboard poll')
+            self._scheduler.stop()
+            self._scheduler = None
+
+    def get_poll_statistics(self):
+        """
+            return a list of (device name, value name, statistics dict)
+        """
+        if self._scheduler:
+            return self._scheduler.statistics()
+        return []
 
     def load_devices(self):
         dd = self._assemble_dev_dicts()
@@ -196,8 +209,14 @@ class DashboardServer(Loggable):
                       cs)
                 vs.append(vd)
 
+            try:
+                timeout = float(get_xml_value(dev, 'timeout', 10))
+            except ValueError:
+                timeout = 10
+
             dd = {'name': name,
                   'device': dname.text.strip(),
+                  'timeout': timeout,
                   'enabled': bool(denabled),
                   'values': vs}
             yield dd
@@ -216,7 +235,7 @@ class DashboardServer(Loggable):
                 else:
                     continue
 
-            d = DashboardDevice(name=name, use=dd['enabled'], hardware_device=device)
+            d = DashboardDevice(name=name, use=dd['enabled'], hardware_device=device, timeout=dd['timeout'])
             for args, cs in dd['values']:
                 pv = d.add_value(**args)
                 self.values.append(pv)
@@ -239,34 +258,13 @@ class DashboardServer(Loggable):
 
         return pickle.dumps(config)
 
-    def _poll(self):
-        if any((v.period == 'on_change' for dev in self.devices for v in dev.values)):
-            mperiod = 1
-        else:
-            mperiod = min((v.period for dev in self.devices for v in dev.values))
-
-        self.debug('min period {}'.format(mperiod))
-        while self._alive:
-            sst = time.time()
-            # self.debug('============= poll iteration start ============')
-            for dev in self.devices:
-                if not dev.use:
-                    continue
-
-                dev.trigger()
-
-            st = time.time()
-            pp = mperiod - (st - sst)
-            if pp >= 3:
-                self.debug('sleeping for {}'.format(pp))
-
-            while self._alive:
-                if time.time() - st >= pp:
-                    break
-                time.sleep(0.1)
+    def _handle_poll_statistics(self):
+        """
+            called by subscribers requesting the polling statistics
 
-            # dur = time.time() - sst
-            # self.debug('============= poll iteration finished dur={:0.1f}============'.format(dur))
+            return a pickled list of (device name, value name, statistics dict)
+        """
+        return pickle.dumps(self.get_poll_statistics())
 
     # def _set_error_flag(self, obj, msg):
     # self.notifier.send_message('error {}'.format(msg))
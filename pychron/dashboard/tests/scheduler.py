@@ -0,0 +1,128 @@
+import time
+from unittest import TestCase
+
+from pychron.dashboard.scheduler import PollScheduler
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+
+class Value(object):
+    def __init__(self, name, period, timeout=0):
+        self.name = name
+        self.period = period
+        self.timeout = timeout
+        self.enabled = True
+        self.last_time = 0
+
+
+class Device(object):
+    def __init__(self, name, values, delay=0, timeout=10):
+        self.name = name
+        self.values = values
+        self.delay = delay
+        self.timeout = timeout
+        self.use = True
+        self.polls = []
+
+    def poll_value(self, value, force=False):
+        self.polls.append((value.name, force, time.time()))
+        time.sleep(self.delay)
+        value.last_time = time.time()
+
+
+class BadDevice(Device):
+    def poll_value(self, value, force=False):
+        super(BadDevice, self).poll_value(value, force)
+        raise IOError('no response')
+
+
+class PollSchedulerTestCase(TestCase):
+    def _run(self, devices, duration, scheduler=None):
+        s = scheduler or PollScheduler(devices)
+        s.start()
+        time.sleep(duration)
+        s.stop()
+        return s
+
+    def _count(self, dev, name):
+        return len([p for p in dev.polls if p[0] == name])
+
+    def test_periods(self):
+        dev = Device('a', [Value('fast', 0.05), Value('slow', 0.2)])
+        self._run([dev], 0.52)
+
+        self.assertTrue(9 <= self._count(dev, 'fast') <= 12, self._count(dev, 'fast'))
+        self.assertTrue(2 <= self._count(dev, 'slow') <= 4, self._count(dev, 'slow'))
+
+    def test_slow_device(self):
+        slow = Device('slow', [Value('p', 0.05)], delay=0.3, timeout=0.1)
+        fast = Device('fast', [Value('p', 0.05)])
+        s = self._run([slow, fast], 0.52)
+
+        self.assertTrue(9 <= len(fast.polls) <= 12, len(fast.polls))
+        self.assertTrue(len(slow.polls) <= 2)
+
+        stats = dict(((d, v), st) for d, v, st in s.statistics())
+        self.assertGreater(stats[('slow', 'p')]['nskipped'], 0)
+        self.assertGreaterEqual(stats[('slow', 'p')]['ntimeouts'], 1)
+        self.assertEqual(stats[('fast', 'p')]['nskipped'], 0)
+
+    def test_on_change(self):
+        v = Value('c', 'on_change', timeout=0.1)
+        dev = Device('a', [v])
+        self._run([dev], 0.25)
+
+        self.assertTrue(all(force for _, force, _ in dev.polls))
+        self.assertTrue(2 <= len(dev.polls) <= 3, len(dev.polls))
+
+    def test_disabled(self):
+        v = Value('p', 0.05)
+        v.enabled = False
+        dev = Device('a', [v])
+        self._run([dev], 0.2)
+        self.assertEqual(dev.polls, [])
+
+    def test_device_error(self):
+        dev = BadDevice('a', [Value('p', 0.05)])
+        self._run([dev], 0.27)
+        self.assertTrue(4 <= len(dev.polls) <= 7, len(dev.polls))
+
+    def test_logging_error(self):
+        def warning(msg):
+            raise ImportError('no display')
+
+        slow = Device('slow', [Value('p', 0.05)], delay=0.2, timeout=0.05)
+        fast = Device('fast', [Value('p', 0.05)])
+        s = PollScheduler([slow, fast])
+        s.warning = s.info = warning
+        self._run([slow, fast], 0.52, s)
+
+        self.assertTrue(9 <= len(fast.polls) <= 12, len(fast.polls))
+        self.assertGreaterEqual(len(slow.polls), 2)
+
+    def test_stop(self):
+        dev = Device('a', [Value('p', 0.05)], delay=0.2)
+        s = PollScheduler([dev])
+        s.start()
+        time.sleep(0.1)
+        thread = s._thread
+        s.stop()
+
+        # the read in progress finished and no more reads were started
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(s._busy)
+        n = len(dev.polls)
+        time.sleep(0.3)
+        self.assertEqual(len(dev.polls), n)
+
+    def test_stop_timeout(self):
+        dev = Device('a', [Value('p', 0.05)], delay=1)
+        s = PollScheduler([dev])
+        s.start()
+        time.sleep(0.1)
+
+        st = time.time()
+        s.stop(timeout=0.2)
+        self.assertLess(time.time() - st, 0.5)
@@ -21,6 +21,7 @@ import time
 # ============= standard library imports ========================
 # import re
 # ============= local library imports  ==========================
+from pychron.core.helpers.datetime_tools import make_timef
 from pychron.experiment.utilities.identifier import make_runid
 from pychron.pychron_constants import ALPHAS
 
@@ -142,6 +143,86 @@ class DVCIsotopeRecordView:
         #     return '{} {} {} {}'.format(self.identifier, self.aliquot, self.timestamp, self.uuid)
 
 
+class DVCAnalysisRecord(object):
+    """
+    an analysis built from selected columns instead of an AnalysisTbl. provides the attributes used by
+    DVCIsotopeRecordView and DVC.make_analyses without loading any relationships
+    """
+    __slots__ = ('id', 'uuid', 'record_id', 'repository', 'repository_ids', 'timestamp', 'rundate',
+                 'analysis_timestamp', 'timestampf', 'identifier', 'aliquot', 'increment', 'analysis_type',
+                 'mass_spectrometer', 'extract_device', 'extract_value', 'cleanup', 'duration', 'comment',
+                 'measurement_script', 'extraction_script', 'position', 'sample', 'material', 'project',
+                 'irradiation', 'irradiation_level', 'irradiation_position', 'tag')
+
+    group_id = 0
+    graph_id = 0
+    frozen = False
+    delta_time = 0
+    review_status = None
+    is_plateau_step = False
+
+    def __init__(self, **kw):
+        for k in DVCAnalysisRecord.__slots__:
+            setattr(self, k, None)
+        self.repository_ids = []
+        for k, v in kw.iteritems():
+            setattr(self, k, v)
+
+        if self.position is None:
+            self.position = ''
+
+        self.rundate = self.analysis_timestamp = self.timestamp
+        self.timestampf = make_timef(self.timestamp) if self.timestamp else 0
+        if self.increment is None:
+            self.increment = -1
+        if self.record_id is None:
+            step = ALPHAS[self.increment] if self.increment >= 0 else ''
+            self.record_id = make_runid(self.identifier, self.aliquot, step)
+
+    @property
+    def repository_identifier(self):
+        if len(self.repository_ids) == 1:
+            return self.repository_ids[0]
+
+    @property
+    def irradiation_position_position(self):
+        return self.irradiation_position
+
+    @property
+    def irradiation_info(self):
+        return '{}{} {}'.format(self.irradiation, self.irradiation_level, self.irradiation_position)
+
+    @property
+    def meas_script_name(self):
+        return self.measurement_script
+
+    @property
+    def extract_script_name(self):
+        return self.extraction_script
+
+    @property
+    def labnumber(self):
+        return self.identifier
+
+    @property
+    def record_views(self):
+        ids = self.repository_ids
+        if len(ids) == 1:
+            return self._make_record_view(ids[0]),
+        else:
+            return [self._make_record_view(r, use_suffix=True) for r in ids]
+
+    def make_record_view(self, repository, use_suffix=False):
+        return self._make_record_view(repository, use_suffix)
+
+    def _make_record_view(self, repository, use_suffix=False):
+        iv = DVCIsotopeRecordView(self)
+        iv.repository_identifier = repository
+        iv.use_repository_suffix = use_suffix
+        iv.init()
+        return iv
+
+
 class IsotopeRecordView(object):
     # __slots__ = ('sample', 'project', 'labnumber', 'identifier', 'aliquot', 'step',
     #              '_increment',
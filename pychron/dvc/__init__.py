@@ -41,6 +41,9 @@ def dvc_dump(obj, path):
         except TypeError:
             print 'dvc dump exception {}'.format(obj)
 
+    from pychron.dvc.cache import ANALYSIS_CACHE
+    ANALYSIS_CACHE.remove(path)
+
 
 def dvc_load(path):
     if os.path.isfile(path):
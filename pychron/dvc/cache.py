@@ -0,0 +1,131 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import os
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
+# ============= local library imports  ==========================
+from pychron.dvc import dvc_load
+
+
+class AnalysisFileCache(object):
+    """
+    LRU cache of parsed analysis json files.
+
+    entries are keyed by path and validated against the file's mtime and size so an
+    entry is reloaded as soon as the file is changed on disk e.g. by a pull, checkout or save.
+
+    cached objects are shared. callers must not modify them
+    """
+
+    def __init__(self, max_size=20000):
+        self.max_size = max_size
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def load(self, path):
+        return self.load_stamped(path)[1]
+
+    def load_stamped(self, path):
+        """
+        return ((mtime, size), obj) for ``path``. the stamp is None if the file does not exist
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, {}
+
+        stamp = (st.st_mtime, st.st_size)
+        if not self.enabled:
+            return stamp, dvc_load(path)
+
+        with self._lock:
+            entry = self._cache.pop(path, None)
+            if entry is not None and entry[0] == stamp:
+                self._cache[path] = entry
+                self.hits += 1
+                return entry
+
+        obj = dvc_load(path)
+        with self._lock:
+            self.misses += 1
+            self._cache[path] = (stamp, obj)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return stamp, obj
+
+    def seed(self, path, obj, stamp=None):
+        """
+        add an already parsed ``obj`` for ``path``. if ``stamp`` is given ``obj`` is only added if the file
+        still has that (mtime, size)
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+
+        cstamp = (st.st_mtime, st.st_size)
+        if stamp is not None and tuple(stamp) != cstamp:
+            return
+
+        with self._lock:
+            self._cache[path] = (cstamp, obj)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def prefetch(self, ps, nthreads=4):
+        """
+        load ``ps`` into the cache using a pool of ``nthreads`` threads
+        """
+        ps = [p for p in ps if p not in self._cache]
+        if not ps:
+            return
+
+        pool = ThreadPool(nthreads)
+        try:
+            pool.map(self.load, ps, chunksize=max(1, len(ps) / (nthreads * 4)))
+        finally:
+            pool.close()
+            pool.join()
+
+    def remove(self, path):
+        with self._lock:
+            self._cache.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+
+ANALYSIS_CACHE = AnalysisFileCache()
+
+
+def cached_load(path):
+    return ANALYSIS_CACHE.load(path)
+
+# ============= EOF =============================================
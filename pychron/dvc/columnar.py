@@ -0,0 +1,171 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import os
+
+from numpy import load, savez, vstack, asarray
+
+# ============= local library imports  ==========================
+from pychron.core.helpers.binpack import format_blob, unpack_xy
+from pychron.dvc import dvc_load
+
+# Columnar sidecar for the raw data (.data) of a DVC analysis.
+#
+# The .data json file stores each signal, baseline and sniff as a base64 encoded blob of packed (x,y) floats.
+# The sidecar stores the same data as an uncompressed npz archive, one 2xN float32 array per member, so
+# loading is a file read per requested member instead of a base64 decode and a struct.unpack per count.
+#
+# member names are <kind>:<isotope>:<detector> e.g. signals:Ar40:H1, baselines::H1, sniffs:Ar40:H1
+
+COLUMNAR_EXTENSION = '.npz'
+KINDS = ('signals', 'baselines', 'sniffs')
+SEP = ':'
+
+
+def make_key(kind, isotope, detector):
+    return SEP.join((kind, isotope or '', detector or ''))
+
+
+def split_key(key):
+    return key.split(SEP, 2)
+
+
+def columnar_path(path):
+    """
+    return the sidecar path for a .data json path
+    """
+    head, _ = os.path.splitext(path)
+    return '{}{}'.format(head, COLUMNAR_EXTENSION)
+
+
+def dump_columnar(path, signals, baselines, sniffs):
+    """
+    signals, baselines and sniffs are lists of (isotope, detector, xs, ys)
+    """
+    arrays = {}
+    for kind, data in zip(KINDS, (signals, baselines, sniffs)):
+        for iso, det, xs, ys in data:
+            arrays[make_key(kind, iso, det)] = vstack((asarray(xs, dtype='f4'),
+                                                       asarray(ys, dtype='f4')))
+
+    with open(path, 'wb') as wfile:
+        savez(wfile, **arrays)
+
+
+def decode_blob(blob, fmt='>ff'):
+    """
+    decode a base64 blob of packed (x,y) pairs into xs, ys arrays
+    """
+    return unpack_xy(format_blob(blob), fmt[0])
+
+
+def migrate_data_file(path):
+    """
+    write a columnar sidecar for the .data json file ``path``.
+
+    return True if a sidecar was written
+    """
+    jd = dvc_load(path)
+    if not jd:
+        return
+
+    fmt = jd.get('format', '>ff')
+
+    def make(data, use_isotope=True):
+        for d in data:
+            xs, ys = decode_blob(d['blob'], fmt)
+            yield d.get('isotope') if use_isotope else None, d['detector'], xs, ys
+
+    dump_columnar(columnar_path(path),
+                  list(make(jd.get('signals', []))),
+                  list(make(jd.get('baselines', []), False)),
+                  list(make(jd.get('sniffs', []))))
+    return True
+
+
+def migrate_repository(root, overwrite=False, progress=None):
+    """
+    walk the repository at ``root`` and write a columnar sidecar next to every .data json file
+
+    return a list of the sidecars written
+    """
+    ps = []
+    for r, ds, fs in os.walk(root):
+        if '.git' in ds:
+            ds.remove('.git')
+
+        if os.path.basename(r) != '.data':
+            continue
+
+        for f in fs:
+            if not f.endswith('.json'):
+                continue
+
+            p = os.path.join(r, f)
+            if not overwrite and os.path.isfile(columnar_path(p)):
+                continue
+
+            if progress:
+                progress(p)
+
+            if migrate_data_file(p):
+                ps.append(columnar_path(p))
+    return ps
+
+
+class ColumnarData(object):
+    """
+    read only view of a columnar sidecar.
+
+    exposes signals, baselines and sniffs as lists of dicts with the same isotope/detector keys as the .data json.
+    arrays are only read from disk when requested with ``get_data``
+    """
+
+    def __init__(self, path):
+        self._npz = load(path)
+        self.signals = []
+        self.baselines = []
+        self.sniffs = []
+        for key in self._npz.files:
+            kind, iso, det = split_key(key)
+            getattr(self, kind).append({'isotope': iso, 'detector': det, 'key': key})
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_data(self, d):
+        a = self._npz[d['key']]
+        return a[0], a[1]
+
+    def close(self):
+        self._npz.close()
+
+
+if __name__ == '__main__':
+    import sys
+
+    for root in sys.argv[1:]:
+        print 'migrated {} {}'.format(root, len(migrate_repository(root)))
+
+# ============= EOF =============================================
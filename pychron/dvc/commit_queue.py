@@ -0,0 +1,310 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+from traits.api import Str, Int, Float
+
+# ============= standard library imports ========================
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Thread, Condition, RLock
+
+from git import GitCommandError
+
+# ============= local library imports  ==========================
+from pychron.git_archive.repo_manager import GitRepoManager
+from pychron.loggable import Loggable
+
+
+def commit_groups(repo, groups):
+    """
+    add and commit each group of files. a group is (paths, message). groups with no existing files or no
+    changes are skipped so committing the same groups again is harmless
+    """
+    for ps, msg in groups:
+        ps = [p for p in ps if os.path.isfile(p)]
+        if ps:
+            for p in ps:
+                repo.add(p, commit=False)
+            if repo.has_staged():
+                repo.commit(msg)
+
+
+class CommitQueue(Loggable):
+    """
+    commit and push analyses in a background thread.
+
+    ``put`` records the files of an analysis and the commits to make in a journal and returns immediately.
+    pending entries are committed, each repository is pushed once and the meta repository is updated once
+    per flush. a flush happens ``period`` seconds after the first pending entry, when ``flush`` is called or
+    when the queue is stopped.
+
+    entries are removed from the journal only after they are committed and repositories only after they are
+    pushed, so anything not yet pushed after a failure or a crash is retried by the next flush
+    """
+    period = Float(300)
+    status = Str
+    npending = Int
+
+    def __init__(self, dvc, path, *args, **kw):
+        super(CommitQueue, self).__init__(*args, **kw)
+        self.dvc = dvc
+        self.path = path
+
+        # held while the queue merges and commits. writers to the repositories (the persister) must hold it
+        # while writing files or changing an index so a merge or commit never sees a partially saved analysis
+        self.lock = RLock()
+
+        self._cond = Condition()
+        # flush requests and the last request served by a flush
+        self._requested = 0
+        self._served = 0
+        self._entries = []
+        self._unpushed = set()
+        self._next_flush = None
+        self._flush_requested = False
+        self._alive = False
+        self._thread = None
+
+    def start(self):
+        """
+        start the worker. entries left in the journal by a previous session are flushed immediately
+        """
+        with self._cond:
+            if self._alive:
+                return
+
+            self._load_journal()
+            if self._entries or self._unpushed:
+                self.info('{} journaled analyses to commit'.format(len(self._entries)))
+                self._flush_requested = True
+
+            self._alive = True
+            self._update_status()
+
+        t = Thread(target=self._run, name='CommitQueue')
+        t.setDaemon(True)
+        t.start()
+        self._thread = t
+
+    def put(self, root, groups, runid=''):
+        """
+        queue commits for the repository at ``root``. ``groups`` is a list of (paths, message)
+        """
+        entry = {'root': root, 'runid': runid,
+                 'commits': [(list(ps), msg) for ps, msg in groups]}
+        with self._cond:
+            self._entries.append(entry)
+            self._dump_journal()
+            if self._next_flush is None:
+                self._next_flush = time.time() + self.period
+            self._update_status()
+            self._cond.notify_all()
+
+    def flush(self, block=False, timeout=None):
+        """
+        commit and push everything pending now. if ``block`` wait up to ``timeout`` seconds for a flush
+        started after this call to finish. return True if it finished
+        """
+        with self._cond:
+            if not self._alive:
+                return not (self._entries or self._unpushed)
+
+            self._requested += 1
+            request = self._requested
+            self._flush_requested = True
+            self._cond.notify_all()
+
+            if block:
+                st = time.time()
+                while self._served < request:
+                    wait = None
+                    if timeout is not None:
+                        wait = timeout - (time.time() - st)
+                        if wait <= 0:
+                            break
+                    self._cond.wait(wait)
+                return self._served >= request
+
+    def stop(self, timeout=None):
+        """
+        flush and stop the worker
+        """
+        with self._cond:
+            if not self._alive:
+                return
+            self._alive = False
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def pending(self):
+        with self._cond:
+            return bool(self._entries or self._unpushed)
+
+    # private
+    def _run(self):
+        while 1:
+            with self._cond:
+                while self._alive and not self._flush_requested:
+                    wait = None
+                    if self._next_flush is not None:
+                        wait = self._next_flush - time.time()
+                        if wait <= 0:
+                            break
+                    self._cond.wait(wait)
+
+                self._flush_requested = False
+                alive = self._alive
+                request = self._requested
+
+            try:
+                self._flush()
+            except BaseException, e:
+                self.warning('commit queue flush failed. {}'.format(e))
+                self.debug_exception()
+                with self._cond:
+                    # don't retry until the next period
+                    self._next_flush = time.time() + self.period
+
+            with self._cond:
+                self._served = request
+                self._cond.notify_all()
+
+            if not alive:
+                break
+
+    def _flush(self):
+        with self._cond:
+            entries = list(self._entries)
+            unpushed = set(self._unpushed)
+
+        if not entries and not unpushed:
+            return
+
+        self._set_status('Pushing {} analyses'.format(len(entries)))
+
+        roots = OrderedDict()
+        for e in entries:
+            roots.setdefault(e['root'], []).append(e)
+        for r in unpushed:
+            roots.setdefault(r, [])
+
+        committed = []
+        pushed = []
+        for root, es in roots.iteritems():
+            if not os.path.isdir(root):
+                self.warning('repository {} does not exist. dropping {} analyses'.format(root, len(es)))
+                committed.extend(es)
+                pushed.append(root)
+                continue
+
+            repo = GitRepoManager()
+            repo.open_repo(root)
+            try:
+                # fetch without the lock so a slow remote does not hold up the persister
+                repo.fetch()
+                with self.lock:
+                    repo.smart_pull(accept_their=True, fetch=False)
+                    for e in es:
+                        commit_groups(repo, e['commits'])
+            except GitCommandError, e:
+                self.warning('failed committing to {}. {}'.format(root, e))
+                continue
+
+            committed.extend(es)
+            self.dvc.push_repository(repo)
+            if self._is_pushed(repo):
+                pushed.append(root)
+
+        if committed:
+            runids = ', '.join(e['runid'] for e in committed if e['runid'])
+            try:
+                self.dvc.meta_fetch()
+                with self.lock:
+                    self.dvc.meta_pull(accept_our=True, fetch=False)
+                    self.dvc.meta_commit('repo updated for analyses {}'.format(runids))
+                self.dvc.meta_push()
+            except GitCommandError, e:
+                self.warning('failed updating meta repository. {}'.format(e))
+
+        with self._cond:
+            for e in committed:
+                self._entries.remove(e)
+            self._unpushed.update(e['root'] for e in committed)
+            self._unpushed.difference_update(pushed)
+            self._dump_journal()
+
+            if self._entries or self._unpushed:
+                self._next_flush = time.time() + self.period
+            else:
+                self._next_flush = None
+            self._update_status()
+
+    def _is_pushed(self, repo):
+        try:
+            return not repo.has_unpushed_commits()
+        except GitCommandError:
+            # no remote tracking branch to compare with
+            return True
+
+    def _update_status(self):
+        n = len(self._entries)
+        self.npending = n
+        if n:
+            self._set_status('{} analyses to push'.format(n))
+        elif self._unpushed:
+            self._set_status('{} repositories to push'.format(len(self._unpushed)))
+        else:
+            self._set_status('')
+
+    def _set_status(self, s):
+        self.status = s
+
+    def _load_journal(self):
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as rfile:
+                    obj = json.load(rfile)
+            except ValueError, e:
+                self.warning('invalid commit queue journal {}. {}'.format(self.path, e))
+                return
+
+            self._entries = obj.get('entries', [])
+            self._unpushed = set(obj.get('unpushed', []))
+            if self._entries or self._unpushed:
+                self._next_flush = time.time()
+
+    def _dump_journal(self):
+        """
+        write the journal to a temporary file and rename it so a crash never leaves a partial journal
+        """
+        tmp = '{}.tmp'.format(self.path)
+        with open(tmp, 'w') as wfile:
+            json.dump({'entries': self._entries,
+                       'unpushed': list(self._unpushed)}, wfile)
+            wfile.flush()
+            os.fsync(wfile.fileno())
+        if os.name == 'nt' and os.path.isfile(self.path):
+            os.remove(self.path)
+        os.rename(tmp, self.path)
+
+# ============= EOF =============================================
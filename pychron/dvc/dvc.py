@@ -24,7 +24,7 @@ from math import isnan
 
 from apptools.preferences.preference_binding import bind_preference
 from git import Repo
-from traits.api import Instance, Str, Set, List, provides
+from traits.api import Instance, Str, Set, List, provides, Bool, Int
 from uncertainties import nominal_value, std_dev
 
 from pychron.core.helpers.filetools import remove_extension, list_subdirectories
@@ -33,13 +33,17 @@ from pychron.core.progress import progress_loader, progress_iterator
 from pychron.database.interpreted_age import InterpretedAge
 from pychron.dvc import dvc_dump, dvc_load, analysis_path, repository_path, AnalysisNotAnvailableError
 from pychron.dvc.defaults import TRIGA, HOLDER_24_SPOKES, LASER221, LASER65
+from pychron.dvc.cache import ANALYSIS_CACHE
+from pychron.dvc.persistent_cache import PersistentAnalysisCache
 from pychron.dvc.dvc_analysis import DVCAnalysis, PATH_MODIFIERS
 from pychron.dvc.dvc_database import DVCDatabase
 from pychron.dvc.func import find_interpreted_age_path, GitSessionCTX, push_repositories
 from pychron.dvc.meta_repo import MetaRepo, Production
+from pychron.dvc.offline_index import OfflineIndex
 from pychron.envisage.browser.record_views import InterpretedAgeRecordView
 from pychron.git.hosts import IGitHost, CredentialException
 from pychron.git_archive.repo_manager import GitRepoManager, format_date, get_repository_branch
+from pychron.git_archive.utils import add_repository_change_handler
 from pychron.globals import globalv
 from pychron.loggable import Loggable
 from pychron.paths import paths, r_mkdir
@@ -103,6 +107,14 @@ class DVC(Loggable):
     organization = Str
     default_team = Str
 
+    use_cache = Bool(True)
+    max_cache_size = Int(20000)
+    load_threads = Int(4)
+    use_persistent_cache = Bool(False)
+    persistent_cache = Instance(PersistentAnalysisCache)
+    use_offline_index = Bool(False)
+    offline_index = Instance(OfflineIndex)
+
     current_repository = Instance(GitRepoManager)
     auto_add = True
     pulled_repositories = Set
@@ -116,7 +128,7 @@ class DVC(Loggable):
             # self.synchronize()
             # self._defaults()
 
-    def initialize(self, inform=False):
+    def initialize(self, inform=False, pull=True):
         self.debug('Initialize DVC')
 
         if not self.meta_repo_name:
@@ -126,7 +138,8 @@ class DVC(Loggable):
         self.open_meta_repo()
 
         # update meta repo.
-        self.meta_pull()
+        if pull:
+            self.meta_pull()
 
         if self.db.connect():
             # self._defaults()
@@ -439,10 +452,10 @@ class DVC(Loggable):
             self.info('Saving blanks for {}'.format(ai))
             ai.dump_blanks(keys, refs, reviewed=True)
 
-    def save_fits(self, ai, keys):
+    def save_fits(self, ai, keys, results=None):
         if keys:
             self.info('Saving fits for {}'.format(ai))
-            ai.dump_fits(keys, reviewed=True)
+            ai.dump_fits(keys, reviewed=True, results=results)
 
     def save_flux(self, identifier, j, e):
         self.meta_pull()
@@ -488,13 +501,28 @@ class DVC(Loggable):
         return ias
 
     def find_references(self, ans, atypes, hours, exclude=None, make_records=True, **kw):
-        records = self.db.find_references(ans, atypes, hours, exclude=exclude, **kw)
+        records = self._get_index().find_references(ans, atypes, hours, exclude=exclude, **kw)
 
         if records:
             if make_records:
                 records = self.make_analyses(records)
             return records
 
+    def get_labnumber_analyses(self, lns, **kw):
+        return self._get_index().get_labnumber_analyses(lns, **kw)
+
+    def get_analyses_by_date_range(self, lpost, hpost, **kw):
+        return self._get_index().get_analyses_by_date_range(lpost, hpost, **kw)
+
+    def get_labnumber_analyses_page(self, lns, **kw):
+        return self._get_index().get_labnumber_analyses_page(lns, **kw)
+
+    def get_analyses_by_date_range_page(self, lpost, hpost, **kw):
+        return self._get_index().get_analyses_by_date_range_page(lpost, hpost, **kw)
+
+    def make_analysis_records(self, ans):
+        return self.db.make_analysis_records(ans)
+
     def make_interpreted_ages(self, ias):
         def func(x, prog, i, n):
             if prog:
@@ -534,6 +562,12 @@ class DVC(Loggable):
         progress_iterator(exps, func, threshold=1)
         # for ei in exps:
 
+        cache = ANALYSIS_CACHE
+        cache.enabled = self.use_cache
+        cache.max_size = self.max_cache_size
+        if self.use_cache and self.load_threads > 1:
+            self._prefetch_records(records)
+
         make_record = self._make_record
 
         def func(*args):
@@ -551,6 +585,8 @@ class DVC(Loggable):
         n = len(records)
 
         self.debug('Make analysis time, total: {}, n: {}, average: {}'.format(et, n, et / float(n)))
+        if self.use_cache:
+            self.debug('Analysis cache size: {}, hits: {}, misses: {}'.format(len(cache), cache.hits, cache.misses))
         return ret
 
     # repositories
@@ -608,6 +644,8 @@ class DVC(Loggable):
         if exists:
             repo = self._get_repository(name)
             repo.pull(use_progress=use_progress)
+            if self.use_offline_index:
+                self.offline_index.update(name)
             return True
         else:
             self.debug('getting repository from remote')
@@ -677,6 +715,9 @@ class DVC(Loggable):
         self.meta_repo.update_chronology(name, doses)
         self.meta_commit('updated chronology for {}'.format(name))
 
+    def meta_fetch(self):
+        return self.meta_repo.fetch()
+
     def meta_pull(self, **kw):
         return self.meta_repo.smart_pull(**kw)
 
@@ -935,6 +976,56 @@ class DVC(Loggable):
             prog.change_message('Loading repository {}. {}/{}'.format(expid, i, n))
         self.sync_repo(expid)
 
+    def _prefetch_records(self, records):
+        """
+        read the json files for ``records`` into the analysis cache using a pool of threads.
+        unchanged files already in the cache are not read again.
+
+        if enabled, the persistent cache is checked first and updated with the files that had to be read
+        """
+        st = time.time()
+        modifiers = [m for m in PATH_MODIFIERS if m not in ('.data', 'monitor')]
+        pcache = self.persistent_cache if self.use_persistent_cache else None
+
+        ps = []
+        misses = []
+        nhits = 0
+        for record in records:
+            expid = record.repository_identifier
+            if not expid or isinstance(record, DVCAnalysis):
+                continue
+
+            rid = record.record_id
+            if record.use_repository_suffix:
+                rid = '-'.join(rid.split('-')[:-1])
+
+            try:
+                rps = [p for p in (analysis_path(rid, expid, modifier=m) for m in modifiers) if p]
+            except AnalysisNotAnvailableError:
+                continue
+
+            if pcache:
+                state = pcache.get_state(expid, rps)
+                if state:
+                    files = pcache.get(expid, rid, state)
+                    if files:
+                        for p, (stamp, obj) in files.iteritems():
+                            ANALYSIS_CACHE.seed(p, obj, stamp)
+                        nhits += 1
+                        continue
+
+                    misses.append((expid, rid, state, rps))
+            ps.extend(rps)
+
+        ANALYSIS_CACHE.prefetch(ps, self.load_threads)
+        if misses:
+            pcache.put_many([(expid, rid, state, {p: ANALYSIS_CACHE.load_stamped(p) for p in rps})
+                             for expid, rid, state, rps in misses])
+
+        self.debug('Prefetched {} files, persistent cache hits: {}, threads: {}, time: {}'.format(len(ps), nhits,
+                                                                                                 self.load_threads,
+                                                                                                 time.time() - st))
+
     def _make_record(self, record, prog, i, n, calculate_f_only=False):
         meta_repo = self.meta_repo
         if prog:
@@ -1016,6 +1107,16 @@ class DVC(Loggable):
                     a.calculate_age()
         return a
 
+    def _get_index(self):
+        """
+        return the offline index, brought up to date with the local repositories, if it is enabled otherwise
+        the database
+        """
+        if self.use_offline_index:
+            self.offline_index.update_all()
+            return self.offline_index
+        return self.db
+
     def _get_frozen_production(self, rid, repo):
         path = analysis_path(rid, repo, 'productions')
         if path:
@@ -1041,7 +1142,9 @@ class DVC(Loggable):
     def _bind_preferences(self):
 
         prefid = 'pychron.dvc'
-        for attr in ('meta_repo_name', 'organization', 'default_team'):
+        for attr in ('meta_repo_name', 'organization', 'default_team',
+                     'use_cache', 'max_cache_size', 'load_threads', 'use_persistent_cache',
+                     'use_offline_index'):
             bind_preference(self, attr, '{}.{}'.format(prefid, attr))
 
         prefid = 'pychron.dvc.db'
@@ -1121,6 +1224,16 @@ class DVC(Loggable):
     def _meta_repo_default(self):
         return MetaRepo()
 
+    def _persistent_cache_default(self):
+        cache = PersistentAnalysisCache(os.path.join(paths.dvc_dir, 'analysis_cache.sqlite'),
+                                        paths.repository_dataset_dir)
+        add_repository_change_handler(cache.invalidate_path)
+        return cache
+
+    def _offline_index_default(self):
+        return OfflineIndex(os.path.join(paths.dvc_dir, 'offline_index.sqlite'),
+                            paths.repository_dataset_dir)
+
 
 if __name__ == '__main__':
     paths.build('_dev')
@@ -27,6 +27,8 @@ from pychron.core.helpers.datetime_tools import make_timef
 from pychron.core.helpers.filetools import add_extension
 from pychron.core.helpers.iterfuncs import partition
 from pychron.dvc import dvc_dump, dvc_load, analysis_path, make_ref_list, get_spec_sha, get_masses
+from pychron.dvc.cache import cached_load
+from pychron.dvc.columnar import ColumnarData, COLUMNAR_EXTENSION
 from pychron.experiment.utilities.identifier import make_aliquot_step, make_step
 from pychron.paths import paths
 from pychron.processing.analyses.analysis import Analysis
@@ -92,7 +94,7 @@ class DVCAnalysis(Analysis):
         bname = os.path.basename(path)
         head, ext = os.path.splitext(bname)
 
-        jd = dvc_load(os.path.join(root, 'extraction', '{}.extr{}'.format(head, ext)))
+        jd = cached_load(os.path.join(root, 'extraction', '{}.extr{}'.format(head, ext)))
         for attr in EXTRACTION_ATTRS:
             tag = attr
             if attr == 'cleanup_duration':
@@ -117,7 +119,7 @@ class DVCAnalysis(Analysis):
         if not self.extract_units:
             self.extract_units = 'W'
 
-        jd = dvc_load(path)
+        jd = cached_load(path)
         for attr in META_ATTRS:
             v = jd.get(attr)
             if v is not None:
@@ -148,7 +150,7 @@ class DVCAnalysis(Analysis):
         for modifier in modifiers:
             path = self._analysis_path(modifier=modifier)
             if path and os.path.isfile(path):
-                jd = dvc_load(path)
+                jd = cached_load(path)
                 func = getattr(self, '_load_{}'.format(modifier))
                 try:
                     func(jd)
@@ -172,51 +174,76 @@ class DVCAnalysis(Analysis):
         return jd
 
     def load_raw_data(self, keys=None, n_only=False, use_name_pairs=True):
+        path = self._analysis_path(modifier='.data', extension=COLUMNAR_EXTENSION)
+        if path and os.path.isfile(path):
+            with ColumnarData(path) as cd:
+                def set_data(m, d):
+                    xs, ys = cd.get_data(d)
+                    m.set_data(xs, ys, n_only)
+
+                self._load_raw_data(cd, set_data, keys, n_only, use_name_pairs)
+        else:
+            def set_data(m, d):
+                m.unpack_data(format_blob(d['blob']), n_only)
+
+            path = self._analysis_path(modifier='.data')
+            self._load_raw_data(dvc_load(path), set_data, keys, n_only, use_name_pairs)
 
-        path = self._analysis_path(modifier='.data')
+    def _load_raw_data(self, jd, set_data, keys, n_only, use_name_pairs):
         isotopes = self.isotopes
 
-        jd = dvc_load(path)
-        signals = jd['signals']
-        baselines = jd['baselines']
-        sniffs = jd['sniffs']
-        for sd in signals:
+        # index isotopes by (name, detector) and by detector, baselines by detector
+        iso_idx = {}
+        det_idx = {}
+        for i in isotopes.itervalues():
+            iso_idx.setdefault((i.name, i.detector), i)
+            det_idx.setdefault(i.detector, []).append(i)
+
+        baselines = {}
+        for b in jd['baselines']:
+            baselines.setdefault(b['detector'], b)
+
+        # decode each baseline once and share it with the other isotopes on the same detector
+        decoded = {}
+
+        def set_baseline(iso):
+            det = iso.detector
+            src = decoded.get(det)
+            if src is None:
+                bd = baselines.get(det)
+                if bd:
+                    set_data(iso.baseline, bd)
+                    decoded[det] = iso.baseline
+            elif src is not iso.baseline:
+                if n_only:
+                    iso.baseline.n = src.n
+                else:
+                    iso.baseline.set_data(src.xs, src.ys)
+
+        for sd in jd['signals']:
             isok = sd['isotope']
             det = sd['detector']
-            # print isok, keys
             key = isok
             if use_name_pairs:
                 key = '{}{}'.format(isok, det)
 
             if keys and key not in keys and isok not in keys:
                 continue
-            #
-            # try:
-            #     iso = isotopes[isok]
-            # except KeyError, e:
-            #     print e, isotopes.keys()
-            #     continue
-            iso = next((i for i in isotopes.itervalues() if i.detector == det and i.name == isok), None)
+
+            iso = iso_idx.get((isok, det))
             if not iso:
                 continue
 
-            iso.unpack_data(format_blob(sd['blob']), n_only)
-
-            # det = sd['detector']
-            bd = next((b for b in baselines if b['detector'] == det), None)
-            if bd:
-                iso.baseline.unpack_data(format_blob(bd['blob']), n_only)
+            set_data(iso, sd)
+            set_baseline(iso)
 
         # loop thru keys to make sure none were missed this can happen when only loading baseline
         if keys:
             for k in keys:
-                bd = next((b for b in baselines if b['detector'] == k), None)
-                if bd:
-                    for iso in isotopes.itervalues():
-                        if iso.detector == k:
-                            iso.baseline.unpack_data(format_blob(bd['blob']), n_only)
+                for iso in det_idx.get(k, ()):
+                    set_baseline(iso)
 
-        for sn in sniffs:
+        for sn in jd['sniffs']:
             isok = sn['isotope']
             if keys and isok not in keys:
                 continue
@@ -225,7 +252,7 @@ class DVCAnalysis(Analysis):
                 iso = isotopes[isok]
             except KeyError:
                 continue
-            iso.sniff.unpack_data(format_blob(sn['blob']), n_only)
+            set_data(iso.sniff, sn)
 
     def set_production(self, prod, r):
         self.production_obj = r
@@ -268,15 +295,26 @@ class DVCAnalysis(Analysis):
 
             iso.set_fit(fi)
 
-    def dump_fits(self, keys, reviewed=False):
+    def dump_fits(self, keys, reviewed=False, results=None):
+        """
+            results: optional dict of key: BatchResult used instead of refitting each isotope
+        """
 
         sisos = self.isotopes
         isoks, dks = map(tuple, partition(keys, lambda x: x in sisos))
+        if results is None:
+            results = {}
 
-        def update(d, i):
+        def update(d, i, k):
             fd = i.filter_outliers_dict
-            d.update(fit=i.fit, value=float(i.value), error=float(i.error),
-                     n=i.n, fn=i.fn,
+            r = results.get(k)
+            if r is None:
+                v, e, fn = i.value, i.error, i.fn
+            else:
+                v, e, fn = r.value, r.error, r.fn
+
+            d.update(fit=i.fit, value=float(v), error=float(e),
+                     n=i.n, fn=fn,
                      include_baseline_error=i.include_baseline_error,
                      filter_outliers_dict=fd
                      # filter_outliers=fd.get('filter_outliers', False),
@@ -292,7 +330,7 @@ class DVCAnalysis(Analysis):
                     iso = isos[k]
                     siso = sisos[k]
                     if siso:
-                        update(iso, siso)
+                        update(iso, siso, k)
                 except KeyError:
                     pass
 
@@ -311,7 +349,7 @@ class DVCAnalysis(Analysis):
 
                 bs = next((iso.baseline for iso in sisos.itervalues() if iso.detector == di), None)
                 if bs:
-                    update(det, bs)
+                    update(det, bs, di)
 
             self._dump(baselines, path)
 
@@ -406,7 +444,7 @@ class DVCAnalysis(Analysis):
                 i.set_fit(v['fit'], notify=False)
                 fod = v.get('filter_outliers_dict')
                 if fod:
-                    i.filter_outliers_dict = fod
+                    i.filter_outliers_dict = dict(fod)
 
     def _load_value_error(self, item, obj):
         item.use_manual_value = obj.get('use_manual_value', False)
@@ -434,7 +472,7 @@ class DVCAnalysis(Analysis):
                     iso.baseline.set_fit(v['fit'], notify=False)
                     fod = v.get('filter_outliers_dict')
                     if fod:
-                        iso.baseline.filter_outliers_dict = fod
+                        iso.baseline.filter_outliers_dict = dict(fod)
 
     def _load_icfactors(self, jd):
         for key, v in jd.iteritems():
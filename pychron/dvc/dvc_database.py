@@ -17,7 +17,7 @@
 # ============= enthought library imports =======================
 from datetime import timedelta, datetime
 
-from sqlalchemy import not_, func, distinct, or_
+from sqlalchemy import not_, func, distinct, or_, and_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql.functions import count
 from sqlalchemy.util import OrderedSet
@@ -27,6 +27,7 @@ from traitsui.api import View, Item
 from pychron.core.spell_correct import correct
 from pychron.database.core.database_adapter import DatabaseAdapter
 from pychron.database.core.query import compile_query, in_func
+from pychron.database.records.isotope_record import DVCAnalysisRecord
 from pychron.dvc.dvc_orm import AnalysisTbl, ProjectTbl, MassSpectrometerTbl, \
     IrradiationTbl, LevelTbl, SampleTbl, \
     MaterialTbl, IrradiationPositionTbl, UserTbl, ExtractDeviceTbl, LoadTbl, \
@@ -37,6 +38,26 @@ from pychron.dvc.dvc_orm import AnalysisTbl, ProjectTbl, MassSpectrometerTbl, \
     SamplePrepStepTbl, SamplePrepImageTbl, RestrictedNameTbl
 from pychron.pychron_constants import ALPHAS, alpha_to_int, NULL_STR
 
+# columns selected for a DVCAnalysisRecord
+ANALYSIS_RECORD_COLUMNS = (AnalysisTbl.id, AnalysisTbl.uuid, AnalysisTbl.timestamp,
+                           AnalysisTbl.aliquot, AnalysisTbl.increment, AnalysisTbl.analysis_type,
+                           AnalysisTbl.mass_spectrometer, AnalysisTbl.extract_device, AnalysisTbl.extract_value,
+                           AnalysisTbl.cleanup, AnalysisTbl.duration, AnalysisTbl.comment,
+                           AnalysisTbl.measurementName.label('measurement_script'),
+                           AnalysisTbl.extractionName.label('extraction_script'),
+                           IrradiationPositionTbl.identifier,
+                           IrradiationPositionTbl.position.label('irradiation_position'),
+                           SampleTbl.name.label('sample'),
+                           MaterialTbl.name.label('material'),
+                           ProjectTbl.name.label('project'),
+                           LevelTbl.name.label('irradiation_level'),
+                           IrradiationTbl.name.label('irradiation'),
+                           MeasuredPositionTbl.position,
+                           AnalysisChangeTbl.tag)
+
+# maximum number of ids in one IN clause
+IN_CHUNK_SIZE = 500
+
 
 def principal_investigator_filter(q, principal_investigator):
     if ',' in principal_investigator:
@@ -748,6 +769,39 @@ class DVCDatabase(DatabaseAdapter):
             q = q.filter(AnalysisTbl.uuid.in_(uuids))
             return self._query_all(q, verbose_query=False)
 
+    def get_analysis_records(self, ids=None, uuids=None):
+        """
+        return DVCAnalysisRecords for the analyses with ``ids`` or ``uuids``. the records are built from one
+        joined query per chunk of ids rather than by loading each analysis' relationships
+        """
+        if ids:
+            col, values = AnalysisTbl.id, ids
+        else:
+            col, values = AnalysisTbl.uuid, uuids
+
+        records = []
+        with self.session_ctx() as sess:
+            for i in xrange(0, len(values or ()), IN_CHUNK_SIZE):
+                q = self._analysis_record_query(sess)
+                q = q.filter(col.in_(values[i:i + IN_CHUNK_SIZE]))
+                rs, _ = self._analysis_record_page(sess, q, None, None, 'asc')
+                records.extend(rs)
+        return records
+
+    def make_analysis_records(self, ans):
+        """
+        replace the AnalysisTbls in ``ans`` with DVCAnalysisRecords, keeping the order.
+
+        making record views from AnalysisTbls loads the irradiation position, sample, project, level,
+        irradiation, change and repository associations of each analysis one query at a time
+        """
+        ids = [a.id for a in ans if isinstance(a, AnalysisTbl)]
+        if not ids:
+            return ans
+
+        rmap = {r.id: r for r in self.get_analysis_records(ids=ids)}
+        return [rmap.get(a.id, a) if isinstance(a, AnalysisTbl) else a for a in ans]
+
     def get_analysis_runid(self, idn, aliquot, step=None):
         with self.session_ctx() as sess:
             q = sess.query(AnalysisTbl)
@@ -838,6 +892,40 @@ class DVCDatabase(DatabaseAdapter):
             tc = q.count()
             return self._query_all(q), tc
 
+    def get_labnumber_analyses_page(self, lns, after=None, limit=500,
+                                    low_post=None, high_post=None,
+                                    omit_key=None, exclude_uuids=None,
+                                    include_invalid=False,
+                                    mass_spectrometers=None,
+                                    repositories=None,
+                                    order='asc',
+                                    **kw):
+        """
+        one page of get_labnumber_analyses as DVCAnalysisRecords.
+
+        only the columns needed for a record view are selected so no relationships are loaded. the page starts
+        after ``after``, the cursor returned with the previous page. return records, cursor. cursor is None if
+        this is the last page
+        """
+        with self.session_ctx() as sess:
+            q = self._analysis_record_query(sess)
+            q = in_func(q, AnalysisTbl.mass_spectrometer, mass_spectrometers)
+            q = in_func(q, IrradiationPositionTbl.identifier, lns)
+            if repositories:
+                q = q.filter(AnalysisTbl.id.in_(self._repository_analysis_ids(sess, repositories)))
+            if low_post:
+                q = q.filter(AnalysisTbl.timestamp >= str(low_post))
+            if high_post:
+                q = q.filter(AnalysisTbl.timestamp <= str(high_post))
+            if exclude_uuids:
+                q = q.filter(not_(AnalysisTbl.uuid.in_(exclude_uuids)))
+            if not include_invalid:
+                q = q.filter(AnalysisChangeTbl.tag != 'invalid')
+            if omit_key:
+                q = q.filter(AnalysisChangeTbl.tag != omit_key)
+
+            return self._analysis_record_page(sess, q, after, limit, order)
+
     def get_repository_date_range(self, names):
         with self.session_ctx() as sess:
             q = sess.query(AnalysisTbl.timestamp)
@@ -908,6 +996,97 @@ class DVCDatabase(DatabaseAdapter):
 
             return self._query_all(q, verbose_query=verbose)
 
+    def get_analyses_by_date_range_page(self, lpost, hpost, after=None, limit=500,
+                                        labnumber=None,
+                                        analysis_type=None,
+                                        mass_spectrometers=None,
+                                        extract_device=None,
+                                        project=None,
+                                        repositories=None,
+                                        order='asc',
+                                        exclude_uuids=None,
+                                        exclude_invalid=True,
+                                        **kw):
+        """
+        one page of get_analyses_by_date_range as DVCAnalysisRecords. see get_labnumber_analyses_page
+        """
+        with self.session_ctx() as sess:
+            q = self._analysis_record_query(sess)
+            if labnumber:
+                q = q.filter(IrradiationPositionTbl.identifier == labnumber)
+            q = in_func(q, AnalysisTbl.mass_spectrometer, mass_spectrometers)
+            if extract_device:
+                q = q.filter(AnalysisTbl.extract_device == extract_device)
+            if analysis_type:
+                q = in_func(q, AnalysisTbl.analysis_type, analysis_type)
+            if project:
+                q = q.filter(ProjectTbl.name == project)
+            if repositories:
+                q = q.filter(AnalysisTbl.id.in_(self._repository_analysis_ids(sess, repositories)))
+            if lpost:
+                q = q.filter(AnalysisTbl.timestamp >= lpost)
+            if hpost:
+                q = q.filter(AnalysisTbl.timestamp <= hpost)
+            if exclude_invalid:
+                q = q.filter(AnalysisChangeTbl.tag != 'invalid')
+            if exclude_uuids:
+                q = q.filter(not_(AnalysisTbl.uuid.in_(exclude_uuids)))
+
+            return self._analysis_record_page(sess, q, after, limit, order)
+
+    def _analysis_record_query(self, sess):
+        q = sess.query(*ANALYSIS_RECORD_COLUMNS)
+        q = q.join(IrradiationPositionTbl, AnalysisTbl.irradiation_positionID == IrradiationPositionTbl.id)
+        q = q.outerjoin(SampleTbl, IrradiationPositionTbl.sampleID == SampleTbl.id)
+        q = q.outerjoin(ProjectTbl, SampleTbl.projectID == ProjectTbl.id)
+        q = q.outerjoin(LevelTbl, IrradiationPositionTbl.levelID == LevelTbl.id)
+        q = q.outerjoin(IrradiationTbl, LevelTbl.irradiationID == IrradiationTbl.id)
+        q = q.outerjoin(MaterialTbl, SampleTbl.materialID == MaterialTbl.id)
+        q = q.outerjoin(AnalysisChangeTbl, AnalysisChangeTbl.analysisID == AnalysisTbl.id)
+        q = q.outerjoin(MeasuredPositionTbl, MeasuredPositionTbl.analysisID == AnalysisTbl.id)
+        return q
+
+    def _repository_analysis_ids(self, sess, repositories):
+        q = sess.query(RepositoryAssociationTbl.analysisID)
+        return in_func(q, RepositoryAssociationTbl.repository, repositories)
+
+    def _analysis_record_page(self, sess, q, after, limit, order):
+        """
+        return the page of records after the cursor ``after`` and the cursor of the next page.
+
+        the page is ordered by timestamp then id and found with a filter on the last (timestamp, id) rather than
+        an offset so each page is an index range scan. the repositories of the whole page are found with one
+        query
+        """
+        order = order or 'asc'
+        ts, aid = AnalysisTbl.timestamp, AnalysisTbl.id
+        if after:
+            t, i = after
+            if order == 'desc':
+                q = q.filter(or_(ts < t, and_(ts == t, aid < i)))
+            else:
+                q = q.filter(or_(ts > t, and_(ts == t, aid > i)))
+
+        q = q.order_by(getattr(ts, order)(), getattr(aid, order)())
+        if limit:
+            q = q.limit(limit + 1)
+
+        rows = self._query_all(q)
+        cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            cursor = rows[-1].timestamp, rows[-1].id
+
+        records = [DVCAnalysisRecord(**r._asdict()) for r in rows]
+        if records:
+            rmap = {r.id: r for r in records}
+            rq = sess.query(RepositoryAssociationTbl.analysisID, RepositoryAssociationTbl.repository)
+            rq = rq.filter(RepositoryAssociationTbl.analysisID.in_(rmap.keys()))
+            for i, repo in self._query_all(rq):
+                rmap[i].repository_ids.append(repo)
+
+        return records, cursor
+
     def _get_date_range(self, q, asc=None, desc=None, hours=0):
         if asc is None:
             asc = AnalysisTbl.timestamp.asc()
@@ -20,13 +20,16 @@ import hashlib
 import os
 import shutil
 import struct
+from contextlib import contextmanager
 from datetime import datetime
 
 from git.exc import GitCommandError
-from traits.api import Instance, Bool, Str
+from traits.api import Instance, Bool, Str, Float
 from uncertainties import std_dev, nominal_value
 
 from pychron.dvc import dvc_dump, analysis_path
+from pychron.dvc.columnar import dump_columnar, COLUMNAR_EXTENSION
+from pychron.dvc.commit_queue import CommitQueue, commit_groups
 from pychron.dvc.dvc_analysis import META_ATTRS, EXTRACTION_ATTRS, PATH_MODIFIERS
 from pychron.experiment.automated_run.persistence import BasePersister
 from pychron.experiment.classifier.isotope_classifier import IsotopeClassifier
@@ -55,7 +58,12 @@ class DVCPersister(BasePersister):
     use_isotope_classifier = Bool(False)
     isotope_classifier = Instance(IsotopeClassifier, ())
     stage_files = Bool(True)
+    save_columnar_data = Bool(True)
     default_principal_investigator = Str
+
+    use_commit_queue = Bool(False)
+    commit_queue_period = Float(300)
+    commit_queue = Instance(CommitQueue)
     _positions = None
 
     def per_spec_save(self, pr, repository_identifier=None, commit=False, commit_tag=None):
@@ -80,7 +88,14 @@ class DVCPersister(BasePersister):
         """
         self.debug('^^^^^^^^^^^^^ Initialize DVCPersister {} pull={}'.format(repository, pull))
 
-        self.dvc.initialize()
+        use_queue = self.use_commit_queue
+        if use_queue:
+            # the commit queue pulls before it commits. don't wait for the network here
+            pull = False
+            self.commit_queue.period = self.commit_queue_period
+            self.commit_queue.start()
+
+        self.dvc.initialize(pull=not use_queue)
 
         repository = format_repository_identifier(repository)
         self.active_repository = repo = GitRepoManager()
@@ -93,6 +108,12 @@ class DVCPersister(BasePersister):
             self.info('pulling changes from repo: {}'.format(repository))
             self.active_repository.pull(remote=remote, use_progress=False)
 
+    def flush_commit_queue(self, block=False, timeout=None):
+        return self.commit_queue.flush(block, timeout)
+
+    def stop_commit_queue(self, timeout=None):
+        self.commit_queue.stop(timeout)
+
     def pre_extraction_save(self):
         pass
 
@@ -148,11 +169,12 @@ class DVCPersister(BasePersister):
         self._positions = ps
         obj['positions'] = ps
 
-        hexsha = self.dvc.get_meta_head()
-        obj['commit'] = str(hexsha)
+        with self._repository_ctx():
+            hexsha = self.dvc.get_meta_head()
+            obj['commit'] = str(hexsha)
 
-        path = self._make_path(modifier='extraction')
-        dvc_dump(obj, path)
+            path = self._make_path(modifier='extraction')
+            dvc_dump(obj, path)
 
     def pre_measurement_save(self):
         pass
@@ -173,94 +195,66 @@ class DVCPersister(BasePersister):
 
         ar = self.active_repository
 
-        # save spectrometer
-        spec_sha = self._get_spectrometer_sha()
-        spec_path = os.path.join(ar.path, '{}.json'.format(spec_sha))
-        if not os.path.isfile(spec_path):
-            self._save_spectrometer_file(spec_path)
+        with self._repository_ctx():
+            # save spectrometer
+            spec_sha = self._get_spectrometer_sha()
+            spec_path = os.path.join(ar.path, '{}.json'.format(spec_sha))
+            if not os.path.isfile(spec_path):
+                self._save_spectrometer_file(spec_path)
 
-        # self.dvc.meta_repo.save_gains(self.per_spec.run_spec.mass_spectrometer,
-        #                               self.per_spec.gains)
+            # self.dvc.meta_repo.save_gains(self.per_spec.run_spec.mass_spectrometer,
+            #                               self.per_spec.gains)
 
-        # save analysis
+            # save analysis
 
-        if not self.per_spec.timestamp:
-            timestamp = datetime.now()
-        else:
-            timestamp = self.per_spec.timestamp
+            if not self.per_spec.timestamp:
+                timestamp = datetime.now()
+            else:
+                timestamp = self.per_spec.timestamp
 
-        # check repository identifier before saving
-        # will modify repository to NoRepo if repository_identifier does not exist
-        self._check_repository_identifier()
+            # check repository identifier before saving
+            # will modify repository to NoRepo if repository_identifier does not exist
+            self._check_repository_identifier()
 
-        self._save_analysis(timestamp)
+            self._save_analysis(timestamp)
 
-        # save monitor
-        self._save_monitor()
+            # save monitor
+            self._save_monitor()
 
-        # save peak center
-        self._save_peak_center(self.per_spec.peak_center)
+            # save peak center
+            self._save_peak_center(self.per_spec.peak_center)
 
         # stage files
         dvc = self.dvc
         if self.stage_files:
             if commit:
-                try:
-                    ar.smart_pull(accept_their=True)
-
-                    # commit the reset of the files
-                    paths = [spec_path, ] + [self._make_path(modifier=m) for m in PATH_MODIFIERS]
-
-                    for p in paths:
-                        if os.path.isfile(p):
-                            ar.add(p, commit=False)
-                        else:
-                            self.debug('not at valid file {}'.format(p))
-
-                    # commit files
-                    ar.commit('<{}>'.format(commit_tag))
-
-                    # commit default data reduction
-                    add = False
-                    p = self._make_path('intercepts')
-                    if os.path.isfile(p):
-                        ar.add(p, commit=False)
-                        add = True
-
-                    p = self._make_path('baselines')
-                    if os.path.isfile(p):
-                        ar.add(p, commit=False)
-                        add = True
-
-                    if add:
-                        ar.commit('<ISOEVO> default collection fits')
-
-                    for pp, tag, msg in (('blanks', 'BLANKS',
-                                          'preceding {}'.format(self.per_spec.previous_blank_runid)),
-                                         ('icfactors', 'ICFactor', 'default')):
-                        p = self._make_path(pp)
-                        if os.path.isfile(p):
-                            ar.add(p, commit=False)
-                            ar.commit('<{}> {}'.format(tag, msg))
-
-                    # push changes
-                    dvc.push_repository(ar)
-
-                    # update meta
-                    dvc.meta_pull(accept_our=True)
-
-                    dvc.meta_commit('repo updated for analysis {}'.format(self.per_spec.run_spec.runid))
-
-                    # push commit
-                    dvc.meta_push()
-                except GitCommandError, e:
-                    self.warning(e)
-                    if self.confirmation_dialog('NON FATAL\n\n'
-                                                'DVC/Git upload of analysis not successful.'
-                                                'Do you want to CANCEL the experiment?\n',
-                                                timeout_ret=False,
-                                                timeout=30):
-                        ret = False
+                groups = self._make_commit_groups(spec_path, commit_tag)
+                runid = self.per_spec.run_spec.runid
+                if self.use_commit_queue:
+                    self.commit_queue.put(ar.path, groups, runid)
+                else:
+                    try:
+                        ar.smart_pull(accept_their=True)
+                        commit_groups(ar, groups)
+
+                        # push changes
+                        dvc.push_repository(ar)
+
+                        # update meta
+                        dvc.meta_pull(accept_our=True)
+
+                        dvc.meta_commit('repo updated for analysis {}'.format(runid))
+
+                        # push commit
+                        dvc.meta_push()
+                    except GitCommandError, e:
+                        self.warning(e)
+                        if self.confirmation_dialog('NON FATAL\n\n'
+                                                    'DVC/Git upload of analysis not successful.'
+                                                    'Do you want to CANCEL the experiment?\n',
+                                                    timeout_ret=False,
+                                                    timeout=30):
+                            ret = False
 
         with dvc.session_ctx():
             self._save_analysis_db(timestamp)
@@ -272,14 +266,45 @@ class DVCPersister(BasePersister):
             self.debug('saving run log file')
 
             npath = self._make_path('logs', '.log')
-            shutil.copyfile(path, npath)
             ar = self.active_repository
-            ar.smart_pull(accept_their=True)
-            ar.add(npath, commit=False)
-            ar.commit('<COLLECTION> log')
-            self.dvc.push_repository(ar)
+            with self._repository_ctx():
+                shutil.copyfile(path, npath)
+                if self.use_commit_queue:
+                    self.commit_queue.put(ar.path, [([npath], '<COLLECTION> log')], self.per_spec.run_spec.runid)
+                else:
+                    ar.smart_pull(accept_their=True)
+                    ar.add(npath, commit=False)
+                    ar.commit('<COLLECTION> log')
+                    self.dvc.push_repository(ar)
 
     # private
+    @contextmanager
+    def _repository_ctx(self):
+        """
+        hold the commit queue's lock while writing to the repositories so the queue never merges or
+        commits while an analysis is partially written
+        """
+        if self.use_commit_queue:
+            with self.commit_queue.lock:
+                yield
+        else:
+            yield
+
+    def _make_commit_groups(self, spec_path, commit_tag):
+        """
+        return the (paths, message) commits for the saved analysis
+        """
+        ps = [spec_path, ] + [self._make_path(modifier=m) for m in PATH_MODIFIERS]
+        if self.save_columnar_data:
+            ps.append(self._make_path(modifier='.data', extension=COLUMNAR_EXTENSION))
+
+        groups = [(ps, '<{}>'.format(commit_tag)),
+                  ([self._make_path('intercepts'), self._make_path('baselines')],
+                   '<ISOEVO> default collection fits'),
+                  ([self._make_path('blanks')], '<BLANKS> preceding {}'.format(self.per_spec.previous_blank_runid)),
+                  ([self._make_path('icfactors')], '<ICFactor> default')]
+        return groups
+
     def _check_repository_identifier(self):
         repo_id = self.per_spec.run_spec.repository_identifier
         db = self.dvc.db
@@ -494,6 +519,26 @@ class DVCPersister(BasePersister):
                 'signals': signals, 'baselines': baselines, 'sniffs': sniffs}
         dvc_dump(data, p)
 
+        if self.save_columnar_data:
+            self._save_columnar_data(per_spec.isotope_group.isotopes.values())
+
+    def _save_columnar_data(self, isotopes):
+        """
+        write the raw data as a columnar sidecar (runid.data.npz) so analyses can be loaded without decoding
+        the base64 blobs in runid.data.json
+        """
+        signals, baselines, sniffs = [], [], []
+        dets = []
+        for iso in isotopes:
+            signals.append((iso.name, iso.detector, iso.xs, iso.ys))
+            sniffs.append((iso.name, iso.detector, iso.sniff.xs, iso.sniff.ys))
+            if iso.detector not in dets:
+                baselines.append((None, iso.detector, iso.baseline.xs, iso.baseline.ys))
+                dets.append(iso.detector)
+
+        p = self._make_path(modifier='.data', extension=COLUMNAR_EXTENSION)
+        dump_columnar(p, signals, baselines, sniffs)
+
     def _save_monitor(self):
         if self.per_spec.monitor:
             p = self._make_path(modifier='monitor')
@@ -557,6 +602,9 @@ class DVCPersister(BasePersister):
 
         dvc_dump(obj, p)
 
+    def _commit_queue_default(self):
+        return CommitQueue(self.dvc, os.path.join(paths.dvc_dir, 'commit_queue.json'))
+
     def _make_path(self, modifier=None, extension='.json'):
         runid = self.per_spec.run_spec.runid
         repository_identifier = self.per_spec.run_spec.repository_identifier
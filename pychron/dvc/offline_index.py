@@ -1,268 +1,459 @@
-# # ===============================================================================
-# # Copyright 2015 Jake Ross
-# #
-# # Licensed under the Apache License, Version 2.0 (the "License");
-# # you may not use this file except in compliance with the License.
-# # You may obtain a copy of the License at
-# #
-# # http://www.apache.org/licenses/LICENSE-2.0
-# #
-# # Unless required by applicable law or agreed to in writing, software
-# # distributed under the License is distributed on an "AS IS" BASIS,
-# # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# # See the License for the specific language governing permissions and
-# # limitations under the License.
-# # ===============================================================================
-#
-# # ============= enthought library imports =======================
-# import os
-#
-# from traits.api import provides
-#
-# # ============= standard library imports ========================
-# from sqlalchemy import Column, String, Integer, Float, distinct, DateTime
-# from sqlalchemy.ext.declarative import declarative_base, declared_attr
-# # ============= local library imports  ==========================
-# from pychron.database.core.database_adapter import DatabaseAdapter
-# from pychron.database.i_browser import IBrowser
-# from pychron.experiment.utilities.identifier import make_step
-#
-# Base = declarative_base()
-#
-#
-# class NoSchemaError(BaseException):
-#     pass
-#
-#
-# class DVCIndex(object):
-#     @declared_attr
-#     def __tablename__(self):
-#         return self.__name__
-#
-#     id = Column(Integer, primary_key=True)
-#     repo = Column(String(200))
-#
-#
-# class AnalysisIndex(DVCIndex, Base):
-#     identifier = Column(String(80))
-#     aliquot = Column(Integer)
-#     increment = Column(Integer)
-#     cleanup = Column(Float)
-#     duration = Column(Float)
-#     extract_value = Column(Float)
-#     uuid = Column(String(36))
-#     analysis_type = Column(String(40))
-#     position = Column(String(120))
-#
-#     measurement_script = Column(String(80))
-#     extraction_script = Column(String(80))
-#
-#     mass_spectrometer = Column(String(80))
-#     extract_device = Column(String(80))
-#
-#     sample = Column(String(80))
-#     project = Column(String(80))
-#     material = Column(String(80))
-#
-#     irradiation = Column(String(80))
-#     irradiation_level = Column(String(80))
-#     irradiation_position = Column(String(80))
-#
-#     tag = Column(String(80))
-#     analysis_timestamp = Column(DateTime)
-#
-#     measurement = None
-#     extraction = None
-#
-#     @property
-#     def labnumber(self):
-#         return LabnumberRecord(self)
-#
-#     @property
-#     def step(self):
-#         return make_step(self.increment)
-#
-#
-# class MassSpecRecord(object):
-#     __slots__ = ['name']
-#
-#     def __init__(self, name):
-#         self.name = name
-#
-#
-# class ProjectRecord(object):
-#     __slots__ = ['name']
-#
-#     def __init__(self, name):
-#         self.name = name
-#
-#
-# class SampleObject(object):
-#     def __init__(self, sample, project, material):
-#         self.material = material
-#         self.project = project
-#         self.name = sample
-#
-#
-# class IrradiationPosObject(object):
-#     def __init__(self, pos, level):
-#         self.position = pos
-#         self.level = level
-#
-#
-# class LevelObject(object):
-#     def __init__(self, name, irrad):
-#         self.name = name
-#         self.irradiation = irrad
-#
-#
-# class IrradiationObject(object):
-#     def __init__(self, name):
-#         self.name = name
-#
-#
-# class LabnumberRecord(object):
-#     def __init__(self, r):
-#         self.name = r.identifier
-#         self.labnumber = r.identifier
-#         self.identifier = r.identifier
-#         self.sample = SampleObject(r.sample, r.project, r.material)
-#
-#         irrad = IrradiationObject(r.irradiation)
-#         level = LevelObject(r.irradiation_level, irrad)
-#         self.irradiation_position = IrradiationPosObject(r.irradiation_position, level)
-#
-#
-# def index_factory(path, overwrite=False):
-#     """
-#     create a new sqlite db.
-#     if path not a file or overwrite create all tables
-#     :param path:
-#     :param overwrite:
-#     :return:
-#     """
-#
-#     if os.path.isfile(path):
-#         if overwrite:
-#             os.remove(path)
-#     else:
-#         overwrite = True
-#
-#     db = IndexAdapter(path=path)
-#     db.connect()
-#     if overwrite:
-#         db.create_all(Base.metadata)
-#     return db
-#
-#
-# @provides(IBrowser)
-# class IndexAdapter(DatabaseAdapter):
-#     schema = AnalysisIndex
-#     kind = 'sqlite'
-#
-#     # irradiations = Property
-#     # levels = Property(depends_on='irradiation')
-#     # irradiation = Str
-#     # level = ''
-#
-#     # @cached_property
-#     def get_irradiations(self):
-#         with self.session_ctx() as sess:
-#             q = sess.query(distinct(AnalysisIndex.irradiation))
-#             q = q.order_by(AnalysisIndex.irradiation.asc())
-#             irs = [v[0] for v in self._query_all(q)]
-#             return irs
-#
-#     # @cached_property
-#     def get_levels(self):
-#         with self.session_ctx() as sess:
-#             q = sess.query(distinct(AnalysisIndex.irradiation_level))
-#             q = q.filter(AnalysisIndex.irradiation == self.irradiation)
-#             return [v[0] for v in self._query_all(q)]
-#
-#     # browswer protocol
-#     def get_analysis_groups(self, *args, **kw):
-#         return []
-#
-#     def get_project_labnumbers(self, project_names, filter_non_run, low_post=None, high_post=None,
-#                                analysis_types=None, mass_spectrometers=None):
-#         with self.session_ctx() as sess:
-#             q = sess.query(AnalysisIndex)
-#             q = q.filter(AnalysisIndex.project.in_(project_names))
-#             q = q.group_by(AnalysisIndex.identifier)
-#             qs = self._query_all(q)
-#
-#             return [LabnumberRecord(qi) for qi in qs]
-#
-#     def get_labnumber_analyses(self, lns, low_post=None, high_post=None,
-#                                omit_key=None, exclude_uuids=None, mass_spectrometers=None, **kw):
-#         with self.session_ctx() as sess:
-#             q = sess.query(AnalysisIndex)
-#             q = q.filter(AnalysisIndex.identifier.in_(lns))
-#             return self._query_all(q), int(q.count())
-#
-#     def get_projects(self, **kw):
-#         with self.session_ctx() as sess:
-#             q = sess.query(distinct(AnalysisIndex.project))
-#             q = q.order_by(AnalysisIndex.project.asc())
-#
-#             qs = self._query_all(q)
-#             return [ProjectRecord(v[0]) for v in qs]
-#
-#     def get_mass_spectrometers(self):
-#         with self.session_ctx() as sess:
-#             q = sess.query(distinct(AnalysisIndex.mass_spectrometer))
-#             qs = self._query_all(q)
-#             return [MassSpecRecord(v[0]) for v in qs]
-#
-#     def get_analysis_types(self):
-#         return []
-#
-#     def get_extraction_devices(self):
-#         return []
-#
-#     def get_analysis_exists(self, uuid):
-#         with self.session_ctx() as sess:
-#             q = sess.query(AnalysisIndex.uuid)
-#             q = q.filter(AnalysisIndex.uuid == uuid)
-#
-#             return self._query_one(q) is not None
-#
-#     def add_analysis_to_index(self, repopath, ai):
-#         if self.get_analysis_exists(ai.uuid):
-#             self.info('Analysis already in index: {}'.format(ai.record_id))
-#             return
-#
-#         # add to sqlite index
-#         self.add(repo=repopath,
-#                  identifier=ai.identifier,
-#                  aliquot=ai.aliquot,
-#                  increment=ai.increment,
-#                  cleanup=ai.cleanup_duration,
-#                  duration=ai.extract_duration,
-#                  extract_value=ai.extract_value,
-#                  uuid=ai.uuid,
-#                  measurement_script=ai.measurement_script_name,
-#                  extraction_script=ai.extraction_script_name,
-#                  mass_spectrometer=ai.mass_spectrometer,
-#                  extract_device=ai.extract_device,
-#                  material=ai.material,
-#                  sample=ai.sample,
-#                  project=ai.project,
-#                  irradiation=ai.irradiation,
-#                  irradiation_level=ai.irradiation_level,
-#                  irradiation_position=ai.irradiation_position,
-#                  tag=ai.tag,
-#                  position=ai.position,
-#                  analysis_timestamp=ai.rundate,
-#                  analysis_type=ai.analysis_type)
-#
-#     def add(self, **kw):
-#         if self.schema is None:
-#             raise NoSchemaError()
-#
-#         with self.session_ctx():
-#             obj = self.schema(**kw)
-#             self._add_item(obj)
-#
-# # ============= EOF =============================================
+# ===============================================================================
+# Copyright 2015 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from threading import Lock
+
+from git import Repo, GitCommandError
+
+# ============= local library imports  ==========================
+from pychron.database.records.isotope_record import DVCAnalysisRecord
+
+COLUMNS = ('repository', 'record_id', 'uuid', 'identifier', 'aliquot', 'increment', 'analysis_type', 'timestamp',
+           'mass_spectrometer', 'extract_device', 'extract_value', 'cleanup', 'duration', 'sample', 'project',
+           'material', 'irradiation', 'irradiation_level', 'irradiation_position', 'tag', 'comment',
+           'measurement_script', 'extraction_script')
+
+SCHEMA = ('''CREATE TABLE IF NOT EXISTS AnalysisIndexTbl (
+repository TEXT NOT NULL,
+record_id TEXT NOT NULL,
+uuid TEXT,
+identifier TEXT,
+aliquot INTEGER,
+increment INTEGER,
+analysis_type TEXT,
+timestamp TEXT,
+mass_spectrometer TEXT,
+extract_device TEXT,
+extract_value REAL,
+cleanup REAL,
+duration REAL,
+sample TEXT,
+project TEXT,
+material TEXT,
+irradiation TEXT,
+irradiation_level TEXT,
+irradiation_position TEXT,
+tag TEXT,
+comment TEXT,
+measurement_script TEXT,
+extraction_script TEXT,
+PRIMARY KEY (repository, record_id))''',
+          'CREATE INDEX IF NOT EXISTS AnalysisIndexIdentifierIdx ON AnalysisIndexTbl (identifier, timestamp)',
+          'CREATE INDEX IF NOT EXISTS AnalysisIndexTypeIdx ON AnalysisIndexTbl (analysis_type, timestamp)',
+          'CREATE INDEX IF NOT EXISTS AnalysisIndexUUIDIdx ON AnalysisIndexTbl (uuid)',
+          '''CREATE TABLE IF NOT EXISTS RepositoryIndexTbl (
+repository TEXT PRIMARY KEY,
+sha TEXT NOT NULL)''')
+
+# modifier directories that hold indexed values
+INDEXED_MODIFIERS = ('tags', 'extraction')
+
+
+def analysis_key(path):
+    """
+    return (directory, tail) of the analysis that the repository relative ``path`` belongs to, or None.
+
+    analyses are stored as <directory>/<tail>.json with modifiers in <directory>/<modifier>/<tail>.<mod>.json.
+    the record_id is directory + tail
+    """
+    args = path.split('/')
+    name = args[-1]
+    if not name.endswith('.json'):
+        return
+
+    if len(args) == 2:
+        return args[0], name[:-5]
+    elif len(args) == 3 and args[1] in INDEXED_MODIFIERS:
+        return args[0], name.split('.')[0]
+
+
+def _load(p):
+    try:
+        with open(p, 'r') as rfile:
+            return json.load(rfile)
+    except (IOError, ValueError):
+        return {}
+
+
+def _timestamp(v):
+    """
+    timestamps are stored as "YYYY-MM-DD HH:MM:SS[.ffffff]" so they sort and compare as text
+    """
+    if isinstance(v, datetime):
+        return str(v)
+    return v.replace('T', ' ') if v else v
+
+
+def in_clause(column, values, params):
+    if not hasattr(values, '__iter__'):
+        values = (values,)
+
+    params.extend(values)
+    return '{} IN ({})'.format(column, ','.join('?' * len(values)))
+
+
+class IndexRecord(DVCAnalysisRecord):
+    """
+    an analysis from the index
+    """
+    __slots__ = ()
+
+    def __init__(self, row):
+        kw = dict(zip(COLUMNS, row))
+        kw['timestamp'] = self._parse_timestamp(kw['timestamp'])
+        super(IndexRecord, self).__init__(**kw)
+        self.repository_ids = [self.repository]
+
+    def _parse_timestamp(self, ts):
+        if ts:
+            for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f'):
+                try:
+                    return datetime.strptime(ts, fmt)
+                except ValueError:
+                    pass
+
+
+class OfflineIndex(object):
+    """
+    local sqlite index of the analyses in the cloned DVC repositories.
+
+    each repository is indexed up to a commit. ``update`` reads only the analyses changed by the commits made since
+    the last indexed commit, or every analysis the first time a repository is indexed. the index can be queried
+    with the same filters as DVCDatabase.get_labnumber_analyses and DVCDatabase.find_references without a
+    connection to the central database
+    """
+
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        self._lock = Lock()
+        self._connection = None
+
+    def update(self, repository):
+        """
+        index the changes made to ``repository`` since it was last indexed. return the number of analyses updated
+        """
+        root = os.path.join(self.root, repository)
+        if not os.path.isdir(os.path.join(root, '.git')):
+            return 0
+
+        repo = Repo(root)
+        try:
+            head = repo.head.commit.hexsha
+        except ValueError:
+            # no commits
+            return 0
+
+        with self._lock:
+            conn = self._get_connection()
+            row = conn.execute('SELECT sha FROM RepositoryIndexTbl WHERE repository=?', (repository,)).fetchone()
+            last = row[0] if row else None
+            if last == head:
+                return 0
+
+            ps = None
+            if last:
+                try:
+                    ps = repo.git.diff('--name-only', '--no-renames', last, head).splitlines()
+                except GitCommandError:
+                    # the last indexed commit is no longer in the repository
+                    pass
+
+            full = ps is None
+            if full:
+                ps = repo.git.ls_files().splitlines()
+
+            keys = {k for k in (analysis_key(p) for p in ps) if k}
+            rows, deletes = [], []
+            for d, tail in keys:
+                r = self._make_row(repository, root, d, tail)
+                if r is None:
+                    deletes.append((repository, '{}{}'.format(d, tail)))
+                else:
+                    rows.append(r)
+
+            with conn:
+                if full:
+                    conn.execute('DELETE FROM AnalysisIndexTbl WHERE repository=?', (repository,))
+                conn.executemany('DELETE FROM AnalysisIndexTbl WHERE repository=? AND record_id=?', deletes)
+                conn.executemany('INSERT OR REPLACE INTO AnalysisIndexTbl ({}) VALUES ({})'.format(
+                    ','.join(COLUMNS), ','.join('?' * len(COLUMNS))), rows)
+                conn.execute('INSERT OR REPLACE INTO RepositoryIndexTbl VALUES (?,?)', (repository, head))
+
+            return len(rows) + len(deletes)
+
+    def update_all(self):
+        """
+        update every repository in ``root``
+        """
+        n = 0
+        if os.path.isdir(self.root):
+            for name in sorted(os.listdir(self.root)):
+                n += self.update(name)
+        return n
+
+    def get_indexed_sha(self, repository):
+        rows = self._execute('SELECT sha FROM RepositoryIndexTbl WHERE repository=?', (repository,))
+        if rows:
+            return rows[0][0]
+
+    def get_labnumber_analyses(self, lns,
+                               low_post=None, high_post=None,
+                               omit_key=None, exclude_uuids=None,
+                               include_invalid=False,
+                               mass_spectrometers=None,
+                               repositories=None,
+                               order='asc',
+                               limit=None,
+                               **kw):
+        """
+        same filters as DVCDatabase.get_labnumber_analyses. return records, total count
+        """
+        where, params = self._labnumber_filter(lns, low_post, high_post, omit_key, exclude_uuids, include_invalid,
+                                               mass_spectrometers, repositories)
+
+        rs = self._query(where, params, order)
+        tc = len(rs)
+        if limit:
+            rs = rs[:limit]
+        return rs, tc
+
+    def get_labnumber_analyses_page(self, lns, after=None, limit=500,
+                                    low_post=None, high_post=None,
+                                    omit_key=None, exclude_uuids=None,
+                                    include_invalid=False,
+                                    mass_spectrometers=None,
+                                    repositories=None,
+                                    order='asc',
+                                    **kw):
+        """
+        same as DVCDatabase.get_labnumber_analyses_page. return records, cursor
+        """
+        where, params = self._labnumber_filter(lns, low_post, high_post, omit_key, exclude_uuids, include_invalid,
+                                               mass_spectrometers, repositories)
+        return self._query_page(where, params, after, limit, order)
+
+    def get_analyses_by_date_range(self, lpost, hpost,
+                                   labnumber=None,
+                                   limit=None,
+                                   analysis_type=None,
+                                   mass_spectrometers=None,
+                                   extract_device=None,
+                                   project=None,
+                                   repositories=None,
+                                   order='asc',
+                                   exclude_uuids=None,
+                                   exclude_invalid=True,
+                                   **kw):
+        where, params = self._date_range_filter(lpost, hpost, labnumber, analysis_type, mass_spectrometers,
+                                                extract_device, project, repositories, exclude_uuids, exclude_invalid)
+        rs = self._query(where, params, order)
+        if limit:
+            rs = rs[:limit]
+        return rs
+
+    def get_analyses_by_date_range_page(self, lpost, hpost, after=None, limit=500,
+                                        labnumber=None,
+                                        analysis_type=None,
+                                        mass_spectrometers=None,
+                                        extract_device=None,
+                                        project=None,
+                                        repositories=None,
+                                        order='asc',
+                                        exclude_uuids=None,
+                                        exclude_invalid=True,
+                                        **kw):
+        """
+        same as DVCDatabase.get_analyses_by_date_range_page. return records, cursor
+        """
+        where, params = self._date_range_filter(lpost, hpost, labnumber, analysis_type, mass_spectrometers,
+                                                extract_device, project, repositories, exclude_uuids, exclude_invalid)
+        return self._query_page(where, params, after, limit, order)
+
+    def find_references(self, times, atypes, hours=10, exclude=None,
+                        extract_device=None,
+                        mass_spectrometer=None,
+                        exclude_invalid=True):
+        """
+        same as DVCDatabase.find_references. ``exclude`` is a list of uuids
+        """
+        delta = timedelta(hours=hours)
+        refs = []
+        uuids = set(exclude or [])
+        for ti in times:
+            rs = self.get_analyses_by_date_range(ti - delta, ti + delta,
+                                                 extract_device=extract_device,
+                                                 mass_spectrometers=mass_spectrometer,
+                                                 analysis_type=atypes,
+                                                 exclude_invalid=exclude_invalid)
+            for r in rs:
+                if r.uuid not in uuids:
+                    uuids.add(r.uuid)
+                    refs.append(r)
+
+        return [rii for ri in refs for rii in ri.record_views]
+
+    def close(self):
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    # private
+    def _labnumber_filter(self, lns, low_post, high_post, omit_key, exclude_uuids, include_invalid,
+                          mass_spectrometers, repositories):
+        params = []
+        where = [in_clause('identifier', lns, params)]
+        if mass_spectrometers:
+            where.append(in_clause('mass_spectrometer', mass_spectrometers, params))
+        if repositories:
+            where.append(in_clause('repository', repositories, params))
+        if low_post:
+            where.append('timestamp >= ?')
+            params.append(_timestamp(low_post))
+        if high_post:
+            where.append('timestamp <= ?')
+            params.append(_timestamp(high_post))
+        if exclude_uuids:
+            where.append('NOT {}'.format(in_clause('uuid', exclude_uuids, params)))
+        if not include_invalid:
+            where.append("tag != 'invalid'")
+        if omit_key:
+            where.append('tag != ?')
+            params.append(omit_key)
+        return where, params
+
+    def _date_range_filter(self, lpost, hpost, labnumber, analysis_type, mass_spectrometers, extract_device,
+                           project, repositories, exclude_uuids, exclude_invalid):
+        params = []
+        where = []
+        if labnumber:
+            where.append('identifier = ?')
+            params.append(labnumber)
+        if mass_spectrometers:
+            where.append(in_clause('mass_spectrometer', mass_spectrometers, params))
+        if extract_device:
+            where.append('extract_device = ?')
+            params.append(extract_device)
+        if analysis_type:
+            where.append(in_clause('analysis_type', analysis_type, params))
+        if project:
+            where.append('project = ?')
+            params.append(project)
+        if repositories:
+            where.append(in_clause('repository', repositories, params))
+        if lpost:
+            where.append('timestamp >= ?')
+            params.append(_timestamp(lpost))
+        if hpost:
+            where.append('timestamp <= ?')
+            params.append(_timestamp(hpost))
+        if exclude_invalid:
+            where.append("tag != 'invalid'")
+        if exclude_uuids:
+            where.append('NOT {}'.format(in_clause('uuid', exclude_uuids, params)))
+
+        return where, params
+
+    def _query_page(self, where, params, after, limit, order):
+        """
+        return the records after the cursor ``after`` and the cursor of the next page, None if this is the last page
+        """
+        order = order or 'asc'
+        if after:
+            t, uuid = after
+            op = '<' if order == 'desc' else '>'
+            where = where + ['(timestamp {0} ? OR (timestamp = ? AND uuid {0} ?))'.format(op)]
+            params = params + [t, t, uuid]
+
+        if limit:
+            # select the uuids of the page first so only limit+1 analyses are read. an analysis in several
+            # repositories has a row for each repository
+            sub = 'SELECT uuid FROM AnalysisIndexTbl'
+            if where:
+                sub = '{} WHERE {}'.format(sub, ' AND '.join(where))
+            sub = '{0} GROUP BY timestamp, uuid ORDER BY timestamp {1}, uuid {1} LIMIT ?'.format(sub, order.upper())
+
+            params = params + params + [limit + 1]
+            where = where + ['uuid IN ({})'.format(sub)]
+
+        rs = self._query(where, params, order)
+        cursor = None
+        if limit and len(rs) > limit:
+            rs = rs[:limit]
+            last = rs[-1]
+            cursor = _timestamp(last.rundate), last.uuid
+        return rs, cursor
+
+    def _query(self, where, params, order):
+        sql = 'SELECT {} FROM AnalysisIndexTbl'.format(','.join(COLUMNS))
+        if where:
+            sql = '{} WHERE {}'.format(sql, ' AND '.join(where))
+        if order:
+            sql = '{0} ORDER BY timestamp {1}, uuid {1}'.format(sql, order.upper())
+
+        # an analysis in several repositories is one record
+        records = []
+        uuids = {}
+        for row in self._execute(sql, params):
+            r = IndexRecord(row)
+            if r.uuid in uuids:
+                uuids[r.uuid].repository_ids.append(r.repository)
+            else:
+                uuids[r.uuid] = r
+                records.append(r)
+        return records
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._get_connection().execute(sql, params).fetchall()
+
+    def _get_connection(self):
+        if self._connection is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            for s in SCHEMA:
+                conn.execute(s)
+            self._connection = conn
+        return self._connection
+
+    def _make_row(self, repository, root, d, tail):
+        p = os.path.join(root, d, '{}.json'.format(tail))
+        if not os.path.isfile(p):
+            return
+
+        jd = _load(p)
+        if 'uuid' not in jd:
+            return
+
+        ed = _load(os.path.join(root, d, 'extraction', '{}.extr.json'.format(tail)))
+        td = _load(os.path.join(root, d, 'tags', '{}.tags.json'.format(tail)))
+
+        cleanup = ed.get('cleanup_duration', ed.get('cleanup'))
+        duration = ed.get('extract_duration', ed.get('duration'))
+
+        return (repository, '{}{}'.format(d, tail), jd.get('uuid'), jd.get('identifier'),
+                jd.get('aliquot'), jd.get('increment'), jd.get('analysis_type'), _timestamp(jd.get('timestamp')),
+                jd.get('mass_spectrometer'), ed.get('extract_device'), ed.get('extract_value'), cleanup, duration,
+                jd.get('sample'), jd.get('project'), jd.get('material'),
+                jd.get('irradiation'), jd.get('irradiation_level'), jd.get('irradiation_position'),
+                td.get('name') or 'ok', jd.get('comment'), jd.get('measurement'), jd.get('extraction'))
+
+# ============= EOF =============================================
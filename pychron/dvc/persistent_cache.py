@@ -0,0 +1,208 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import cPickle as pickle
+import hashlib
+import os
+import sqlite3
+from threading import Lock
+
+from git import Repo
+
+# ============= local library imports  ==========================
+
+SCHEMA = '''CREATE TABLE IF NOT EXISTS AnalysisStateTbl (
+repository TEXT NOT NULL,
+record_id TEXT NOT NULL,
+state TEXT NOT NULL,
+files BLOB NOT NULL,
+stamps BLOB NOT NULL,
+PRIMARY KEY (repository, record_id))'''
+
+
+def get_stamp(path):
+    """
+    return the (mtime, size) of ``path`` or None if it does not exist
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    return st.st_mtime, st.st_size
+
+
+def get_blob_shas(root):
+    """
+    return a dict of path: git blob sha for the files tracked in the repository at ``root``.
+
+    files modified in the working tree are excluded because their content no longer matches the index
+    """
+    repo = Repo(root)
+    shas = {}
+    for line in repo.git.ls_files('-s').splitlines():
+        meta, path = line.split('\t', 1)
+        _, sha, _ = meta.split()
+        shas[path] = sha
+
+    for path in repo.git.diff('--name-only').splitlines():
+        shas.pop(path, None)
+
+    return shas
+
+
+class PersistentAnalysisCache(object):
+    """
+    sqlite store of the parsed json files of DVC analyses.
+
+    a row is keyed by (repository, record_id) and is only valid for the ``state`` it was written with.
+    the state of an analysis is a hash of the git blob shas of its files, so a row is
+    invalidated automatically whenever any of the files change in the repository.
+
+    the blob shas of a repository are read once with ``git ls-files`` and kept until ``invalidate``
+    is called. ``invalidate_path`` is registered as a repository change handler so the shas are reread
+    after any pull, add or commit made with a ``GitRepoManager``.
+
+    each row also stores the (mtime, size) of its files when they were read. a row is not used if any of
+    its files has changed on disk since, e.g. a save that has not been committed yet
+    """
+
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        self._shas = {}
+        self._lock = Lock()
+        self._connection = None
+
+    def invalidate(self, repository=None):
+        with self._lock:
+            if repository is None:
+                self._shas = {}
+            else:
+                self._shas.pop(repository, None)
+
+    def invalidate_path(self, path):
+        """
+        invalidate the repository at ``path`` if it is one of the repositories in ``root``
+        """
+        rp = os.path.relpath(path, self.root)
+        if rp != os.curdir and not rp.startswith(os.pardir):
+            self.invalidate(rp.split(os.sep)[0])
+
+    def get_state(self, repository, ps):
+        """
+        return the state of the analysis made up of the files ``ps`` in ``repository``.
+
+        return None if any of the files are not committed
+        """
+        shas = self._get_shas(repository)
+        if shas is None:
+            return
+
+        root = os.path.join(self.root, repository)
+        sha = hashlib.sha1()
+        for p in sorted(ps):
+            rp = os.path.relpath(p, root).replace(os.sep, '/')
+            try:
+                s = shas[rp]
+            except KeyError:
+                if os.path.isfile(p):
+                    return
+                s = 'missing'
+
+            sha.update(rp)
+            sha.update(s)
+        return sha.hexdigest()
+
+    def get(self, repository, record_id, state):
+        """
+        return a dict of path: (stamp, obj) or None if the stored state does not match ``state``
+        or any of the files changed on disk since they were stored
+        """
+        cur = self._get_connection().execute('SELECT state, files, stamps FROM AnalysisStateTbl '
+                                             'WHERE repository=? AND record_id=?', (repository, record_id))
+        row = cur.fetchone()
+        if row and row[0] == state:
+            root = os.path.join(self.root, repository)
+            files = pickle.loads(str(row[1]))
+            stamps = pickle.loads(str(row[2]))
+
+            ret = {}
+            for k, v in files.iteritems():
+                p = os.path.join(root, k)
+                stamp = stamps.get(k)
+                if stamp is None or get_stamp(p) != stamp:
+                    return
+                ret[p] = (stamp, v)
+            return ret
+
+    def put_many(self, items):
+        """
+        items: list of (repository, record_id, state, dict of path: (stamp, obj))
+        """
+        rows = []
+        for repository, record_id, state, files in items:
+            root = os.path.join(self.root, repository)
+            stamps = {}
+            objs = {}
+            for k, (stamp, v) in files.iteritems():
+                if stamp is None:
+                    continue
+                k = os.path.relpath(k, root)
+                stamps[k] = stamp
+                objs[k] = v
+
+            rows.append((repository, record_id, state,
+                         sqlite3.Binary(pickle.dumps(objs, 2)),
+                         sqlite3.Binary(pickle.dumps(stamps, 2))))
+
+        conn = self._get_connection()
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO AnalysisStateTbl VALUES (?,?,?,?,?)', rows)
+
+    def clear(self):
+        conn = self._get_connection()
+        with conn:
+            conn.execute('DELETE FROM AnalysisStateTbl')
+        self.invalidate()
+
+    def close(self):
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    # private
+    def _get_connection(self):
+        if self._connection is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(SCHEMA)
+            self._connection = conn
+        return self._connection
+
+    def _get_shas(self, repository):
+        with self._lock:
+            shas = self._shas.get(repository)
+            if shas is None:
+                root = os.path.join(self.root, repository)
+                if not os.path.isdir(os.path.join(root, '.git')):
+                    return
+
+                shas = get_blob_shas(root)
+                self._shas[repository] = shas
+            return shas
+
+# ============= EOF =============================================
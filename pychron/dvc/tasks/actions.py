@@ -65,6 +65,11 @@ class PullAction(LocalRepositoryAction):
     image = icon('arrow_down')
 
 
+class MigrateRawDataAction(LocalRepositoryAction):
+    name = 'Migrate Raw Data'
+    method = 'migrate_raw_data'
+
+
 # class PullAnalysesAction(Action):
 #     name = 'Pull Analyses'
 #     image = icon('arrow_down')
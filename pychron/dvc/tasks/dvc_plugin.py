@@ -60,6 +60,11 @@ class DVCPlugin(BaseTaskPlugin):
                 from pychron.envisage.user_login import dump_user_file
                 dump_user_file(names)
 
+        # push analyses still in the commit queue
+        persister = self.application.get_service(DVCPersister)
+        if persister:
+            persister.stop_commit_queue(timeout=120)
+
     def test_database(self):
         ret, err = True, ''
         dvc = self.application.get_service(DVC)
@@ -16,7 +16,7 @@
 
 # ============= enthought library imports =======================
 from envisage.ui.tasks.preferences_pane import PreferencesPane
-from traits.api import Str, Password, Bool
+from traits.api import Str, Password, Bool, Int, Float
 from traitsui.api import View, Item, VGroup, UItem
 
 from pychron.database.tasks.connection_preferences import ConnectionPreferences, ConnectionPreferencesPane
@@ -32,6 +32,12 @@ class DVCPreferences(BasePreferencesHelper):
     work_offline_password = Password
     work_offline_host = Str
 
+    use_cache = Bool(True)
+    max_cache_size = Int(20000)
+    load_threads = Int(4)
+    use_persistent_cache = Bool(False)
+    use_offline_index = Bool(False)
+
 
 class DVCDBConnectionPreferences(ConnectionPreferences):
     preferences_path = 'pychron.dvc.db'
@@ -59,15 +65,31 @@ class DVCPreferencesPane(PreferencesPane):
                          label='Work Offline',
                          show_border=True)
 
+        cache = VGroup(Item('use_cache', label='Use Cache',
+                            tooltip='Keep analysis files in memory. Unchanged files are not reread'),
+                       Item('max_cache_size', label='Max. Files', enabled_when='use_cache'),
+                       Item('load_threads', label='Threads',
+                            tooltip='Number of threads used to read analysis files', enabled_when='use_cache'),
+                       Item('use_persistent_cache', label='Use Persistent Cache',
+                            tooltip='Store analysis files in a local database keyed by their git blob sha '
+                                    'so they are not reread in later sessions',
+                            enabled_when='use_cache'),
+                       Item('use_offline_index', label='Use Offline Index',
+                            tooltip='Search the analyses in the local repositories instead of the database. '
+                                    'The index is updated from the commits made since it was last updated'),
+                       label='Loading', show_border=True)
+
         v = View(VGroup(VGroup(org, meta), label='Git',
                         show_border=True),
-                 offline)
+                 offline, cache)
         return v
 
 
 class DVCExperimentPreferences(BasePreferencesHelper):
     preferences_path = 'pychron.dvc.experiment'
     use_dvc_persistence = Bool
+    use_commit_queue = Bool
+    commit_queue_period = Float(300)
 
 
 class DVCExperimentPreferencesPane(PreferencesPane):
@@ -76,6 +98,13 @@ class DVCExperimentPreferencesPane(PreferencesPane):
 
     def traits_view(self):
         v = View(VGroup(Item('use_dvc_persistence', label='Use DVC Persistence'),
+                        Item('use_commit_queue', label='Commit in Background',
+                             tooltip='Commit and push analyses in a background thread instead of after each run. '
+                                     'Queued analyses are journaled and pushed after the period, at the end of '
+                                     'the experiment or when pychron quits',
+                             enabled_when='use_dvc_persistence'),
+                        Item('commit_queue_period', label='Push Period (s)',
+                             enabled_when='use_dvc_persistence and use_commit_queue'),
                         label='DVC', show_border=True))
         return v
 
@@ -23,7 +23,9 @@ from traits.api import List, Str, Any
 # ============= standard library imports ========================
 import os
 # ============= local library imports  ==========================
-from pychron.dvc.tasks.actions import CloneAction, AddBranchAction, CheckoutBranchAction, PushAction, PullAction
+from pychron.dvc.columnar import migrate_repository
+from pychron.dvc.tasks.actions import CloneAction, AddBranchAction, CheckoutBranchAction, PushAction, PullAction, \
+    MigrateRawDataAction
 from pychron.dvc.tasks.panes import RepoCentralPane, SelectionPane
 from pychron.envisage.tasks.base_task import BaseTask
 # from pychron.git_archive.history import from_gitlog
@@ -49,7 +51,8 @@ class ExperimentRepoTask(BaseTask):
                           CheckoutBranchAction(),
                           PushAction(),
 
-                          PullAction())]
+                          PullAction(),
+                          MigrateRawDataAction())]
 
     commits = List
     _repo = None
@@ -112,6 +115,19 @@ class ExperimentRepoTask(BaseTask):
             # prog.close()
             self.refresh_local_names()
 
+    def migrate_raw_data(self):
+        name = self.selected_local_repository_name
+        root = os.path.join(paths.repository_dataset_dir, name)
+        self.info('migrating raw data for {}'.format(name))
+
+        ps = migrate_repository(root, progress=self.debug)
+        if ps:
+            for p in ps:
+                self._repo.add(p, commit=False)
+            self._repo.commit('<MIGRATE> columnar raw data')
+
+        self.info('migrated {} analyses'.format(len(ps)))
+
     def add_branch(self):
         self.info('add branch')
         commit = self.selected_commit
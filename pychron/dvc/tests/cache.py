@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.dvc import dvc_dump
+from pychron.dvc.cache import AnalysisFileCache
+
+
+class AnalysisFileCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = AnalysisFileCache(max_size=2)
+        self.paths = []
+        for i in range(3):
+            p = os.path.join(self.root, '{}.json'.format(i))
+            dvc_dump({'value': i}, p)
+            self.paths.append(p)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_hit(self):
+        p = self.paths[0]
+        a = self.cache.load(p)
+        b = self.cache.load(p)
+        self.assertIs(a, b)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_changed(self):
+        p = self.paths[0]
+        self.cache.load(p)
+        dvc_dump({'value': 10}, p)
+        self.assertEqual(self.cache.load(p)['value'], 10)
+
+    def test_evict(self):
+        for p in self.paths:
+            self.cache.load(p)
+
+        self.assertEqual(len(self.cache), 2)
+        self.cache.load(self.paths[0])
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_missing(self):
+        self.assertEqual(self.cache.load(os.path.join(self.root, 'foo.json')), {})
+
+    def test_seed_changed(self):
+        p = self.paths[0]
+        stamp, obj = self.cache.load_stamped(p)
+        self.cache.clear()
+
+        dvc_dump({'value': 10}, p)
+        self.cache.seed(p, obj, stamp)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.load(p)['value'], 10)
+
+    def test_prefetch(self):
+        self.cache.max_size = 10
+        self.cache.prefetch(self.paths, 2)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.load(self.paths[2])['value'], 2)
+        self.assertEqual(self.cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
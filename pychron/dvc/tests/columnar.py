@@ -0,0 +1,65 @@
+import base64
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from pychron.dvc import dvc_dump
+from pychron.dvc.columnar import ColumnarData, migrate_repository, columnar_path, decode_blob
+from pychron.processing.isotope import Isotope
+
+
+def make_blob(xs, ys):
+    return base64.b64encode(''.join([struct.pack('>ff', x, y) for x, y in zip(xs, ys)]))
+
+
+class ColumnarTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        d = os.path.join(self.root, '123', '.data')
+        os.makedirs(d)
+        self.xs = [1.5, 2.5, 3.5]
+        self.ys = [10.25, 9.125, 8.0625]
+        self.path = os.path.join(d, '45-01.data.json')
+
+        blob = make_blob(self.xs, self.ys)
+        dvc_dump({'format': '>ff',
+                  'signals': [{'isotope': 'Ar40', 'detector': 'H1', 'blob': blob}],
+                  'baselines': [{'detector': 'H1', 'blob': blob}],
+                  'sniffs': [{'isotope': 'Ar40', 'detector': 'H1', 'blob': blob}]}, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_decode_blob(self):
+        xs, ys = decode_blob(make_blob(self.xs, self.ys))
+        self.assertEqual(list(xs), self.xs)
+        self.assertEqual(list(ys), self.ys)
+
+    def test_migrate(self):
+        ps = migrate_repository(self.root)
+        self.assertEqual(ps, [columnar_path(self.path)])
+
+        # already migrated
+        self.assertEqual(migrate_repository(self.root), [])
+
+    def test_load(self):
+        migrate_repository(self.root)
+        with ColumnarData(columnar_path(self.path)) as cd:
+            self.assertEqual(len(cd['signals']), 1)
+            self.assertEqual(cd['baselines'][0]['detector'], 'H1')
+
+            iso = Isotope('Ar40', 'H1')
+            xs, ys = cd.get_data(cd['signals'][0])
+            iso.set_data(xs, ys)
+
+        # same values as the json path
+        jiso = Isotope('Ar40', 'H1')
+        jiso.unpack_data(base64.b64decode(make_blob(self.xs, self.ys)))
+        self.assertEqual(list(iso.xs), list(jiso.xs))
+        self.assertEqual(list(iso.ys), list(jiso.ys))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from git import Repo
+
+from pychron.dvc.commit_queue import CommitQueue, commit_groups
+from pychron.git_archive.repo_manager import GitRepoManager
+from pychron.globals import globalv
+
+globalv.use_warning_display = False
+globalv.use_logger_display = False
+
+
+class FakeDVC(object):
+    def __init__(self):
+        self.online = True
+        self.meta_commits = []
+        self.npushes = 0
+        self.push_hook = None
+
+    def push_repository(self, repo):
+        self.npushes += 1
+        if self.push_hook:
+            self.push_hook()
+        if self.online:
+            repo.push(remote='origin')
+
+    def meta_fetch(self):
+        pass
+
+    def meta_pull(self, **kw):
+        pass
+
+    def meta_commit(self, msg):
+        self.meta_commits.append(msg)
+
+    def meta_push(self):
+        pass
+
+
+class CommitQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.journal = os.path.join(self.root, 'commit_queue.json')
+        self.dvc = FakeDVC()
+
+        work = os.path.join(self.root, 'work')
+        repo = Repo.init(work)
+        repo.git.config('user.email', 'test@test.com')
+        repo.git.config('user.name', 'test')
+        self._write(work, 'README', 'readme')
+        repo.git.add('README')
+        repo.git.commit('-m', 'init')
+        repo.git.branch('-M', 'master')
+
+        origin = os.path.join(self.root, 'origin.git')
+        Repo.init(origin, bare=True)
+        repo.git.remote('add', 'origin', origin)
+        repo.git.push('-u', 'origin', 'master')
+
+        self.work = work
+        self.repo = repo
+        self.origin = Repo(origin)
+        self.queue = None
+
+    def tearDown(self):
+        if self.queue:
+            self.queue.stop(5)
+        shutil.rmtree(self.root)
+
+    def _write(self, root, name, txt):
+        p = os.path.join(root, name)
+        with open(p, 'w') as wfile:
+            wfile.write(txt)
+        return p
+
+    def _queue(self):
+        self.queue = CommitQueue(self.dvc, self.journal, period=60)
+        return self.queue
+
+    def _put(self, queue, name):
+        p = self._write(self.work, '{}.json'.format(name), name)
+        fits = os.path.join(self.work, '{}.fits.json'.format(name))
+        queue.put(self.work, [([p], '<COLLECTION>'), ([fits], '<ISOEVO> default collection fits')], name)
+
+    def _origin_messages(self):
+        return self.origin.git.log('--format=%s', 'master').splitlines()
+
+    def test_commit_groups(self):
+        repo = GitRepoManager()
+        repo.open_repo(self.work)
+        p = self._write(self.work, 'a.json', 'a')
+        missing = os.path.join(self.work, 'b.json')
+        groups = [([p], 'add a'), ([missing], 'add b')]
+
+        commit_groups(repo, groups)
+        commit_groups(repo, groups)
+        self.assertEqual(self.repo.git.log('--format=%s').splitlines(), ['add a', 'init'])
+
+    def test_flush(self):
+        queue = self._queue()
+        queue.start()
+        self._put(queue, 'a')
+        self._put(queue, 'b')
+        self.assertEqual(queue.npending, 2)
+        self.assertEqual(self._origin_messages(), ['init'])
+
+        self.assertTrue(queue.flush(block=True, timeout=30))
+        self.assertEqual(self._origin_messages(), ['<COLLECTION>', '<COLLECTION>', 'init'])
+        self.assertEqual(self.dvc.meta_commits, ['repo updated for analyses a, b'])
+        self.assertFalse(queue.pending)
+        self.assertEqual(queue.status, '')
+
+    def test_journal(self):
+        queue = CommitQueue(self.dvc, self.journal)
+        self._put(queue, 'a')
+
+        # a new session finds the journaled analysis and commits it
+        queue = self._queue()
+        queue.start()
+        self.assertTrue(queue.flush(block=True, timeout=30))
+        self.assertEqual(self._origin_messages(), ['<COLLECTION>', 'init'])
+        self.assertFalse(queue.pending)
+
+    def test_push_failure(self):
+        self.dvc.online = False
+        queue = self._queue()
+        queue.start()
+        self._put(queue, 'a')
+        queue.flush(block=True, timeout=30)
+
+        self.assertEqual(self.repo.git.log('--format=%s').splitlines(), ['<COLLECTION>', 'init'])
+        self.assertEqual(self._origin_messages(), ['init'])
+        self.assertTrue(queue.pending)
+        self.assertEqual(queue.status, '1 repositories to push')
+
+        self.dvc.online = True
+        queue.flush(block=True, timeout=30)
+        self.assertEqual(self._origin_messages(), ['<COLLECTION>', 'init'])
+        self.assertFalse(queue.pending)
+
+    def test_lock(self):
+        queue = self._queue()
+        queue.start()
+        with queue.lock:
+            self._put(queue, 'a')
+            self.assertFalse(queue.flush(block=True, timeout=0.5))
+            self.assertEqual(self._origin_messages(), ['init'])
+
+        self.assertTrue(queue.flush(block=True, timeout=30))
+        self.assertEqual(self._origin_messages(), ['<COLLECTION>', 'init'])
+
+    def test_flush_waits_for_request(self):
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hook():
+            self.dvc.push_hook = None
+            entered.set()
+            release.wait(10)
+
+        self.dvc.push_hook = hook
+        queue = self._queue()
+        queue.start()
+        self._put(queue, 'a')
+        queue.flush()
+        self.assertTrue(entered.wait(10))
+
+        # queued while the first flush is running. a blocking flush must wait for a flush that includes it
+        self._put(queue, 'b')
+        threading.Timer(0.2, release.set).start()
+        self.assertTrue(queue.flush(block=True, timeout=30))
+        self.assertEqual(self._origin_messages(), ['<COLLECTION>', '<COLLECTION>', 'init'])
+
+    def test_error_backoff(self):
+        def meta_push():
+            raise RuntimeError('meta push failed')
+
+        self.dvc.meta_push = meta_push
+        self.queue = queue = CommitQueue(self.dvc, self.journal, period=0.2)
+        queue.start()
+        self._put(queue, 'a')
+
+        # the timed flush fails and is retried once a period, not continuously
+        time.sleep(0.7)
+        self.assertTrue(1 <= self.dvc.npushes <= 4, self.dvc.npushes)
+
+    def test_stop(self):
+        queue = self._queue()
+        queue.start()
+        self._put(queue, 'a')
+        queue.stop(30)
+        self.assertEqual(self._origin_messages(), ['<COLLECTION>', 'init'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from git import Repo
+
+from pychron.dvc import dvc_dump
+from pychron.dvc.offline_index import OfflineIndex, analysis_key
+
+
+def dump(obj, p):
+    d = os.path.dirname(p)
+    if not os.path.isdir(d):
+        os.makedirs(d)
+    dvc_dump(obj, p)
+
+
+class OfflineIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.repos = {}
+        self._uuid = 0
+        self.index = OfflineIndex(os.path.join(self.root, 'index.sqlite'), self.root)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.root)
+
+    def _repo(self, name):
+        repo = self.repos.get(name)
+        if repo is None:
+            rroot = os.path.join(self.root, name)
+            os.mkdir(rroot)
+            repo = Repo.init(rroot)
+            repo.git.config('user.email', 'test@test.com')
+            repo.git.config('user.name', 'test')
+            self.repos[name] = repo
+        return repo
+
+    def _add(self, name, identifier, aliquot, timestamp, analysis_type='unknown', uuid=None, tag=None,
+             extract_device='Laser'):
+        repo = self._repo(name)
+        if uuid is None:
+            self._uuid += 1
+            uuid = 'uuid{}'.format(self._uuid)
+
+        rid = '{}-{:02d}'.format(identifier, aliquot)
+        d, tail = rid[:3], rid[3:]
+        root = os.path.join(repo.working_dir, d)
+        dump({'uuid': uuid, 'identifier': identifier, 'aliquot': aliquot, 'increment': None,
+              'analysis_type': analysis_type, 'timestamp': timestamp.isoformat(),
+              'mass_spectrometer': 'jan', 'sample': 'bar', 'project': 'foo'},
+             os.path.join(root, '{}.json'.format(tail)))
+        dump({'extract_device': extract_device, 'extract_value': 5},
+             os.path.join(root, 'extraction', '{}.extr.json'.format(tail)))
+        if tag:
+            self._tag(name, rid, tag)
+        return uuid
+
+    def _tag(self, name, rid, tag):
+        root = os.path.join(self.repos[name].working_dir, rid[:3])
+        dump({'name': tag}, os.path.join(root, 'tags', '{}.tags.json'.format(rid[3:])))
+
+    def _commit(self, name):
+        repo = self.repos[name]
+        repo.git.add('-A', '.')
+        repo.git.commit('-m', 'update')
+
+    def test_analysis_key(self):
+        self.assertEqual(analysis_key('123/45-01.json'), ('123', '45-01'))
+        self.assertEqual(analysis_key('123/tags/45-01.tags.json'), ('123', '45-01'))
+        self.assertEqual(analysis_key('123/extraction/45-01.extr.json'), ('123', '45-01'))
+        self.assertIsNone(analysis_key('123/intercepts/45-01.inte.json'))
+        self.assertIsNone(analysis_key('repository.json'))
+
+    def test_update(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1))
+        self._add('a', '12345', 2, datetime(2016, 1, 2))
+        self._commit('a')
+
+        self.assertEqual(self.index.update('a'), 2)
+        self.assertEqual(self.index.update('a'), 0)
+        self.assertEqual(self.index.get_indexed_sha('a'), self.repos['a'].head.commit.hexsha)
+
+        rs, n = self.index.get_labnumber_analyses(['12345'])
+        self.assertEqual(n, 2)
+        self.assertEqual([r.aliquot for r in rs], [1, 2])
+        self.assertEqual(rs[0].extract_device, 'Laser')
+        self.assertEqual(rs[0].rundate, datetime(2016, 1, 1))
+
+        view = rs[0].record_views[0]
+        self.assertEqual(view.record_id, '12345-01')
+        self.assertEqual(view.repository_identifier, 'a')
+
+    def test_incremental(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1))
+        self._add('a', '12345', 2, datetime(2016, 1, 2))
+        self._commit('a')
+        self.index.update('a')
+
+        self._add('a', '12345', 3, datetime(2016, 1, 3))
+        self._tag('a', '12345-01', 'invalid')
+        self._commit('a')
+
+        # only the new analysis and the retagged analysis are read
+        self.assertEqual(self.index.update('a'), 2)
+
+        rs, n = self.index.get_labnumber_analyses(['12345'])
+        self.assertEqual([r.aliquot for r in rs], [2, 3])
+
+        rs, n = self.index.get_labnumber_analyses(['12345'], include_invalid=True)
+        self.assertEqual(n, 3)
+
+    def test_delete(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1))
+        self._add('a', '12345', 2, datetime(2016, 1, 2))
+        self._commit('a')
+        self.index.update('a')
+
+        repo = self.repos['a']
+        repo.git.rm('-r', '123/45-02.json', '123/extraction/45-02.extr.json')
+        repo.git.commit('-m', 'remove')
+
+        self.assertEqual(self.index.update('a'), 1)
+        rs, n = self.index.get_labnumber_analyses(['12345'])
+        self.assertEqual([r.aliquot for r in rs], [1])
+
+    def test_rewritten_history(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1))
+        self._commit('a')
+        self.index.update('a')
+
+        conn = self.index._get_connection()
+        with conn:
+            conn.execute('UPDATE RepositoryIndexTbl SET sha=?', ('0' * 40,))
+
+        self.assertEqual(self.index.update('a'), 1)
+        rs, n = self.index.get_labnumber_analyses(['12345'])
+        self.assertEqual(n, 1)
+
+    def test_filters(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1))
+        u2 = self._add('a', '12345', 2, datetime(2016, 1, 2))
+        self._add('a', '12345', 3, datetime(2016, 1, 3))
+        self._add('a', '12346', 1, datetime(2016, 1, 3))
+        self._commit('a')
+        self.index.update('a')
+
+        rs, n = self.index.get_labnumber_analyses(['12345'], low_post=datetime(2016, 1, 2))
+        self.assertEqual([r.aliquot for r in rs], [2, 3])
+
+        rs, n = self.index.get_labnumber_analyses(['12345'], high_post=datetime(2016, 1, 2), order='desc')
+        self.assertEqual([r.aliquot for r in rs], [2, 1])
+
+        rs, n = self.index.get_labnumber_analyses(['12345'], exclude_uuids=[u2])
+        self.assertEqual([r.aliquot for r in rs], [1, 3])
+
+        rs, n = self.index.get_labnumber_analyses(['12345', '12346'], limit=2)
+        self.assertEqual((len(rs), n), (2, 4))
+
+    def test_pages(self):
+        for i in range(5):
+            self._add('a', '12345', i + 1, datetime(2016, 1, 1 + i // 2))
+        self._add('b', '12345', 1, datetime(2016, 1, 1), uuid='uuid1')
+        self._commit('a')
+        self._commit('b')
+        self.index.update_all()
+
+        pages = []
+        after = None
+        while 1:
+            rs, after = self.index.get_labnumber_analyses_page(['12345'], after=after, limit=2)
+            pages.append([r.aliquot for r in rs])
+            if after is None:
+                break
+        self.assertEqual(pages, [[1, 2], [3, 4], [5]])
+
+        rs, after = self.index.get_labnumber_analyses_page(['12345'], limit=2)
+        self.assertEqual(rs[0].repository_ids, ['a', 'b'])
+
+        rs, after = self.index.get_analyses_by_date_range_page(None, None, limit=3, order='desc')
+        self.assertEqual([r.aliquot for r in rs], [5, 4, 3])
+        rs, after = self.index.get_analyses_by_date_range_page(None, None, after=after, limit=3, order='desc')
+        self.assertEqual(([r.aliquot for r in rs], after), ([2, 1], None))
+
+    def test_page_limit(self):
+        for i in range(20):
+            self._add('a', '12345', i + 1, datetime(2016, 1, 1, i))
+        self._commit('a')
+        self.index.update_all()
+
+        # only limit+1 rows are read from the table
+        nrows = []
+        execute = self.index._execute
+
+        def counted(sql, params=()):
+            rows = execute(sql, params)
+            nrows.append(len(rows))
+            return rows
+
+        self.index._execute = counted
+        rs, after = self.index.get_labnumber_analyses_page(['12345'], limit=2)
+
+        self.assertEqual([r.aliquot for r in rs], [1, 2])
+        self.assertEqual(nrows, [3])
+
+    def test_find_references(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1, 12))
+        self._add('a', '11111', 1, datetime(2016, 1, 1, 10), analysis_type='air')
+        self._add('a', '11111', 2, datetime(2016, 1, 1, 14), analysis_type='air')
+        self._add('a', '11111', 3, datetime(2016, 1, 3), analysis_type='air')
+        self._add('a', '11111', 4, datetime(2016, 1, 1, 13), analysis_type='air', extract_device='Furnace')
+        self._add('a', '22222', 1, datetime(2016, 1, 1, 11), analysis_type='blank_unknown')
+        self._commit('a')
+        self.index.update('a')
+
+        times = [datetime(2016, 1, 1, 12)]
+        refs = self.index.find_references(times, 'air', hours=5, extract_device='Laser')
+        self.assertEqual([r.record_id for r in refs], ['11111-01', '11111-02'])
+
+        refs = self.index.find_references(times, ['air', 'blank_unknown'], hours=5)
+        self.assertEqual(len(refs), 4)
+
+    def test_multiple_repositories(self):
+        self._add('a', '12345', 1, datetime(2016, 1, 1), uuid='shared')
+        self._add('b', '12345', 1, datetime(2016, 1, 1), uuid='shared')
+        self._commit('a')
+        self._commit('b')
+        self.assertEqual(self.index.update_all(), 2)
+
+        rs, n = self.index.get_labnumber_analyses(['12345'])
+        self.assertEqual(n, 1)
+        self.assertIsNone(rs[0].repository_identifier)
+        self.assertEqual([v.record_id for v in rs[0].record_views], ['12345-01-a', '12345-01-b'])
+
+        rs, n = self.index.get_labnumber_analyses(['12345'], repositories=['b'])
+        self.assertEqual(rs[0].repository_identifier, 'b')
+
+
+if __name__ == '__main__':
+    unittest.main()
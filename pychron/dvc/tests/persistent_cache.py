@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from git import Repo
+
+from pychron.dvc import dvc_dump
+from pychron.dvc.persistent_cache import PersistentAnalysisCache, get_stamp
+
+
+class PersistentAnalysisCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        rroot = os.path.join(self.root, 'repo')
+        os.mkdir(rroot)
+        self.repo = repo = Repo.init(rroot)
+        repo.git.config('user.email', 'test@test.com')
+        repo.git.config('user.name', 'test')
+
+        self.paths = [os.path.join(rroot, 'a.json'), os.path.join(rroot, 'a.intercepts.json')]
+        for p in self.paths:
+            dvc_dump({'value': 1}, p)
+
+        repo.git.add('.')
+        repo.git.commit('-m', 'init')
+        self.cache = PersistentAnalysisCache(os.path.join(self.root, 'cache.sqlite'), self.root)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.root)
+
+    def test_roundtrip(self):
+        state = self.cache.get_state('repo', self.paths)
+        self.assertIsNotNone(state)
+
+        files = {p: (get_stamp(p), {'value': 1}) for p in self.paths}
+        self.cache.put_many([('repo', 'a', state, files)])
+        self.assertEqual(self.cache.get('repo', 'a', state), files)
+
+    def test_changed_on_disk(self):
+        state = self.cache.get_state('repo', self.paths)
+        files = {p: (get_stamp(p), {'value': 1}) for p in self.paths}
+        self.cache.put_many([('repo', 'a', state, files)])
+
+        # the sha snapshot is still cached so the state does not change
+        dvc_dump({'value': 20}, self.paths[0])
+        self.assertIsNone(self.cache.get('repo', 'a', state))
+
+    def test_missing_file(self):
+        p = os.path.join(self.root, 'repo', 'a.tags.json')
+        self.assertIsNotNone(self.cache.get_state('repo', self.paths + [p]))
+
+    def test_dirty(self):
+        dvc_dump({'value': 2}, self.paths[0])
+        self.assertIsNone(self.cache.get_state('repo', self.paths))
+
+    def test_commit(self):
+        state = self.cache.get_state('repo', self.paths)
+        self.cache.put_many([('repo', 'a', state, {})])
+
+        dvc_dump({'value': 2}, self.paths[0])
+        self.repo.git.commit('-am', 'changed')
+        self.cache.invalidate_path(self.repo.working_dir)
+
+        nstate = self.cache.get_state('repo', self.paths)
+        self.assertNotEqual(state, nstate)
+        self.assertIsNone(self.cache.get('repo', 'a', nstate))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,7 @@ class AnalysisTable(ColumnSorterMixin):
 
     no_update = False
     scroll_to_row = Event
+    end_reached = Event
     refresh_needed = Event
     tabular_adapter = Instance(AnalysisAdapter)
     append_replace_enabled = Bool(True)
@@ -136,6 +137,14 @@ class AnalysisTable(ColumnSorterMixin):
         self.calculate_dts(self.analyses)
         self.scroll_to_row = len(self.analyses) - 1
 
+    def append_analyses(self, ans):
+        """
+        add the next page of analyses without moving the view
+        """
+        self.oanalyses = sort_items(self.oanalyses + ans)
+        self._analysis_filter_changed(self.analysis_filter)
+        self.calculate_dts(self.analyses)
+
     def set_analyses(self, ans, tc=None, page=None, reset_page=False, selected_identifiers=None):
         if selected_identifiers:
             aa = self.analyses
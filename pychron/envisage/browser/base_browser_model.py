@@ -491,6 +491,45 @@ class BaseBrowserModel(PersistenceLoggable, ColumnSorterMixin):
                                   **kw):
         return self._retrieve_analyses(samples=samples, **kw)
 
+    def _retrieve_analyses_page(self, samples=None, after=None, limit=500,
+                                order='asc',
+                                low_post=None,
+                                high_post=None,
+                                exclude_uuids=None,
+                                include_invalid=False,
+                                mass_spectrometers=None,
+                                repositories=None,
+                                make_records=True):
+        """
+        return a page of analyses and the cursor of the next page, None if there are no more
+        """
+        db = self.db
+        if samples:
+            lns = [si.labnumber for si in samples]
+            self.debug('retrieving page identifiers={}'.format(','.join(lns)))
+            ans, cursor = db.get_labnumber_analyses_page(lns,
+                                                         after=after,
+                                                         limit=limit,
+                                                         order=order,
+                                                         low_post=low_post,
+                                                         high_post=high_post,
+                                                         exclude_uuids=exclude_uuids,
+                                                         include_invalid=include_invalid,
+                                                         mass_spectrometers=mass_spectrometers,
+                                                         repositories=repositories)
+        else:
+            ans, cursor = db.get_analyses_by_date_range_page(low_post, high_post,
+                                                             after=after,
+                                                             limit=limit,
+                                                             order=order,
+                                                             mass_spectrometers=mass_spectrometers,
+                                                             repositories=repositories)
+        self.debug('retrieved analyses page n={}'.format(len(ans)))
+
+        if make_records:
+            ans = self._make_records(ans)
+        return ans, cursor
+
     def _make_project_records(self, ps, ms=None, include_recent=True, include_recent_first=True):
         if not ps:
             return []
@@ -524,6 +563,8 @@ class BaseBrowserModel(PersistenceLoggable, ColumnSorterMixin):
         import time
         st = time.time()
 
+        ans = self.db.make_analysis_records(ans)
+
         def func(xi, prog, i, n):
             if prog:
                 if i == 0:
@@ -18,7 +18,7 @@
 import re
 
 from apptools.preferences.preference_binding import bind_preference
-from traits.api import Button, Instance
+from traits.api import Button, Instance, on_trait_change
 
 from pychron.envisage.browser.analysis_table import AnalysisTable
 from pychron.envisage.browser.browser_model import BrowserModel
@@ -39,6 +39,9 @@ class SampleBrowserModel(BrowserModel):
     analysis_table = Instance(AnalysisTable)
     time_view_model = Instance(TimeViewModel)
 
+    # (samples, query keywords, cursor) of the next page of analyses
+    _next_page = None
+
     def __init__(self, *args, **kw):
         super(SampleBrowserModel, self).__init__(*args, **kw)
         prefid = 'pychron.browser'
@@ -211,6 +214,7 @@ class SampleBrowserModel(BrowserModel):
 
     def _selected_samples_changed_hook(self, new):
         self.analysis_table.selected = []
+        self._next_page = None
 
         ans = []
         if new:
@@ -227,16 +231,26 @@ class SampleBrowserModel(BrowserModel):
                       )
 
             lp, hp = self.low_post, self.high_post
-            ans = self._retrieve_sample_analyses(new,
-                                                 low_post=lp,
-                                                 high_post=hp,
-                                                 **kw)
+            kw.update(low_post=lp, high_post=hp)
+            ans, cursor = self._retrieve_analyses_page(new, **kw)
+            self._next_page = (new, kw, cursor) if cursor else None
 
             self.debug('selected samples changed. loading analyses. '
                        'low={}, high={}, limit={} n={}'.format(lp, hp, lim, len(ans)))
 
         self.analysis_table.set_analyses(ans, selected_identifiers={ai.identifier for ai in new})
 
+    @on_trait_change('analysis_table:end_reached')
+    def _load_next_page(self):
+        if self._next_page is None:
+            return
+
+        samples, kw, cursor = self._next_page
+        ans, cursor = self._retrieve_analyses_page(samples, after=cursor, **kw)
+        self._next_page = (samples, kw, cursor) if cursor else None
+        self.debug('loading next page of analyses n={}'.format(len(ans)))
+        self.analysis_table.append_analyses(ans)
+
     # private
     def _find_references_hook(self):
         ans = self.analysis_table.analyses
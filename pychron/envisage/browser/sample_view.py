@@ -286,6 +286,7 @@ class BrowserSampleView(BaseBrowserSampleView):
                                       multi_select=self.pane.multi_select,
                                       drag_external=True,
                                       scroll_to_row='analysis_table.scroll_to_row',
+                                      scrolled_to_end='analysis_table.end_reached',
                                       stretch_last_section=False)),
                             defined_when=self.pane.analyses_defined,
                             show_border=True,
@@ -107,6 +107,7 @@ class Searcher(Loggable):
                 prog.change_message('Loading {}'.format(xi.record_id))
             return xi.record_views
 
+        ans = self.db.make_analysis_records(ans)
         return progress_loader(ans, func, threshold=25, step=25)
 
     def _load_entries(self):
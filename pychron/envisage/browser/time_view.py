@@ -243,6 +243,7 @@ class TimeViewModel(HasTraits):
                 prog.change_message('Loading {}'.format(xi.record_id))
             return xi.record_views
 
+        ans = self.db.make_analysis_records(ans)
         return progress_loader(ans, func, threshold=25)
 
     def traits_view(self):
@@ -208,6 +208,7 @@ class AutomatedRun(Loggable):
 
         self.persister.set_preferences(preferences)
         self.multi_collector.console_set_preferences(preferences, 'pychron.experiment')
+        set_preference(preferences, self.multi_collector, 'prefetch_size', 'pychron.experiment.prefetch_size', int)
         self.peak_hop_collector.console_set_preferences(preferences, 'pychron.experiment')
 
     # ===============================================================================
@@ -23,6 +23,7 @@ from pyface.timer.do_later import do_later
 from traits.api import Any, List, CInt, Int, Bool, Enum, Str
 
 from pychron.envisage.consoleable import Consoleable
+from pychron.experiment.automated_run.prefetch_reader import PrefetchReader
 from pychron.globals import globalv
 from pychron.pychron_constants import AR_AR, SIGNAL, BASELINE, WHIFF, SNIFF
 
@@ -58,11 +59,19 @@ class DataCollector(Consoleable):
 
     collection_kind = Enum((SNIFF, WHIFF, BASELINE, SIGNAL))
     refresh_age = False
+    use_online_regression = True
+    _refresh_age_period = 5
     _data = None
     _temp_conds = None
     _result = None
     _queue = None
 
+    # number of reads a reader thread may fetch ahead of the collector. 0 reads on the collector thread
+    prefetch_size = Int(0)
+    _supports_prefetch = True
+    _reader = None
+    _read_time = None
+
     err_message = Str
 
     def wait(self):
@@ -111,7 +120,20 @@ class DataCollector(Consoleable):
 
         self._alive = True
 
-        self._measure(evt)
+        ig = self.isotope_group
+        online = False
+        if ig:
+            ig.reserve(self.ncounts, self.collection_kind)
+            if self.use_online_regression:
+                online = ig.set_online_regression(True, self.collection_kind)
+
+        # refresh the age every count if all the isotopes are fit online
+        self._refresh_age_period = 1 if online else 5
+        try:
+            self._measure(evt)
+        finally:
+            if ig and self.use_online_regression:
+                ig.set_online_regression(False, self.collection_kind)
 
         tt = time.time() - st
         self.debug('estimated time: {:0.3f} actual time: :{:0.3f}'.format(et, tt))
@@ -146,17 +168,35 @@ class DataCollector(Consoleable):
         t.start()
 
         period = self.period_ms * 0.001
+        reader = None
+        if self.prefetch_size and self._supports_prefetch:
+            # reads are paced by the reader so do not wait between iterations
+            self.debug('prefetching data. size={}'.format(self.prefetch_size))
+            reader = PrefetchReader(lambda: next(self.data_generator), period, self.prefetch_size, evt,
+                                    clock=self._get_time)
+            reader.start()
+            period = 0
+
+        self._reader = reader
+        self._read_time = None
         i = 1
-        while not evt.is_set():
-            st = time.time()
-            if not self._iter(i):
-                break
-
-            i += 1
-            evt.wait(max(0, period - time.time() + st))
-            # time.sleep(max(0, period - et))
+        try:
+            while not evt.is_set():
+                st = time.time()
+                if not self._iter(i):
+                    break
+
+                i += 1
+                if period:
+                    evt.wait(max(0, period - time.time() + st))
+                    # time.sleep(max(0, period - et))
+        finally:
+            evt.set()
+            if reader:
+                reader.join()
+                self._reader = None
+                self._read_time = None
 
-        evt.set()
         self.debug('waiting for write to finish')
         t.join()
 
@@ -190,7 +230,7 @@ class DataCollector(Consoleable):
                 # evt.set()
 
     def _post_iter_hook(self, i):
-        if self.experiment_type == AR_AR and self.refresh_age and not i % 5:
+        if self.experiment_type == AR_AR and self.refresh_age and not i % self._refresh_age_period:
             t = Timer(0.05, self.isotope_group.calculate_age, kwargs={'force': True})
             t.start()
 
@@ -210,7 +250,7 @@ class DataCollector(Consoleable):
         # data is tuple (keys[], signals[])
         k, s = data
         if k is not None and s is not None:
-            x = self._get_time()
+            x = self._get_time() if self._read_time is None else self._read_time
             self._save_data(x, k, s)
             self._plot_data(i, x, k, s)
         # if k and s are both None that means failed to get intensity from spectrometer, but n failures is less than
@@ -223,7 +263,13 @@ class DataCollector(Consoleable):
         return time.time() - self.starttime
 
     def _get_data(self, detectors=None):
-        data = next(self.data_generator)
+        if self._reader:
+            data = self._reader.get()
+            if data:
+                self._read_time, data = data
+        else:
+            data = next(self.data_generator)
+
         if data:
             if detectors:
                 data = zip(*[d for d in zip(*data) if d[0] in detectors])
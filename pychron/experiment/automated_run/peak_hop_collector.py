@@ -32,6 +32,8 @@ class PeakHopCollector(DataCollector):
     ncycles = Int
     parent = Instance('pychron.experiment.automated_run.automated_run.AutomatedRun')
     _was_deflected = False
+    # the magnet is moved between reads
+    _supports_prefetch = False
     hop_generator = None
 
     def set_hops(self, hops):
@@ -19,6 +19,7 @@ import binascii
 import math
 import os
 import time
+from contextlib import contextmanager
 
 from traits.api import Instance, Bool, Interface, provides, Long, Str, Float
 from xlwt import Workbook, struct
@@ -30,6 +31,7 @@ from pychron.core.ui.preference_binding import set_preference
 from pychron.database.adapters.local_lab_adapter import LocalLabAdapter
 from pychron.experiment.automated_run.hop_util import parse_hops
 from pychron.loggable import Loggable
+from pychron.managers.data_managers.buffered_table_writer import BufferedTableWriter
 from pychron.paths import paths
 from pychron.processing.export.export_spec import MassSpecExportSpec
 from pychron.pychron_constants import NULL_STR, DETECTOR_IC
@@ -222,11 +224,13 @@ class AutomatedRunPersister(BasePersister):
     _db_extraction_id = None
     _temp_analysis_buffer = None
     _current_data_frame = None
+    _data_writers = None
 
     def __init__(self, *args, **kw):
         super(AutomatedRunPersister, self).__init__(*args, **kw)
         # self.bind_preferences()
         self._temp_analysis_buffer = []
+        self._data_writers = []
 
     def set_preferences(self, preferences):
         """
@@ -276,19 +280,22 @@ class AutomatedRunPersister(BasePersister):
         grpname should be a str such as "signal", "baseline",etc
         return a closure for writing the data
 
+        rows are buffered by a ``BufferedTableWriter`` and written in blocks. buffered rows are
+        flushed when the ``writer_ctx`` exits
+
         :param grpname: str
         :return: function
         """
-        tables = {}
+        dm = self.data_manager
 
-        def write_data(dets, x, keys, signals):
-            # todo: test whether saving data to h5 in real time is expansive
+        def get_table(key):
+            grp, k = key
+            return dm.get_table(k, grp)
 
-            # disable H5 data writer
-            # self.unique_warning('NOT Writing data to H5 in real time')
-            # return
+        writer = BufferedTableWriter(get_table)
+        self._data_writers.append((grpname, writer))
 
-            dm = self.data_manager
+        def write_data(dets, x, keys, signals):
             for det in dets:
                 k = det.name
                 try:
@@ -298,18 +305,9 @@ class AutomatedRunPersister(BasePersister):
                         else:
                             grp = '/{}/{}'.format(grpname, det.isotope)
 
-                        tag = '{}/{}'.format(grp, k)
-                        if tag in tables:
-                            t = tables['tag']
-                        else:
-                            t = dm.get_table(k, grp)
-
-                        nrow = t.row
-                        nrow['time'] = x
-                        nrow['value'] = signals[keys.index(k)]
-                        nrow.append()
-                        t.flush()
-                except AttributeError, e:
+                        if not writer.add_row((grp, k), (x, signals[keys.index(k)])):
+                            self.debug('no table. group:{} det:{} iso:{}'.format(grpname, k, det.isotope))
+                except (AttributeError, ValueError), e:
                     self.debug('error: {} group:{} det:{} iso:{}'.format(e, grpname, k, det.isotope))
 
         return write_data
@@ -360,8 +358,13 @@ class AutomatedRunPersister(BasePersister):
     def get_last_aliquot(self, identifier):
         return self.datahub.get_greatest_aliquot(identifier)
 
+    @contextmanager
     def writer_ctx(self):
-        return self.data_manager.open_file(self._current_data_frame)
+        with self.data_manager.open_file(self._current_data_frame) as f:
+            try:
+                yield f
+            finally:
+                self._flush_data_writers()
 
     # def pre_extraction_save(self):
     #     """
@@ -439,6 +442,7 @@ class AutomatedRunPersister(BasePersister):
             return
 
         self.info('post measurement save')
+        self._report_data_writers()
         if not self.save_enabled:
             self.info('Database saving disabled')
             return
@@ -575,6 +579,23 @@ class AutomatedRunPersister(BasePersister):
                     # mem_log('post mass spec save')
 
     # private
+    def _flush_data_writers(self):
+        for grpname, writer in self._data_writers:
+            try:
+                writer.flush(close=True)
+            except BaseException, e:
+                self.warning('failed flushing {} data. {}'.format(grpname, e))
+
+    def _report_data_writers(self):
+        writers = self._data_writers
+        if self._current_data_frame and any(w.has_pending() for _, w in writers):
+            with self.writer_ctx():
+                pass
+
+        for grpname, writer in writers:
+            self.debug('{} data writer {}'.format(grpname, writer.report()))
+        self._data_writers = []
+
     def _save_detector_ic_csv(self):
 
         from pychron.experiment.utilities.detector_ic import make_items, save_csv
@@ -0,0 +1,106 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import sys
+import time
+from Queue import Queue, Empty, Full
+from threading import Thread
+
+# ============= local library imports  ==========================
+POLL_PERIOD = 0.25
+
+
+class PrefetchReader(object):
+    """
+    read data in a dedicated thread on a fixed clock.
+
+    ``read`` is called every ``period`` seconds, scheduled from the first read so slow consumers do not
+    shift the reads. each result is timestamped with ``clock()`` when ``read`` returns and put in a
+    queue of at most ``size`` items. if the queue is full the reader waits for the consumer.
+
+    a read that returns None ends reading. an exception raised by ``read`` is raised by ``get``.
+    reading stops when ``evt`` is set
+    """
+
+    def __init__(self, read, period, size, evt, clock=time.time):
+        self._read = read
+        self._period = period
+        self._clock = clock
+        self._evt = evt
+        self._queue = Queue(maxsize=max(1, size))
+        self._thread = None
+
+    def start(self):
+        self._thread = t = Thread(target=self._run, name='PrefetchReader')
+        t.setDaemon(True)
+        t.start()
+
+    def get(self):
+        """
+        return the next (timestamp, data). return None if reading stopped
+        """
+        q = self._queue
+        while 1:
+            try:
+                item = q.get(timeout=POLL_PERIOD)
+            except Empty:
+                if not self._thread.is_alive() and q.empty():
+                    return
+                continue
+
+            x, data, exc = item
+            if exc is not None:
+                raise exc[0], exc[1], exc[2]
+            return x, data
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        evt = self._evt
+        period = self._period
+        st = time.time()
+        k = 0
+        while not evt.is_set():
+            exc = None
+            try:
+                data = self._read()
+            except BaseException:
+                data, exc = None, sys.exc_info()
+
+            if not self._put((self._clock(), data, exc)) or data is None:
+                break
+
+            k += 1
+            delay = st + k * period - time.time()
+            if delay < 0:
+                # a read overran its slot. restart the clock instead of reading in a burst to catch up
+                st -= delay
+            else:
+                evt.wait(delay)
+
+    def _put(self, item):
+        while not self._evt.is_set():
+            try:
+                self._queue.put(item, timeout=POLL_PERIOD)
+                return True
+            except Full:
+                pass
+
+# ============= EOF =============================================
@@ -22,6 +22,7 @@ from traits.api import Str, Either, Int, Callable, Bool, Float, Enum
 # ============= standard library imports ========================
 from traits.trait_types import BaseStr
 from uncertainties import nominal_value, std_dev
+import logging
 import pprint
 # ============= local library imports  ==========================
 import yaml
@@ -161,6 +162,13 @@ class BaseConditional(Loggable):
                        ntrips=ntrips, analysis_types=analysis_types,
                        **kw)
         self._from_dict_hook(cd)
+        try:
+            self.compile()
+        except SyntaxError, e:
+            self.warning('invalid conditional "{}". {}'.format(teststr, e))
+
+    def compile(self):
+        pass
 
     def _from_dict_hook(self, cd):
         pass
@@ -214,7 +222,7 @@ class AutomatedRunConditional(BaseConditional):
 
     _teststr = None
     _ctx = None
-    value_context = None
+    _compiled = None
 
     # def __init__(self, attr, teststr,
     # start_count=0,
@@ -257,6 +265,43 @@ class AutomatedRunConditional(BaseConditional):
         hash_id = self._hash_id()
         return {'teststr': self._teststr, 'context': self.value_context, 'hash_id': hash_id}
 
+    @property
+    def value_context(self):
+        if self._ctx is not None:
+            return pprint.pformat(self._ctx, width=1)
+
+    def compile(self):
+        """
+        tokenize the teststr once and make the getters, the test code and the mapper used by ``_check``
+        """
+        teststr = self.teststr
+        use_std = bool(STD_REGEX.match(teststr))
+
+        terms = []
+        tt = []
+        for ti, oper in tokenize(teststr):
+            ts, attr, func = get_teststr_attr_func(ti)
+
+            attr = attr.replace('(', '_').replace(')', '_')
+            ts = ts.replace('(', '_').replace(')', '_')
+
+            terms.append((attr, func))
+            tt.append(ts)
+            if oper:
+                tt.append(oper)
+
+        ts = ' '.join(tt)
+        interpolated = [m.group(0) for m in INTERPOLATE_REGEX.finditer(ts)]
+        code = None if interpolated else compile(ts, '<conditional>', 'eval')
+
+        mapper = None
+        if self.mapper:
+            m = MAPPER_KEY_REGEX.search(self.mapper)
+            if m:
+                mapper = m.group(0), compile(self.mapper, '<mapper>', 'eval')
+
+        self._compiled = terms, ts, code, interpolated, use_std, mapper
+
     def _should_check(self, run, data, cnt):
         if self.analysis_types:
             if run.analysis_type.lower() not in self.analysis_types:
@@ -279,19 +324,23 @@ class AutomatedRunConditional(BaseConditional):
 
     def _check(self, run, data):
         """
-        make a teststr and context from the run and data
-        evaluate the teststr with the context
+        make a context from the run and data
+        evaluate the compiled teststr with the context
 
         """
-        teststr, ctx = self._make_context(run, data)
+        if self._compiled is None:
+            self.compile()
+
+        teststr, code, ctx = self._make_context(run, data)
         self._teststr, self._ctx = teststr, ctx
 
-        self.value_context = vc = pprint.pformat(ctx, width=1)
+        if self.logger is not None and self.logger.isEnabledFor(logging.DEBUG):
+            self.debug('testing {}'.format(teststr))
+            msg = 'evaluate ot="{}" t="{}", ctx="{}"'.format(self.teststr, teststr, self.value_context)
+            self.debug(msg)
 
-        self.debug('testing {}'.format(teststr))
-        msg = 'evaluate ot="{}" t="{}", ctx="{}"'.format(self.teststr, teststr, vc)
-        self.debug(msg)
-        if eval(teststr, ctx):
+        # evaluate against a copy. eval adds __builtins__ to its globals
+        if eval(code, dict(ctx)):
             self.trips += 1
             self.debug('condition {} is true trips={}/{}'.format(teststr, self.trips,
                                                                  self.ntrips))
@@ -304,44 +353,36 @@ class AutomatedRunConditional(BaseConditional):
             self.trips = 0
 
     def _make_context(self, obj, data):
-        teststr = self.teststr
+        terms, teststr, code, interpolated, use_std, mapper = self._compiled
 
         ctx = {}
-        tt = []
-        for ti, oper in tokenize(teststr):
-            ts, attr, func = get_teststr_attr_func(ti)
-
-            attr = attr.replace('(', '_').replace(')', '_')
-            ts = ts.replace('(', '_').replace(')', '_')
-
-            v = func(obj, data, self.window)
-
-            vv = std_dev(v) if STD_REGEX.match(teststr) else nominal_value(v)
-            vv = self._map_value(vv)
+        window = self.window
+        for attr, func in terms:
+            v = func(obj, data, window)
+
+            vv = std_dev(v) if use_std else nominal_value(v)
+            if mapper:
+                key, mcode = mapper
+                vv = eval(mcode, {key: vv})
             ctx[attr] = vv
 
-            ts = self._interpolate_teststr(ts, obj, data)
-            tt.append(ts)
-            if oper:
-                tt.append(oper)
+        if interpolated:
+            teststr = self._interpolate_teststr(teststr, interpolated, obj)
+            code = compile(teststr, '<conditional>', 'eval')
 
-        return ' '.join(tt), ctx
+        return teststr, code, ctx
 
-    def _map_value(self, vv):
-        if self.mapper:
-            m = MAPPER_KEY_REGEX.search(self.mapper)
-            if m:
-                key = m.group(0)
-                vv = eval(self.mapper, {key: vv})
-        return vv
-
-    def _interpolate_teststr(self, ts, obj, data):
-        nts = ts
-        for temp in INTERPOLATE_REGEX.finditer(ts):
-            temp = temp.group(0)
+    def _interpolate_teststr(self, ts, interpolated, obj):
+        for temp in interpolated:
             new = obj.get_interpolated_value(temp)
-            nts = nts.replace(temp, str(new))
-        return nts
+            ts = ts.replace(temp, str(new))
+        return ts
+
+    def _teststr_changed(self):
+        self._compiled = None
+
+    def _mapper_changed(self):
+        self._compiled = None
 
 
 class TruncationConditional(AutomatedRunConditional):
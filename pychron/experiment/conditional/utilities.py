@@ -78,7 +78,8 @@ def get_teststr_attr_func(token):
 
 # wrappers
 def wrapper(fstr, token, ai):
-    return lambda obj, data, window: eval(fstr, {'attr': ai,
+    code = compile(fstr, '<conditional>', 'eval')
+    return lambda obj, data, window: eval(code, {'attr': ai,
                                                  'aa': obj.isotope_group,
                                                  'obj': obj,
                                                  'data': data, 'window': window})
@@ -180,6 +180,9 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
     # dvc
     use_dvc_persistence = Bool(False)
+    use_commit_queue = Bool(False)
+    commit_queue_period = Float(300)
+    commit_queue_status = Str
     default_principal_investigator = Str
 
     baseline_color = Color
@@ -255,7 +258,8 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
         # dvc
 
-        self._preference_binder('pychron.dvc.experiment', ('use_dvc_persistence',))
+        self._preference_binder('pychron.dvc.experiment', ('use_dvc_persistence', 'use_commit_queue',
+                                                           'commit_queue_period'))
         # dashboard
         self._preference_binder('pychron.dashboard.experiment', ('use_dashboard_client',))
 
@@ -977,8 +981,16 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
         msg = '{} {}'.format(n, msg)
         self._set_message(msg, c)
 
+        if self.use_dvc_persistence and self.use_commit_queue:
+            dvcp = self.application.get_service('pychron.dvc.dvc_persister.DVCPersister')
+            if dvcp:
+                dvcp.flush_commit_queue()
+
         invoke_in_main_thread(self._show_shareables)
 
+    def _update_commit_queue_status(self, new):
+        invoke_in_main_thread(self.trait_set, commit_queue_status=new)
+
     def _show_shareables(self):
         if self.use_dvc_persistence:
             from pychron.dvc.share import PushExperimentsModel
@@ -1233,6 +1245,10 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
             if dvcp:
                 dvcp.load_name = exp.load_name
                 dvcp.default_principal_investigator = self.default_principal_investigator
+                dvcp.use_commit_queue = self.use_commit_queue
+                dvcp.commit_queue_period = self.commit_queue_period
+                if self.use_commit_queue:
+                    dvcp.commit_queue.on_trait_change(self._update_commit_queue_status, 'status')
                 arun.dvc_persister = dvcp
 
                 repid = spec.repository_identifier
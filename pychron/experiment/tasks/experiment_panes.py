@@ -379,7 +379,8 @@ Quick=   measure_iteration stopped at current step
                         CustomLabel('object.experiment_status.label',
                                     color_name='object.experiment_status.color',
                                     size=24,
-                                    weight='bold'), spring))
+                                    weight='bold'), spring,
+                        CustomLabel('object.commit_queue_status')))
         return v
 
 
@@ -96,6 +96,7 @@ class ExperimentPreferences(BasePreferencesHelper):
 
     n_executed_display = Int
     failed_intensity_count_threshold = Int(3)
+    prefetch_size = Int(0)
 
     def _get_memory_threshold(self):
         return self._memory_threshold
@@ -227,6 +228,10 @@ class ExperimentPreferencesPane(PreferencesPane):
                                           label='N. Failed Intensity',
                                           tooltip='Cancel Experiment if pychron fails to get intensities from '
                                                   'mass spectrometer more than "N. Failed Intensity" times'),
+                                     Item('prefetch_size',
+                                          label='N. Prefetch',
+                                          tooltip='Read intensities in a separate thread on the integration time '
+                                                  'clock and buffer up to "N. Prefetch" reads. 0 disables'),
                                      pc_grp,
                                      persist_grp,
                                      monitor_grp, overlap_grp),
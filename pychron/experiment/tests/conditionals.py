@@ -1,3 +1,4 @@
+import pprint
 import unittest
 
 from numpy import linspace
@@ -298,6 +299,31 @@ class ConditionalsTestCase(unittest.TestCase):
         d = {'check': 'L2(CDD).deflection==2000', 'attr': 'CDD'}
         self._test(d)
 
+    def test_Compiled(self):
+        c = conditional_from_dict({'check': 'age>0.1 and Ar40<100', 'attr': 'age'}, 'TerminationConditional')
+        compiled = c._compiled
+        self.assertIsNotNone(compiled)
+        for i in range(3):
+            self.assertTrue(c.check(self.arun, ([], []), 1000))
+        self.assertIs(c._compiled, compiled)
+        self.assertEqual(c.result_dict()['teststr'], 'age>0.1 and Ar40<100')
+
+    def test_Recompile(self):
+        c = conditional_from_dict({'check': 'age>0.1', 'attr': 'age'}, 'TerminationConditional')
+        self.assertTrue(c.check(self.arun, ([], []), 1000))
+        c.teststr = 'age<0.1'
+        self.assertIsNone(c.check(self.arun, ([], []), 1000))
+
+    def test_ValueContext(self):
+        c = conditional_from_dict({'check': 'Ar40>900', 'attr': 'Ar40', 'mapper': 'x+1000'},
+                                  'TerminationConditional')
+        self.assertIsNone(c.value_context)
+        c.check(self.arun, ([], []), 1000)
+        self.assertNotIn('__builtins__', c.value_context)
+        self.assertEqual(c._ctx.keys(), ['Ar40'])
+        self.assertGreater(c._ctx['Ar40'], 900)
+        self.assertEqual(c.result_dict()['context'], pprint.pformat({'Ar40': c._ctx['Ar40']}, width=1))
+
     def _test_between(self, l, h):
         self.arun.isotope_group.isotopes['Ar40'].value = 3.4
         d = {'check': 'between(Ar40,{},{})'.format(l, h), 'attr': 'Ar40'}
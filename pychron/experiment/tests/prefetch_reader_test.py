@@ -0,0 +1,68 @@
+import time
+from threading import Event
+from unittest import TestCase
+
+from pychron.experiment.automated_run.prefetch_reader import PrefetchReader
+
+
+class PrefetchReaderTestCase(TestCase):
+    def setUp(self):
+        self.evt = Event()
+        self.n = 0
+
+    def tearDown(self):
+        self.evt.set()
+
+    def _read(self):
+        self.n += 1
+        return self.n
+
+    def _reader(self, read, period=0.01, size=5):
+        r = PrefetchReader(read, period, size, self.evt)
+        r.start()
+        return r
+
+    def test_order(self):
+        r = self._reader(self._read)
+        self.assertEqual([r.get()[1] for _ in range(10)], range(1, 11))
+
+    def test_clock(self):
+        r = self._reader(self._read, period=0.05)
+        xs = [r.get()[0] for _ in range(5)]
+        # reads are scheduled on the clock not by the consumer
+        time.sleep(0.2)
+        xs.extend(r.get()[0] for _ in range(3))
+        dt = [b - a for a, b in zip(xs, xs[1:])]
+        self.assertTrue(all(0.03 < d < 0.09 for d in dt), dt)
+
+    def test_bounded(self):
+        r = self._reader(self._read, period=0, size=3)
+        time.sleep(0.1)
+        self.assertLessEqual(self.n, 4)
+        self.assertEqual(r.get()[1], 1)
+
+    def test_end(self):
+        def read():
+            self.n += 1
+            if self.n < 3:
+                return self.n
+
+        r = self._reader(read)
+        self.assertEqual(r.get()[1], 1)
+        self.assertEqual(r.get()[1], 2)
+        self.assertIsNone(r.get()[1])
+        r.join(1)
+        self.assertIsNone(r.get())
+
+    def test_exception(self):
+        def read():
+            raise ValueError('bad')
+
+        r = self._reader(read)
+        self.assertRaises(ValueError, r.get)
+
+    def test_stop(self):
+        r = self._reader(self._read, period=0, size=1)
+        self.evt.set()
+        r.join(1)
+        self.assertFalse(r._thread.is_alive())
@@ -35,7 +35,7 @@ from pychron.envisage.view_util import open_view
 from pychron.git_archive.commit import Commit
 from pychron.git_archive.diff_view import DiffView, DiffModel
 from pychron.git_archive.merge_view import MergeModel, MergeView
-from pychron.git_archive.utils import get_head_commit
+from pychron.git_archive.utils import get_head_commit, notify_repository_changed
 from pychron.git_archive.views import NewBranchView
 from pychron.loggable import Loggable
 
@@ -160,6 +160,7 @@ class GitRepoManager(Loggable):
         for p in ps:
             self.debug('adding to index: {}'.format(os.path.relpath(p, self.path)))
         self.index.add(ps)
+        self._repository_changed()
         return changed
 
     def add_ignore(self, *args):
@@ -438,6 +439,7 @@ class GitRepoManager(Loggable):
                 ds[:] = [d for d in ds if d[0] != '.']
                 ps = [os.path.join(r, fi) for fi in fs]
                 func(ps, extension)
+        self._repository_changed()
 
     def update_gitignore(self, *args):
         p = os.path.join(self.path, '.gitignore')
@@ -472,6 +474,7 @@ class GitRepoManager(Loggable):
         branch = getattr(repo.heads, name)
         try:
             branch.checkout()
+            self._repository_changed()
             self.selected_branch = name
             self._load_branch_history()
             self.information_dialog('Repository now on branch "{}"'.format(name))
@@ -495,6 +498,7 @@ class GitRepoManager(Loggable):
         if name not in repo.branches:
             branch = repo.create_head(name, commit=commit)
             branch.checkout()
+            self._repository_changed()
             self.information_dialog('Repository now on branch "{}"'.format(name))
             return True
 
@@ -557,6 +561,8 @@ class GitRepoManager(Loggable):
                 self.debug(e)
                 if not handled:
                     raise e
+            finally:
+                self._repository_changed()
 
             if use_progress:
                 prog.close()
@@ -583,9 +589,12 @@ class GitRepoManager(Loggable):
 
     def smart_pull(self, branch='master', remote='origin',
                    quiet=True,
-                   accept_our=False, accept_their=False):
+                   accept_our=False, accept_their=False, fetch=True):
+        """
+        merge the remote branch. if ``fetch`` is False the last fetched state of the remote is used
+        """
         try:
-            ahead, behind = self.ahead_behind(remote)
+            ahead, behind = self.ahead_behind(remote, fetch=fetch)
         except GitCommandError, e:
             self.debug('Smart pull error: {}'.format(e))
             return
@@ -604,6 +613,7 @@ class GitRepoManager(Loggable):
 
                 # do merge
                 self._git_command(lambda: repo.git.merge('FETCH_HEAD'), 'GitRepoManager.smart_pull/ahead')
+                self._repository_changed()
                 # try:
                 #     repo.git.merge('FETCH_HEAD')
                 # except BaseException:
@@ -629,6 +639,7 @@ class GitRepoManager(Loggable):
             else:
                 self.debug('merging {} commits'.format(behind))
                 self._git_command(lambda: repo.git.merge('FETCH_HEAD'), 'GitRepoManager.smart_pull/!ahead')
+                self._repository_changed()
                 # repo.git.merge('FETCH_HEAD')
         else:
             self.debug('Up-to-date with {}'.format(remote))
@@ -642,13 +653,14 @@ class GitRepoManager(Loggable):
             return self._git_command(lambda: self._repo.git.fetch(remote), 'GitRepoManager.fetch')
             # return self._repo.git.fetch(remote)
 
-    def ahead_behind(self, remote='origin'):
+    def ahead_behind(self, remote='origin', fetch=True):
         ahead = 0
         behind = 0
         repo = self._repo
 
         # repo.git.rev_list('origin..')
-        self.fetch(remote)
+        if fetch:
+            self.fetch(remote)
         # status = repo.git.status('-sb')
         status = self._git_command(lambda: repo.git.status('-sb'), 'GitRepoManager.ahead_behind')
 
@@ -669,12 +681,14 @@ class GitRepoManager(Loggable):
         src = getattr(repo.branches, src)
         # repo.git.merge(src.commit)
         self._git_command(lambda: repo.git.merge(src.commit), 'GitRepoManager.merge')
+        self._repository_changed()
 
     def commit(self, msg):
         self.debug('commit message={}'.format(msg))
         index = self.index
         if index:
             index.commit(msg)
+            self._repository_changed()
 
     def add(self, p, msg=None, msg_prefix=None, verbose=True, **kw):
         repo = self._repo
@@ -736,6 +750,7 @@ class GitRepoManager(Loggable):
 
     def revert(self, hexsha, path):
         self._repo.git.checkout(hexsha, path)
+        self._repository_changed()
         self.path_dirty = path
         self._set_active_commit()
 
@@ -787,6 +802,10 @@ class GitRepoManager(Loggable):
 
             if commit:
                 index.commit(msg)
+            self._repository_changed()
+
+    def _repository_changed(self):
+        notify_repository_changed(self.path)
 
     def _get_remote(self, remote):
         repo = self._repo
@@ -25,6 +25,26 @@ from traits.api import HasTraits, Str, Bool, Date
 
 # ============= local library imports  ==========================
 
+REPOSITORY_CHANGE_HANDLERS = []
+
+
+def add_repository_change_handler(func):
+    """
+    call ``func(path)`` whenever a ``GitRepoManager`` changes the working tree or index of the repository at path
+    """
+    if func not in REPOSITORY_CHANGE_HANDLERS:
+        REPOSITORY_CHANGE_HANDLERS.append(func)
+
+
+def remove_repository_change_handler(func):
+    if func in REPOSITORY_CHANGE_HANDLERS:
+        REPOSITORY_CHANGE_HANDLERS.remove(func)
+
+
+def notify_repository_changed(path):
+    for func in list(REPOSITORY_CHANGE_HANDLERS):
+        func(path)
+
 
 class GitShaObject(HasTraits):
     message = Str
@@ -56,6 +56,7 @@ class BaseCoreDevice(HasCommunicator, ConsumerMixin):
     _auto_started = False
     _no_response_counter = 0
     _scheduler_name = None
+    _scheduler_frame_spacing = None
 
     def send_email_notification(self, message):
         if self.application:
@@ -107,6 +108,8 @@ class BaseCoreDevice(HasCommunicator, ConsumerMixin):
                     return False
 
                 self.set_attribute(config, '_scheduler_name', 'Communications', 'scheduler', optional=True)
+                self.set_attribute(config, '_scheduler_frame_spacing', 'Communications', 'frame_spacing',
+                                   cast='float', optional=True)
 
             self._load_hook(config)
 
@@ -164,12 +167,15 @@ class BaseCoreDevice(HasCommunicator, ConsumerMixin):
     @crc_caller
     def ask(self, cmd, **kw):
         """
+        priority and coalesce are passed to the scheduler. only pass coalesce=True for reads
         """
         comm = self.communicator
         if comm is not None:
+            priority = kw.pop('priority', None)
+            coalesce = kw.pop('coalesce', None)
             if comm.scheduler:
                 r = comm.scheduler.schedule(comm.ask, args=(cmd,),
-                                            kwargs=kw)
+                                            kwargs=kw, priority=priority, coalesce=coalesce)
             else:
                 r = comm.ask(cmd, **kw)
             self._communicate_hook(cmd, r)
@@ -238,6 +244,10 @@ class BaseCoreDevice(HasCommunicator, ConsumerMixin):
                 if sc is None:
                     sc = CommunicationScheduler(name=name)
                     self.application.register_service(type(sc), sc)
+
+                # devices sharing a bus use the largest spacing any of them requires
+                if self._scheduler_frame_spacing:
+                    sc.frame_spacing = max(sc.frame_spacing, self._scheduler_frame_spacing)
                 self.set_scheduler(sc)
 
     def set_scheduler(self, s):
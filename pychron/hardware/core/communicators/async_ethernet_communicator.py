@@ -0,0 +1,334 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import errno
+import os
+import socket
+import time
+from collections import deque
+
+# ============= local library imports  ==========================
+from pychron.globals import globalv
+from pychron.hardware.core.communicators.communicator import process_response
+from pychron.hardware.core.communicators.ethernet_communicator import EthernetCommunicator
+from pychron.hardware.core.communicators.io_loop import Future, get_io_loop, gather
+
+CONNECTING = (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY)
+
+
+class _Request(object):
+    def __init__(self, data, timeout, response):
+        self.data = data
+        self.timeout = timeout
+        self.response = response
+        self.future = Future()
+        self.timer = None
+        self.start = None
+
+
+class Channel(object):
+    """
+    non-blocking connection to one device driven by an ``IOLoop``.
+
+    requests are sent one at a time in the order they were submitted. a TCP response is complete when
+    ``terminator`` is received, or with the first data received if terminator is None. a UDP response is one datagram.
+
+    the connection is made when needed and closed after an error or a timeout so stale data is never
+    read as the response to the next request. all methods except ``submit`` run in the loop thread
+    """
+
+    datasize = 2 ** 12
+
+    def __init__(self, loop, address, kind='TCP', terminator=None):
+        self._loop = loop
+        self._address = address
+        self._udp = kind.lower() == 'udp'
+        self._terminator = terminator
+        self._queue = deque()
+        self._current = None
+        self._sock = None
+        self._fd = None
+        self._connected = False
+        self._out = ''
+        self._buffer = ''
+
+    def submit(self, data, timeout, response=True):
+        """
+        thread safe. return a Future for the response, or for None if ``response`` is False
+        """
+        req = _Request(data, timeout, response)
+        self._loop.call_soon(self._submit, req)
+        return req.future
+
+    def close(self):
+        self._loop.call_soon(self._close)
+
+    # private
+    def _submit(self, req):
+        self._queue.append(req)
+        if self._current is None:
+            self._next()
+
+    def _next(self):
+        if not self._queue:
+            return
+
+        self._current = req = self._queue.popleft()
+        req.start = time.time()
+        req.timer = self._loop.call_later(req.timeout, self._on_timeout, req)
+        if self._sock is None:
+            self._connect()
+        elif self._connected:
+            self._write(req.data)
+
+    def _connect(self):
+        try:
+            family = socket.SOCK_DGRAM if self._udp else socket.SOCK_STREAM
+            self._sock = sock = socket.socket(socket.AF_INET, family)
+            self._fd = sock.fileno()
+            sock.setblocking(0)
+            if not self._udp:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            err = sock.connect_ex(self._address)
+        except socket.error, e:
+            self._fail(e)
+            return
+
+        if err not in CONNECTING:
+            self._fail(socket.error(err, os.strerror(err)))
+        elif err:
+            self._loop.add_writer(sock, self._on_connected)
+        else:
+            self._on_connected()
+
+    def _on_connected(self):
+        sock = self._sock
+        self._loop.remove_writer(sock)
+        err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if err:
+            self._fail(socket.error(err, os.strerror(err)))
+            return
+
+        self._connected = True
+        self._loop.add_reader(sock, self._on_readable)
+        if self._current:
+            self._write(self._current.data)
+
+    def _write(self, data):
+        self._out = data
+        self._on_writable()
+
+    def _on_writable(self):
+        try:
+            n = self._sock.send(self._out)
+        except socket.error, e:
+            if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                n = 0
+            else:
+                self._fail(e)
+                return
+
+        self._out = self._out[n:]
+        if self._out:
+            self._loop.add_writer(self._sock, self._on_writable)
+        else:
+            self._loop.remove_writer(self._sock)
+            if not self._current.response:
+                self._complete(None)
+
+    def _on_readable(self):
+        try:
+            data = self._sock.recv(self.datasize)
+        except socket.error, e:
+            if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return
+            self._fail(e)
+            return
+
+        if not data and not self._udp:
+            self._fail(socket.error(errno.ECONNRESET, 'connection closed by {}:{}'.format(*self._address)))
+            return
+
+        req = self._current
+        if req is None or not req.response:
+            # unsolicited data
+            return
+
+        if self._udp or not self._terminator:
+            self._complete(data.strip())
+        else:
+            buf = self._buffer + data
+            if self._terminator in buf:
+                r, self._buffer = buf.split(self._terminator, 1)
+                self._complete(r.strip())
+            else:
+                self._buffer = buf
+
+    def _on_timeout(self, req):
+        if req is self._current:
+            self._fail(socket.timeout('timed out after {}s'.format(req.timeout)))
+
+    def _complete(self, r):
+        req = self._current
+        self._current = None
+        req.timer.cancel()
+        req.future.set_result(r)
+        self._next()
+
+    def _fail(self, e):
+        req = self._current
+        self._current = None
+        self._close_socket()
+        if req:
+            req.timer.cancel()
+            req.future.set_exception(e)
+        self._next()
+
+    def _close(self):
+        self._close_socket()
+        while self._queue:
+            self._queue.popleft().future.set_exception(socket.error(errno.ECONNABORTED, 'channel closed'))
+
+    def _close_socket(self):
+        sock = self._sock
+        if sock is not None:
+            self._loop.discard(self._fd)
+            try:
+                sock.close()
+            except socket.error:
+                pass
+
+        self._sock = None
+        self._fd = None
+        self._connected = False
+        self._out = ''
+        self._buffer = ''
+
+
+class AsyncEthernetCommunicator(EthernetCommunicator):
+    """
+    EthernetCommunicator that does its I/O on the shared ``IOLoop``.
+
+    ``ask_async``/``tell_async`` return Futures so many devices can be asked at once from one thread, e.g.
+    with ``ask_all``. ``ask``, ``tell`` and ``read`` are blocking wrappers for existing callers.
+
+    set "type = async_ethernet" in the Communications section of a device's configuration to use it.
+    set "terminator" (e.g. CR, LF, CRLF) if responses may arrive in several packets
+    """
+
+    _channel = None
+
+    def ask_async(self, cmd, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        if globalv.communication_simulation:
+            timeout = 0.01
+
+        return self._get_channel().submit('{}{}'.format(cmd, self.write_terminator), timeout)
+
+    def tell_async(self, cmd, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        return self._get_channel().submit(cmd, timeout, response=False)
+
+    def ask(self, cmd, retries=3, verbose=True, quiet=False, info=None, timeout=None, delay=None, *args, **kw):
+        if self.simulation:
+            if verbose:
+                self.info('no handle    {}'.format(cmd.strip()))
+            return
+
+        if delay:
+            time.sleep(delay)
+
+        st = time.time()
+        r, err = None, None
+        for _ in xrange(retries):
+            try:
+                r = self.ask_async(cmd, timeout).result()
+                break
+            except socket.error, e:
+                err = e
+
+        if r is not None:
+            re = process_response(r)
+            self._latency.add(time.time() - st)
+        else:
+            re = 'ERROR: {} {}'.format(err, self.address)
+
+        if verbose or self.verbose and not quiet:
+            self.log_response(cmd, re, info)
+        return r
+
+    def tell(self, cmd, verbose=True, quiet=False, info=None):
+        try:
+            self.tell_async(cmd).result()
+            if verbose or self.verbose and not quiet:
+                self.log_tell(cmd, info)
+        except socket.error, e:
+            self.warning('tell. error: {}'.format(e))
+
+    def read(self, *args, **kw):
+        """
+        wait for the next response without sending a command
+        """
+        try:
+            return self._get_channel().submit('', self.default_timeout).result()
+        except socket.error:
+            pass
+
+    def ask_many(self, cmds, verbose=True, quiet=False, info=None, timeout=None):
+        futures = [self.ask_async(c, timeout) for c in cmds]
+        rs = gather(futures)
+        if verbose or self.verbose and not quiet:
+            for c, r in zip(cmds, rs):
+                self.log_response(c, 'ERROR: no response' if r is None else process_response(r), info)
+        return rs
+
+    def test_connection(self):
+        self.simulation = False
+        cmd = self.test_cmd
+        if cmd:
+            self.debug('sending test command {}'.format(cmd))
+            if self.ask(cmd) is None:
+                self.simulation = True
+        return not self.simulation
+
+    def reset(self):
+        if self._channel:
+            self._channel.close()
+        self._channel = None
+
+    # private
+    def _get_channel(self):
+        with self._lock:
+            if self._channel is None:
+                self._channel = Channel(get_io_loop(), (self.host, self.port), self.kind or 'UDP',
+                                        self.read_terminator)
+            return self._channel
+
+
+def ask_all(requests, timeout=None):
+    """
+    ask several devices at once.
+
+    requests: list of (AsyncEthernetCommunicator, cmd). return the responses in order, None for failures
+    """
+    futures = [c.ask_async(cmd, timeout) for c, cmd in requests]
+    return gather(futures)
+
+# ============= EOF =============================================
@@ -0,0 +1,104 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import time
+from threading import Condition
+
+# ============= local library imports  ==========================
+
+
+class ConnectionPool(object):
+    """
+    pool of at most ``size`` keep-alive connections made by ``factory``.
+
+    a connection is used by one caller at a time. ``release`` returns it to the pool or closes it
+    if ``discard`` is True, e.g. after a socket error. connections are closed with their ``end`` method
+    """
+
+    def __init__(self, factory, size):
+        self._factory = factory
+        self.size = max(1, size)
+        self._idle = []
+        self._n = 0
+        self._cond = Condition()
+
+    @property
+    def nconnections(self):
+        return self._n
+
+    def acquire(self, timeout=None):
+        """
+        return an idle connection or make a new one. return None if the pool is full and no connection
+        is released within ``timeout`` seconds. errors raised by ``factory`` are propagated
+        """
+        cond = self._cond
+        with cond:
+            st = time.time()
+            while not self._idle and self._n >= self.size:
+                if timeout is None:
+                    cond.wait()
+                else:
+                    remaining = timeout - (time.time() - st)
+                    if remaining <= 0:
+                        return
+                    cond.wait(remaining)
+
+            if self._idle:
+                return self._idle.pop()
+
+            self._n += 1
+
+        try:
+            return self._factory()
+        except BaseException:
+            with cond:
+                self._n -= 1
+                cond.notify()
+            raise
+
+    def release(self, connection, discard=False):
+        with self._cond:
+            if discard:
+                self._n -= 1
+            else:
+                self._idle.append(connection)
+            self._cond.notify()
+
+        if discard:
+            self._end(connection)
+
+    def clear(self):
+        """
+        close the idle connections. connections in use are closed when they are released with discard=True
+        """
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+            self._n -= len(idle)
+            self._cond.notify_all()
+
+        for c in idle:
+            self._end(c)
+
+    def _end(self, connection):
+        try:
+            connection.end()
+        except BaseException:
+            pass
+
+# ============= EOF =============================================
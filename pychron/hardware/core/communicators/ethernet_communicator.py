@@ -22,8 +22,13 @@ import time
 # ============= local library imports  ==========================
 from pychron.globals import globalv
 from pychron.hardware.core.communicators.communicator import Communicator, process_response
+from pychron.hardware.core.communicators.connection_pool import ConnectionPool
+from pychron.hardware.core.communicators.latency import LatencyHistogram
 from pychron.hardware.core.checksum_helper import computeCRC
 
+TERMINATORS = {'CR': chr(13), 'LF': chr(10), 'CRLF': chr(13) + chr(10), 'ETX': chr(3)}
+MIN_RECONNECT_DELAY = 0.025
+
 
 class MessageFrame(object):
     def __init__(self, message_len=False, nmessage_len=4, checksum=False, nchecksum=4):
@@ -122,6 +127,8 @@ class Handler(object):
 
 
 class TCPHandler(Handler):
+    _buffer = ''
+
     def open_socket(self, addr, timeout=1.0):
         self.address = addr
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -137,6 +144,23 @@ class TCPHandler(Handler):
         except socket.timeout:
             return
 
+    def get_response(self, terminator):
+        """
+        read one response ending with ``terminator``. data received after the terminator is kept for the
+        next response so several responses can be outstanding.
+
+        raises socket.error, including socket.timeout, if the connection is closed or times out
+        """
+        buf = self._buffer
+        while terminator not in buf:
+            s = self.sock.recv(self.datasize)
+            if not s:
+                raise socket.error('connection closed by {}'.format(self.address))
+            buf += s
+
+        r, self._buffer = buf.split(terminator, 1)
+        return r.strip()
+
     def send_packet(self, p):
         self.sock.send(p)
 
@@ -180,6 +204,22 @@ class EthernetCommunicator(Communicator):
 
     default_timeout = 3
 
+    # keep-alive connection pool. 0 uses a single connection guarded by the communicator's lock
+    pool_size = 0
+    # number of outstanding commands sent by ask_many. requires read_terminator
+    pipeline_depth = 1
+    read_terminator = None
+    max_reconnect_delay = 1.0
+
+    _pool = None
+    _latency = None
+    _reconnect_delay = 0
+    _down_until = 0
+
+    def __init__(self, *args, **kw):
+        super(EthernetCommunicator, self).__init__(*args, **kw)
+        self._latency = LatencyHistogram()
+
     @property
     def address(self):
         return '{}://{}:{}'.format(self.kind, self.host, self.port)
@@ -201,6 +241,17 @@ class EthernetCommunicator(Communicator):
         self.default_timeout = self.config_get(config, 'Communications', 'default_timeout', cast='int',
                                                optional=True, default=3)
 
+        self.set_attribute(config, 'pool_size', 'Communications', 'pool_size', cast='int', optional=True,
+                           default=0)
+        self.set_attribute(config, 'pipeline_depth', 'Communications', 'pipeline_depth', cast='int',
+                           optional=True, default=1)
+        self.set_attribute(config, 'max_reconnect_delay', 'Communications', 'max_reconnect_delay',
+                           cast='float', optional=True, default=1.0)
+        self.set_attribute(config, 'read_terminator', 'Communications', 'terminator', optional=True,
+                           default=None)
+        if self.read_terminator in TERMINATORS:
+            self.read_terminator = TERMINATORS[self.read_terminator]
+
         if self.kind is None:
             self.kind = 'UDP'
 
@@ -217,8 +268,13 @@ class EthernetCommunicator(Communicator):
     def test_connection(self):
         self.simulation = False
 
-        with self._lock:
-            handler = self.get_handler()
+        if self.use_pool:
+            handler = self._acquire(self.timeout)
+            if handler:
+                self._pool.release(handler)
+        else:
+            with self._lock:
+                handler = self.get_handler()
 
         # send a test command so see if wer have connection
         cmd = self.test_cmd
@@ -241,6 +297,13 @@ class EthernetCommunicator(Communicator):
         ret = not self.simulation and handler is not None
         return ret
 
+    @property
+    def use_pool(self):
+        return self.pool_size > 0 and self.kind is not None and self.kind.lower() == 'tcp'
+
+    def latency_report(self):
+        return '{} {}'.format(self.address, self._latency.summary())
+
     def get_handler(self, timeout=None):
         if timeout is None:
             timeout = self.timeout
@@ -285,7 +348,11 @@ class EthernetCommunicator(Communicator):
 
         cmd = '{}{}'.format(cmd, self.write_terminator)
 
+        if self.use_pool:
+            return self._pooled_ask(cmd, retries, verbose, quiet, info, timeout, message_frame, delay)
+
         r = None
+        st = time.time()
         with self._lock:
             if self.error_mode:
                 retries = 2
@@ -302,6 +369,7 @@ class EthernetCommunicator(Communicator):
 
             if r is not None:
                 re = process_response(r)
+                self._latency.add(time.time() - st)
             # else:
             #     self.error_mode = True
 
@@ -316,17 +384,107 @@ class EthernetCommunicator(Communicator):
 
         return r
 
+    def ask_many(self, cmds, verbose=True, quiet=False, info=None, timeout=None):
+        """
+        send several commands and return their responses in order.
+
+        with a connection pool, a read_terminator and pipeline_depth > 1 up to pipeline_depth commands
+        are sent before their responses are read. responses are matched to commands by order.
+        otherwise the commands are sent one at a time with ``ask``.
+
+        the response to a command that failed is None
+        """
+        if not (self.use_pool and self.read_terminator and self.pipeline_depth > 1):
+            return [self.ask(c, verbose=verbose, quiet=quiet, info=info, timeout=timeout) for c in cmds]
+
+        n = len(cmds)
+        rs = [None] * n
+        if self.simulation or not n:
+            return rs
+
+        if timeout is None:
+            timeout = self.default_timeout
+
+        handler = self._acquire(timeout)
+        if handler is None:
+            return rs
+
+        depth = self.pipeline_depth
+        wt = self.write_terminator
+        sts = [0] * n
+        ok = False
+        sent = 0
+        i = 0
+        try:
+            while i < n:
+                while sent < n and sent - i < depth:
+                    sts[sent] = time.time()
+                    handler.send_packet('{}{}'.format(cmds[sent], wt))
+                    sent += 1
+
+                rs[i] = handler.get_response(self.read_terminator)
+                self._latency.add(time.time() - sts[i])
+                i += 1
+            ok = True
+        except socket.error, e:
+            self.warning('ask_many. error: {} address: {}. {}/{} responses'.format(e, self.address, i, n))
+        finally:
+            self._pool.release(handler, discard=not ok)
+
+        if verbose or self.verbose and not quiet:
+            for c, r in zip(cmds, rs):
+                re = 'ERROR: no response' if r is None else process_response(r)
+                self.log_response(c, re, info)
+
+        return rs
+
     def reset(self):
         if self.handler:
             self.handler.end()
         self._reset_connection()
+        if self._pool:
+            self._pool.clear()
+
+    def close(self):
+        if self._latency.n:
+            self.debug('latency {}'.format(self.latency_report()))
+        self.reset()
 
     def read(self, *args, **kw):
+        if self.use_pool:
+            handler = self._acquire(self.default_timeout)
+            if handler:
+                r = None
+                try:
+                    r = handler.get_packet('')
+                except socket.error, e:
+                    self.warning('read. error: {} address: {}'.format(e, self.address))
+                finally:
+                    self._pool.release(handler, discard=r is None)
+                return r
+            return
+
         with self._lock:
             handler = self.get_handler()
             return handler.get_packet('')
 
     def tell(self, cmd, verbose=True, quiet=False, info=None):
+        if self.use_pool:
+            handler = self._acquire(self.default_timeout)
+            if handler:
+                ok = False
+                try:
+                    handler.send_packet(cmd)
+                    ok = True
+                except socket.error, e:
+                    self.warning('tell. send packet. error: {}'.format(e))
+                finally:
+                    self._pool.release(handler, discard=not ok)
+
+                if ok and (verbose or self.verbose and not quiet):
+                    self.log_tell(cmd, info)
+            return
+
         with self._lock:
             handler = self.get_handler()
             try:
@@ -338,6 +496,80 @@ class EthernetCommunicator(Communicator):
                 self.error_mode = True
 
     # private
+    def _pooled_ask(self, cmd, retries, verbose, quiet, info, timeout, message_frame, delay):
+        """
+        ask using a pooled keep-alive connection. a connection that fails is closed and the command is
+        retried immediately on a new connection. if a new connection cannot be made asks fail without
+        trying to connect until the reconnect delay expires. the delay doubles, up to max_reconnect_delay,
+        while the device is unreachable
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+
+        st = time.time()
+        r = None
+        for _ in xrange(retries):
+            handler = self._acquire(timeout)
+            if handler is None:
+                break
+
+            try:
+                handler.send_packet(cmd)
+                if delay:
+                    time.sleep(delay)
+
+                if self.read_terminator:
+                    r = handler.get_response(self.read_terminator)
+                else:
+                    r = handler.get_packet(cmd, message_frame=message_frame)
+            except socket.error, e:
+                self.warning('ask. error: {} address: {}'.format(e, self.address))
+            finally:
+                self._pool.release(handler, discard=r is None)
+
+            if r is not None:
+                break
+
+        if r is not None:
+            re = process_response(r)
+            self._latency.add(time.time() - st)
+        else:
+            re = 'ERROR: Connection refused: {}, timeout={}'.format(self.address, timeout)
+
+        if verbose or self.verbose and not quiet:
+            self.log_response(cmd, re, info)
+
+        return r
+
+    def _acquire(self, timeout):
+        if time.time() < self._down_until:
+            return
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = ConnectionPool(self._new_connection, self.pool_size)
+        try:
+            handler = self._pool.acquire(timeout)
+        except socket.error, e:
+            delay = min(max(2 * self._reconnect_delay, MIN_RECONNECT_DELAY), self.max_reconnect_delay)
+            self.debug('connect failed {}. {}. retry in {:0.3f}s'.format(self.address, e, delay))
+            self._reconnect_delay = delay
+            self._down_until = time.time() + delay
+            return
+
+        if handler is not None:
+            self._reconnect_delay = 0
+            handler.sock.settimeout(0.01 if globalv.communication_simulation else timeout)
+        return handler
+
+    def _new_connection(self):
+        h = TCPHandler()
+        h.open_socket((self.host, self.port), timeout=self.timeout)
+        # do not delay small commands on a kept-alive connection
+        h.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        h.set_frame(self.message_frame)
+        return h
+
     def _reset_connection(self):
         self.handler = None
         self.error_mode = False
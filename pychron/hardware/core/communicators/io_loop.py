@@ -0,0 +1,293 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import errno
+import heapq
+import os
+import select
+import socket
+import sys
+import time
+from collections import deque
+from itertools import count
+from thread import get_ident
+from threading import Thread, Lock, Event
+
+# ============= local library imports  ==========================
+
+
+class Future(object):
+    """
+    result of an operation completed by the ``IOLoop``
+    """
+
+    def __init__(self):
+        self._evt = Event()
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+        self._lock = Lock()
+
+    def done(self):
+        return self._evt.is_set()
+
+    def set_result(self, r):
+        self._set(r, None)
+
+    def set_exception(self, e):
+        self._set(None, e)
+
+    def exception(self, timeout=None):
+        if not self._evt.wait(timeout):
+            raise socket.timeout('timed out')
+        return self._exception
+
+    def result(self, timeout=None):
+        """
+        wait for the result. raise the operation's exception or socket.timeout if not done within ``timeout``
+        """
+        if not self._evt.wait(timeout):
+            raise socket.timeout('timed out')
+
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def add_done_callback(self, func):
+        with self._lock:
+            if not self._evt.is_set():
+                self._callbacks.append(func)
+                return
+        func(self)
+
+    def _set(self, r, e):
+        with self._lock:
+            if self._evt.is_set():
+                return
+            self._result, self._exception = r, e
+            self._evt.set()
+            cbs, self._callbacks = self._callbacks, []
+
+        for cb in cbs:
+            cb(self)
+
+
+def gather(futures, timeout=None):
+    """
+    wait for all ``futures`` and return their results. the result of a failed future is None
+    """
+    st = time.time()
+    rs = []
+    for f in futures:
+        t = None if timeout is None else max(0, timeout - (time.time() - st))
+        try:
+            rs.append(f.result(t))
+        except (socket.error, EnvironmentError):
+            rs.append(None)
+    return rs
+
+
+class _Timer(object):
+    cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class IOLoop(object):
+    """
+    select based event loop running in a single daemon thread.
+
+    sockets registered with ``add_reader``/``add_writer`` must be non-blocking. all socket callbacks run in the
+    loop thread. use ``call_soon`` to run a function in the loop thread from any other thread
+    """
+
+    def __init__(self):
+        self._readers = {}
+        self._writers = {}
+        self._timers = []
+        self._seq = count()
+        self._callbacks = deque()
+        self._lock = Lock()
+        self._thread = None
+        self._stopped = False
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(0)
+        self._wake_w.setblocking(0)
+        self._readers[self._wake_r.fileno()] = (self._wake_r, self._drain_wake)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None and not self._stopped:
+                self._thread = t = Thread(target=self._run, name='IOLoop')
+                t.setDaemon(True)
+                t.start()
+
+    def stop(self, timeout=None):
+        """
+        stop the loop thread after it runs the pending callbacks. a stopped loop can not be restarted
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            t = self._thread
+
+        if t is None:
+            self._close_wake()
+            return
+
+        self._wake()
+        if not self.in_loop_thread():
+            t.join(timeout)
+
+    def in_loop_thread(self):
+        return self._thread is not None and self._thread.ident == get_ident()
+
+    def call_soon(self, func, *args):
+        self._callbacks.append((func, args))
+        self._wake()
+
+    def call_later(self, delay, func, *args):
+        """
+        must be called in the loop thread. returns a timer that can be cancelled
+        """
+        timer = _Timer()
+        heapq.heappush(self._timers, (time.time() + delay, next(self._seq), timer, func, args))
+        return timer
+
+    def add_reader(self, sock, func):
+        self._readers[sock.fileno()] = (sock, func)
+
+    def remove_reader(self, sock):
+        self._readers.pop(sock.fileno(), None)
+
+    def add_writer(self, sock, func):
+        self._writers[sock.fileno()] = (sock, func)
+
+    def remove_writer(self, sock):
+        self._writers.pop(sock.fileno(), None)
+
+    def discard(self, fd):
+        """
+        remove the handlers for file descriptor ``fd``. use before closing a registered socket
+        """
+        self._readers.pop(fd, None)
+        self._writers.pop(fd, None)
+
+    # private
+    def _wake(self):
+        try:
+            self._wake_w.send('x')
+        except socket.error:
+            # the wake socket is full so the loop is already awake
+            pass
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except socket.error:
+            pass
+
+    def _close_wake(self):
+        for s in (self._wake_r, self._wake_w):
+            try:
+                s.close()
+            except socket.error:
+                pass
+
+    def _run(self):
+        while not self._stopped:
+            timeout = None
+            timers = self._timers
+            while timers and timers[0][2].cancelled:
+                heapq.heappop(timers)
+            if timers:
+                timeout = max(0, timers[0][0] - time.time())
+            if self._callbacks:
+                timeout = 0
+
+            try:
+                rs, ws, _ = select.select(self._readers.keys(), self._writers.keys(), [], timeout)
+            except (select.error, socket.error), e:
+                if e.args[0] == errno.EINTR:
+                    continue
+                # a socket was closed without being removed. drop the bad descriptors
+                self._remove_bad()
+                continue
+
+            for fd in rs:
+                self._dispatch(self._readers, fd)
+            for fd in ws:
+                self._dispatch(self._writers, fd)
+
+            now = time.time()
+            while timers and timers[0][0] <= now:
+                _, _, timer, func, args = heapq.heappop(timers)
+                if not timer.cancelled:
+                    self._call(func, args)
+
+            for _ in xrange(len(self._callbacks)):
+                func, args = self._callbacks.popleft()
+                self._call(func, args)
+
+        # run the callbacks queued before stop
+        while self._callbacks:
+            func, args = self._callbacks.popleft()
+            self._call(func, args)
+        self._close_wake()
+
+    def _dispatch(self, handlers, fd):
+        h = handlers.get(fd)
+        if h:
+            self._call(h[1], ())
+
+    def _call(self, func, args):
+        try:
+            func(*args)
+        except BaseException:
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+
+    def _remove_bad(self):
+        for handlers in (self._readers, self._writers):
+            for fd in handlers.keys():
+                try:
+                    os.fstat(fd)
+                except OSError:
+                    handlers.pop(fd)
+
+
+_LOOP = None
+_LOOP_LOCK = Lock()
+
+
+def get_io_loop():
+    """
+    return the shared, running ``IOLoop``
+    """
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = IOLoop()
+            _LOOP.start()
+    return _LOOP
+
+# ============= EOF =============================================
@@ -0,0 +1,81 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from bisect import bisect_left
+from threading import Lock
+
+# ============= local library imports  ==========================
+# upper edges of the bins in seconds. the last bin is open ended
+BINS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5)
+
+
+class LatencyHistogram(object):
+    """
+    histogram of request latencies in fixed log spaced bins
+    """
+
+    def __init__(self, bins=BINS):
+        self.bins = bins
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.counts = [0] * (len(self.bins) + 1)
+            self.n = 0
+            self.total = 0
+            self.max = 0
+
+    def add(self, dt):
+        with self._lock:
+            self.counts[bisect_left(self.bins, dt)] += 1
+            self.n += 1
+            self.total += dt
+            self.max = max(self.max, dt)
+
+    @property
+    def mean(self):
+        if self.n:
+            return self.total / float(self.n)
+        return 0
+
+    def percentile(self, q):
+        """
+        return the upper edge of the bin containing the q-th percentile, q in [0, 100]
+        """
+        with self._lock:
+            n = self.n
+            if not n:
+                return 0
+
+            target = q / 100. * n
+            c = 0
+            for i, ci in enumerate(self.counts):
+                c += ci
+                if c >= target:
+                    break
+            return self.bins[i] if i < len(self.bins) else self.max
+
+    def summary(self):
+        return 'n={} mean={:0.1f}ms p50<={:0.0f}ms p95<={:0.0f}ms max={:0.1f}ms'.format(self.n,
+                                                                                     self.mean * 1000,
+                                                                                     self.percentile(50) * 1000,
+                                                                                     self.percentile(95) * 1000,
+                                                                                     self.max * 1000)
+
+# ============= EOF =============================================
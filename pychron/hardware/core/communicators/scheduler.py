@@ -18,9 +18,54 @@
 from traits.api import Float, HasTraits
 
 # ============= standard library imports ========================
-from threading import Lock
+import heapq
+import sys
+import time
+from contextlib import contextmanager
+from itertools import count
+from thread import get_ident
+from threading import Condition, current_thread, local
 
 # ============= local library imports  ==========================
+from pychron.hardware.core.communicators.latency import LatencyHistogram
+
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+PRIORITIES = (INTERACTIVE, NORMAL, BACKGROUND)
+
+_local = local()
+
+
+@contextmanager
+def polling():
+    """
+    mark the requests made by the calling thread as polling reads. a polling read identical to one still
+    waiting in the queue is coalesced with it
+    """
+    prev = is_polling()
+    _local.polling = True
+    try:
+        yield
+    finally:
+        _local.polling = prev
+
+
+def is_polling():
+    return getattr(_local, 'polling', False)
+
+
+class _Request(object):
+    def __init__(self, key, priority, seq):
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.done = False
+        self.result = None
+        self.exc_info = None
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
 
 
 # SINGLE_ITEM_BUF = True
@@ -31,7 +76,15 @@ class CommunicationScheduler(HasTraits):
 
         this class should be used when working with multiple rs485 devices on the same port.
 
-        it uses a simple lock and sleep cycle to avoid collision on the data lines
+        requests wait in a priority queue and are executed one at a time by the calling threads.
+        interactive requests go ahead of background polling. by default requests made from the main (UI)
+        thread are interactive and requests from other threads are background.
+
+        a coalesced request identical to one still waiting in the queue is not sent again; the caller waits
+        for and receives the result of the queued request. only reads should be coalesced. requests are
+        coalesced if ``coalesce`` is True or if they are made inside a ``polling()`` block.
+
+        at least ``frame_spacing`` ms are left between the end of one request and the start of the next
 
         when setting up the devices use device.set_scheduler to set the shared scheduler
 
@@ -39,10 +92,22 @@ class CommunicationScheduler(HasTraits):
 
     #    collision_delay = Float(125)
     collision_delay = Float(50)
+    frame_spacing = Float(0)
 
     def __init__(self, *args, **kw):
         super(CommunicationScheduler, self).__init__(*args, **kw)
-        self._lock = Lock()
+        self._cond = Condition()
+        self._queue = []
+        self._pending = {}
+        self._seq = count()
+        self._owner = None
+        self._last_end = 0
+
+        self.nrequests = 0
+        self.ncoalesced = 0
+        self.max_depth = 0
+        self._total_depth = 0
+        self._waits = dict((p, LatencyHistogram()) for p in PRIORITIES)
 
     #        self._condition = Condition()
     #        self._command_queue = Queue()
@@ -54,12 +119,40 @@ class CommunicationScheduler(HasTraits):
     #                            self.collision_delay)
     #        consumer.start()
 
-    def schedule(self, func, args=None, kwargs=None):
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def schedule(self, func, args=None, kwargs=None, priority=None, coalesce=None):
+        """
+        execute ``func(*args, **kwargs)`` when the bus is free and return its result.
+
+        priority: INTERACTIVE, NORMAL or BACKGROUND. None to pick by calling thread
+        coalesce: share the result of an identical queued request. None to coalesce only polling reads
+        """
         if args is None:
             args = tuple()
         if kwargs is None:
             kwargs = dict()
 
+        ident = get_ident()
+        if self._owner == ident:
+            # called from a scheduled function. the bus is already held
+            return func(*args, **kwargs)
+
+        if priority is None:
+            priority = INTERACTIVE if current_thread().name == 'MainThread' else BACKGROUND
+        if coalesce is None:
+            coalesce = is_polling()
+
+        key = None
+        if coalesce:
+            key = (func, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
         #        while SINGLE_ITEM_BUF and not self._buffer.empty():
         #            time.sleep(0.0001)
         #
@@ -70,10 +163,73 @@ class CommunicationScheduler(HasTraits):
         #        except Empty:
         #            r = None
 
-        with self._lock:
-            r = func(*args, **kwargs)
+        st = time.time()
+        cond = self._cond
+        with cond:
+            req = self._pending.get(key) if key else None
+            if req is not None:
+                self.ncoalesced += 1
+                while not req.done:
+                    cond.wait()
+                return self._get_result(req)
+
+            req = _Request(key, priority, next(self._seq))
+            heapq.heappush(self._queue, req)
+            if key:
+                self._pending[key] = req
+
+            depth = len(self._queue)
+            self.nrequests += 1
+            self._total_depth += depth
+            self.max_depth = max(self.max_depth, depth)
+
+            while self._owner is not None or self._queue[0] is not req:
+                cond.wait()
+
+            heapq.heappop(self._queue)
+            if key:
+                self._pending.pop(key, None)
+            self._owner = ident
+            delay = self._last_end + self.frame_spacing * 0.001 - time.time()
+
+        try:
+            if delay > 0:
+                time.sleep(delay)
+
+            self._waits[priority].add(time.time() - st)
+            try:
+                req.result = func(*args, **kwargs)
+            except BaseException:
+                req.exc_info = sys.exc_info()
+        finally:
+            with cond:
+                req.done = True
+                self._owner = None
+                self._last_end = time.time()
+                cond.notify_all()
+
+        return self._get_result(req)
+
+    def statistics(self):
+        n = self.nrequests
+        return {'nrequests': n,
+                'ncoalesced': self.ncoalesced,
+                'depth': self.depth,
+                'max_depth': self.max_depth,
+                'mean_depth': self._total_depth / float(n) if n else 0,
+                'wait': dict((p, {'n': h.n, 'mean': h.mean, 'p95': h.percentile(95), 'max': h.max})
+                             for p, h in self._waits.iteritems())}
+
+    def report(self):
+        s = self.statistics()
+        return 'requests={} coalesced={} depth mean={:0.1f} max={} wait interactive {} background {}'.format(
+            s['nrequests'], s['ncoalesced'], s['mean_depth'], s['max_depth'],
+            self._waits[INTERACTIVE].summary(), self._waits[BACKGROUND].summary())
 
-        return r
+    def _get_result(self, req):
+        if req.exc_info:
+            raise req.exc_info[0], req.exc_info[1], req.exc_info[2]
+        return req.result
 
 # class Consumer(Thread):
 #
@@ -0,0 +1,121 @@
+import socket
+import time
+from SocketServer import BaseRequestHandler, ThreadingMixIn, TCPServer, UDPServer
+from threading import Thread
+from unittest import TestCase
+
+from pychron.hardware.core.communicators.async_ethernet_communicator import AsyncEthernetCommunicator, ask_all
+
+DELAY = 0.05
+
+
+class SlowEchoHandler(BaseRequestHandler):
+    def handle(self):
+        buf = ''
+        while 1:
+            d = self.request.recv(1024)
+            if not d:
+                return
+
+            buf += d
+            while '\r' in buf:
+                cmd, buf = buf.split('\r', 1)
+                if cmd == 'close':
+                    self.request.close()
+                    return
+                elif cmd == 'ignore':
+                    continue
+
+                time.sleep(DELAY)
+                # send the response in two packets
+                self.request.sendall('echo:')
+                self.request.sendall('{}\r'.format(cmd))
+
+
+class UDPEchoHandler(BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        sock.sendto('echo:{}'.format(data.strip()), self.client_address)
+
+
+class EchoServer(ThreadingMixIn, TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 64
+
+
+def serve(server):
+    t = Thread(target=server.serve_forever)
+    t.setDaemon(True)
+    t.start()
+    return server
+
+
+class AsyncEthernetCommunicatorTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = serve(EchoServer(('127.0.0.1', 0), SlowEchoHandler))
+        cls.udp_server = serve(UDPServer(('127.0.0.1', 0), UDPEchoHandler))
+
+    @classmethod
+    def tearDownClass(cls):
+        for s in (cls.server, cls.udp_server):
+            s.shutdown()
+            s.server_close()
+
+    def setUp(self):
+        self.comms = []
+
+    def tearDown(self):
+        for c in self.comms:
+            c.close()
+
+    def _comm(self, server=None, kind='TCP', **kw):
+        if server is None:
+            server = self.server
+        c = AsyncEthernetCommunicator(name='test', host='127.0.0.1', port=server.server_address[1], kind=kind,
+                                      read_terminator='\r', simulation=False, **kw)
+        self.comms.append(c)
+        return c
+
+    def test_ask(self):
+        self.assertEqual(self._comm().ask('a', verbose=False), 'echo:a')
+
+    def test_ask_all(self):
+        cs = [self._comm() for _ in range(10)]
+        st = time.time()
+        rs = ask_all([(c, 'c{}'.format(i)) for i, c in enumerate(cs)])
+        et = time.time() - st
+
+        self.assertEqual(rs, ['echo:c{}'.format(i) for i in range(10)])
+        # the devices are asked concurrently
+        self.assertLess(et, 5 * DELAY)
+
+    def test_ask_many(self):
+        rs = self._comm().ask_many(['a', 'b', 'c'], verbose=False)
+        self.assertEqual(rs, ['echo:a', 'echo:b', 'echo:c'])
+
+    def test_timeout(self):
+        c = self._comm()
+        st = time.time()
+        self.assertIsNone(c.ask('ignore', verbose=False, retries=1, timeout=0.1))
+        self.assertLess(time.time() - st, 0.5)
+        self.assertEqual(c.ask('a', verbose=False), 'echo:a')
+
+    def test_reconnect(self):
+        c = self._comm()
+        self.assertIsNone(c.ask('close', verbose=False, retries=1))
+        self.assertEqual(c.ask('a', verbose=False), 'echo:a')
+
+    def test_refused(self):
+        s = socket.socket()
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+        s.close()
+
+        c = AsyncEthernetCommunicator(name='test', host='127.0.0.1', port=port, kind='TCP', simulation=False)
+        self.comms.append(c)
+        self.assertIsNone(c.ask('a', verbose=False))
+
+    def test_udp(self):
+        self.assertEqual(self._comm(self.udp_server, kind='UDP').ask('a', verbose=False), 'echo:a')
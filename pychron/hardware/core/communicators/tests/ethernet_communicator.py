@@ -0,0 +1,172 @@
+import socket
+import time
+from SocketServer import BaseRequestHandler, ThreadingMixIn, TCPServer
+from threading import Thread
+from unittest import TestCase
+
+from pychron.hardware.core.communicators.connection_pool import ConnectionPool
+from pychron.hardware.core.communicators.ethernet_communicator import EthernetCommunicator
+from pychron.hardware.core.communicators.latency import LatencyHistogram
+
+
+class EchoHandler(BaseRequestHandler):
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        buf = ''
+        while 1:
+            d = self.request.recv(1024)
+            if not d:
+                return
+
+            buf += d
+            while '\r' in buf:
+                cmd, buf = buf.split('\r', 1)
+                if cmd == 'close':
+                    self.request.close()
+                    return
+                self.request.sendall('echo:{}\r'.format(cmd))
+
+
+class EchoServer(ThreadingMixIn, TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Connection(object):
+    ended = False
+
+    def end(self):
+        self.ended = True
+
+
+class ConnectionPoolTestCase(TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(Connection, 2)
+
+    def test_reuse(self):
+        c = self.pool.acquire()
+        self.pool.release(c)
+        self.assertIs(self.pool.acquire(), c)
+
+    def test_size(self):
+        a = self.pool.acquire()
+        self.pool.acquire()
+        self.assertIsNone(self.pool.acquire(timeout=0.05))
+
+        self.pool.release(a)
+        self.assertIs(self.pool.acquire(timeout=0.05), a)
+
+    def test_discard(self):
+        a = self.pool.acquire()
+        self.pool.acquire()
+        self.pool.release(a, discard=True)
+        self.assertTrue(a.ended)
+        self.assertEqual(self.pool.nconnections, 1)
+        self.assertIsNot(self.pool.acquire(timeout=0.05), a)
+
+    def test_factory_error(self):
+        def factory():
+            raise socket.error('refused')
+
+        pool = ConnectionPool(factory, 1)
+        self.assertRaises(socket.error, pool.acquire)
+        self.assertEqual(pool.nconnections, 0)
+
+
+class LatencyHistogramTestCase(TestCase):
+    def test_percentile(self):
+        h = LatencyHistogram()
+        for dt in (0.0005,) * 90 + (0.03,) * 10:
+            h.add(dt)
+
+        self.assertEqual(h.n, 100)
+        self.assertEqual(h.percentile(50), 0.001)
+        self.assertEqual(h.percentile(95), 0.05)
+        self.assertAlmostEqual(h.max, 0.03)
+
+    def test_overflow(self):
+        h = LatencyHistogram()
+        h.add(10)
+        self.assertEqual(h.percentile(50), 10)
+
+
+class EthernetCommunicatorTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = EchoServer(('127.0.0.1', 0), EchoHandler)
+        t = Thread(target=cls.server.serve_forever)
+        t.setDaemon(True)
+        t.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.comm = EthernetCommunicator(name='test', host='127.0.0.1', port=self.server.server_address[1],
+                                         kind='TCP', pool_size=2, pipeline_depth=4, read_terminator='\r',
+                                         simulation=False)
+
+    def tearDown(self):
+        self.comm.close()
+
+    def test_ask(self):
+        self.assertEqual(self.comm.ask('a', verbose=False), 'echo:a')
+        self.assertEqual(self.comm._latency.n, 1)
+
+    def test_keep_alive(self):
+        for i in range(5):
+            self.comm.ask('a', verbose=False)
+        self.assertEqual(self.comm._pool.nconnections, 1)
+
+    def test_ask_many(self):
+        cmds = ['c{}'.format(i) for i in range(10)]
+        rs = self.comm.ask_many(cmds, verbose=False)
+        self.assertEqual(rs, ['echo:{}'.format(c) for c in cmds])
+
+    def test_threads(self):
+        rs = []
+        ts = [Thread(target=lambda i=i: rs.append(self.comm.ask('t{}'.format(i), verbose=False)))
+              for i in range(10)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+
+        self.assertEqual(sorted(rs), sorted('echo:t{}'.format(i) for i in range(10)))
+        self.assertLessEqual(self.comm._pool.nconnections, 2)
+
+    def test_reconnect(self):
+        self.assertIsNone(self.comm.ask('close', verbose=False, retries=1))
+        self.assertEqual(self.comm.ask('a', verbose=False), 'echo:a')
+
+    def test_release_on_error(self):
+        self.assertEqual(self.comm.ask('a', verbose=False), 'echo:a')
+        handler = self.comm._pool.acquire()
+        self.comm._pool.release(handler)
+
+        def get_response(*args, **kw):
+            raise ValueError('bad response')
+
+        handler.get_response = get_response
+        self.assertRaises(ValueError, self.comm.ask, 'a', verbose=False)
+
+        # the failed connection was returned to the pool and discarded
+        self.assertEqual(self.comm._pool.nconnections, 0)
+        self.assertEqual(self.comm.ask('a', verbose=False), 'echo:a')
+
+    def test_unreachable(self):
+        s = socket.socket()
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+        s.close()
+
+        comm = EthernetCommunicator(name='test', host='127.0.0.1', port=port, kind='TCP', pool_size=1,
+                                    simulation=False)
+        self.assertIsNone(comm.ask('a', verbose=False))
+
+        # fail fast until the reconnect delay expires
+        st = time.time()
+        self.assertIsNone(comm.ask('a', verbose=False))
+        self.assertLess(time.time() - st, 0.01)
@@ -0,0 +1,218 @@
+import time
+from threading import Thread, Event, Lock
+from unittest import TestCase
+
+from pychron.hardware.core.communicators.scheduler import CommunicationScheduler, INTERACTIVE, BACKGROUND, \
+    polling
+
+
+class Bus(object):
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.calls = []
+        self.frames = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = Lock()
+
+    def ask(self, cmd):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        st = time.time()
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(cmd)
+            self.frames.append((st, time.time()))
+            self.active -= 1
+        return 'r:{}'.format(cmd)
+
+
+class CommunicationSchedulerTestCase(TestCase):
+    def setUp(self):
+        self.scheduler = CommunicationScheduler()
+
+    def _submit(self, func, cmd, priority, results):
+        def run():
+            results[cmd] = self.scheduler.schedule(func, args=(cmd,), priority=priority)
+
+        t = Thread(target=run)
+        t.start()
+        return t
+
+    def _block(self, bus):
+        """
+        hold the bus with a request that ends when the returned event is set
+        """
+        evt = Event()
+
+        def hold(cmd):
+            evt.wait(5)
+            return bus.ask(cmd)
+
+        t = self._submit(hold, 'hold', BACKGROUND, {})
+        time.sleep(0.05)
+        return evt, t
+
+    def _wait_depth(self, n):
+        st = time.time()
+        while self.scheduler.depth < n and time.time() - st < 5:
+            time.sleep(0.005)
+
+    def test_result(self):
+        bus = Bus()
+        self.assertEqual(self.scheduler.schedule(bus.ask, args=('a',)), 'r:a')
+
+    def test_exception(self):
+        def fail():
+            raise ValueError('bad')
+
+        self.assertRaises(ValueError, self.scheduler.schedule, fail)
+
+        # the bus is released after a failure
+        bus = Bus()
+        self.assertEqual(self.scheduler.schedule(bus.ask, args=('a',)), 'r:a')
+
+    def test_serialized(self):
+        bus = Bus(delay=0.01)
+        ts = [self._submit(bus.ask, 'c{}'.format(i), BACKGROUND, {}) for i in range(10)]
+        for t in ts:
+            t.join()
+
+        self.assertEqual(bus.max_active, 1)
+        self.assertEqual(len(bus.calls), 10)
+
+    def test_priority(self):
+        bus = Bus()
+        evt, hold = self._block(bus)
+
+        results = {}
+        ts = [self._submit(bus.ask, 'poll{}'.format(i), BACKGROUND, results) for i in range(3)]
+        self._wait_depth(3)
+        ts.append(self._submit(bus.ask, 'interactive', INTERACTIVE, results))
+        self._wait_depth(4)
+
+        evt.set()
+        for t in ts + [hold]:
+            t.join()
+
+        self.assertEqual(bus.calls[:2], ['hold', 'interactive'])
+        self.assertEqual(bus.calls[2:], ['poll0', 'poll1', 'poll2'])
+
+    def test_coalesce(self):
+        bus = Bus()
+        evt, hold = self._block(bus)
+
+        results = []
+
+        def run():
+            results.append(self.scheduler.schedule(bus.ask, args=('temp',), priority=BACKGROUND, coalesce=True))
+
+        ts = [Thread(target=run) for _ in range(5)]
+        for t in ts:
+            t.start()
+
+        st = time.time()
+        while self.scheduler.ncoalesced < 4 and time.time() - st < 5:
+            time.sleep(0.005)
+
+        evt.set()
+        for t in ts + [hold]:
+            t.join()
+
+        self.assertEqual(bus.calls, ['hold', 'temp'])
+        self.assertEqual(results, ['r:temp'] * 5)
+        self.assertEqual(self.scheduler.ncoalesced, 4)
+
+    def test_polling_coalesced(self):
+        bus = Bus()
+        evt, hold = self._block(bus)
+
+        def run():
+            with polling():
+                self.scheduler.schedule(bus.ask, args=('temp',))
+
+        ts = [Thread(target=run) for _ in range(3)]
+        for t in ts:
+            t.start()
+
+        st = time.time()
+        while self.scheduler.ncoalesced < 2 and time.time() - st < 5:
+            time.sleep(0.005)
+
+        evt.set()
+        for t in ts + [hold]:
+            t.join()
+
+        self.assertEqual(bus.calls, ['hold', 'temp'])
+
+    def test_background_not_coalesced(self):
+        bus = Bus()
+        evt, hold = self._block(bus)
+
+        ts = [self._submit(bus.ask, 'move', BACKGROUND, {}) for _ in range(3)]
+        self._wait_depth(3)
+        evt.set()
+        for t in ts + [hold]:
+            t.join()
+
+        self.assertEqual(bus.calls, ['hold', 'move', 'move', 'move'])
+        self.assertEqual(self.scheduler.ncoalesced, 0)
+
+    def test_interactive_not_coalesced(self):
+        bus = Bus()
+        evt, hold = self._block(bus)
+
+        ts = [self._submit(bus.ask, 'temp', INTERACTIVE, {}) for _ in range(3)]
+        self._wait_depth(3)
+        evt.set()
+        for t in ts + [hold]:
+            t.join()
+
+        self.assertEqual(bus.calls, ['hold', 'temp', 'temp', 'temp'])
+
+    def test_frame_spacing(self):
+        self.scheduler.frame_spacing = 30
+        bus = Bus()
+        ts = [self._submit(bus.ask, 'c{}'.format(i), BACKGROUND, {}) for i in range(4)]
+        for t in ts:
+            t.join()
+
+        frames = sorted(bus.frames)
+        for (_, end), (start, _) in zip(frames, frames[1:]):
+            self.assertGreaterEqual(start - end, 0.025)
+
+    def test_nested(self):
+        bus = Bus()
+
+        def outer():
+            return self.scheduler.schedule(bus.ask, args=('inner',))
+
+        self.assertEqual(self.scheduler.schedule(outer), 'r:inner')
+
+    def test_default_priority(self):
+        bus = Bus()
+        self.scheduler.schedule(bus.ask, args=('a',))
+
+        t = self._submit(bus.ask, 'b', None, {})
+        t.join()
+
+        s = self.scheduler.statistics()
+        self.assertEqual(s['wait'][INTERACTIVE]['n'], 1)
+        self.assertEqual(s['wait'][BACKGROUND]['n'], 1)
+
+    def test_statistics(self):
+        bus = Bus()
+        evt, hold = self._block(bus)
+        ts = [self._submit(bus.ask, 'c{}'.format(i), BACKGROUND, {}) for i in range(3)]
+        self._wait_depth(3)
+        evt.set()
+        for t in ts + [hold]:
+            t.join()
+
+        s = self.scheduler.statistics()
+        self.assertEqual(s['nrequests'], 4)
+        self.assertEqual(s['max_depth'], 3)
+        self.assertEqual(s['depth'], 0)
+        self.assertGreater(s['wait'][BACKGROUND]['max'], 0)
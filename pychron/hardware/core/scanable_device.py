@@ -30,6 +30,7 @@ from pychron.database.data_warehouse import DataWarehouse
 from pychron.managers.data_managers.csv_data_manager import CSVDataManager
 from pychron.core.helpers.datetime_tools import generate_datetimestamp
 from pychron.hardware.core.alarm import Alarm
+from pychron.hardware.core.communicators.scheduler import polling
 
 
 class ScanableDevice(ViewableDevice):
@@ -103,7 +104,8 @@ class ScanableDevice(ViewableDevice):
     def _scan_(self, *args):
         if self.scan_func:
             try:
-                v = getattr(self, self.scan_func)(verbose=False)
+                with polling():
+                    v = getattr(self, self.scan_func)(verbose=False)
             except AttributeError, e:
                 print 'exception', e
                 return
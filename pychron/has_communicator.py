@@ -39,7 +39,8 @@ class HasCommunicator(object):
 
     def _communicator_factory(self, communicator_type):
         if communicator_type is not None:
-            class_key = '{}Communicator'.format(communicator_type.capitalize())
+            # e.g. ethernet -> EthernetCommunicator, async_ethernet -> AsyncEthernetCommunicator
+            class_key = '{}Communicator'.format(''.join(t.capitalize() for t in communicator_type.split('_')))
             module_path = 'pychron.hardware.core.communicators.{}_communicator'.format(communicator_type.lower())
             classlist = [class_key]
 
@@ -0,0 +1,119 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import time
+from threading import Lock
+
+# ============= local library imports  ==========================
+MAX_ROWS = 100
+FLUSH_PERIOD = 5
+
+
+class BufferedTableWriter(object):
+    """
+    buffer rows for a set of tables and append them in blocks.
+
+    table handles are resolved once with ``get_table(key)`` and cached. rows for a table are
+    appended with a single ``table.append(rows)`` and all tables are flushed once ``max_rows`` rows
+    are pending for any table or ``flush_period`` seconds have passed since the last flush.
+
+    ``flush`` must be called before the file is closed. handles are dropped on flush(close=True)
+    """
+
+    def __init__(self, get_table, max_rows=MAX_ROWS, flush_period=FLUSH_PERIOD):
+        self._get_table = get_table
+        self.max_rows = max_rows
+        self.flush_period = flush_period
+
+        self._tables = {}
+        self._pending = {}
+        self._lock = Lock()
+        self._last_flush = time.time()
+
+        self.nrows = 0
+        self.nflushes = 0
+        self.total_latency = 0
+        self.max_latency = 0
+
+    def add_row(self, key, row):
+        """
+        add a row (tuple in table column order) to the table ``key``.
+
+        return False if the table does not exist
+        """
+        with self._lock:
+            rows = self._pending.get(key)
+            if rows is None:
+                if self._get_cached_table(key) is None:
+                    return False
+                rows = self._pending[key] = []
+
+            rows.append(row)
+            if len(rows) >= self.max_rows or time.time() - self._last_flush >= self.flush_period:
+                self._flush()
+        return True
+
+    def flush(self, close=False):
+        with self._lock:
+            self._flush()
+            if close:
+                self._tables = {}
+
+    def has_pending(self):
+        with self._lock:
+            return any(self._pending.itervalues())
+
+    @property
+    def mean_latency(self):
+        if self.nflushes:
+            return self.total_latency / float(self.nflushes)
+        return 0
+
+    def report(self):
+        return 'rows={} flushes={} mean latency={:0.2f}ms max latency={:0.2f}ms'.format(self.nrows, self.nflushes,
+                                                                                      self.mean_latency * 1000,
+                                                                                      self.max_latency * 1000)
+
+    def _get_cached_table(self, key):
+        try:
+            return self._tables[key]
+        except KeyError:
+            t = self._get_table(key)
+            if t is not None:
+                self._tables[key] = t
+            return t
+
+    def _flush(self):
+        pending = [(k, rows) for k, rows in self._pending.iteritems() if rows]
+        self._last_flush = st = time.time()
+        if not pending:
+            return
+
+        self._pending = {}
+        for key, rows in pending:
+            t = self._tables[key]
+            t.append(rows)
+            t.flush()
+            self.nrows += len(rows)
+
+        et = time.time() - st
+        self.nflushes += 1
+        self.total_latency += et
+        self.max_latency = max(self.max_latency, et)
+
+# ============= EOF =============================================
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from pychron.managers.data_managers.buffered_table_writer import BufferedTableWriter
+
+
+class Table(object):
+    def __init__(self):
+        self.rows = []
+        self.nappends = 0
+        self.nflushes = 0
+
+    def append(self, rows):
+        self.rows.extend(rows)
+        self.nappends += 1
+
+    def flush(self):
+        self.nflushes += 1
+
+
+class BufferedTableWriterTestCase(TestCase):
+    def setUp(self):
+        self.tables = {'a': Table(), 'b': Table()}
+        self.lookups = []
+
+        def get_table(key):
+            self.lookups.append(key)
+            return self.tables.get(key)
+
+        self.writer = BufferedTableWriter(get_table, max_rows=10, flush_period=1e6)
+
+    def test_block_append(self):
+        for i in range(25):
+            self.writer.add_row('a', (i, i))
+
+        t = self.tables['a']
+        self.assertEqual(t.nappends, 2)
+        self.assertEqual(len(t.rows), 20)
+
+        self.writer.flush()
+        self.assertEqual([r[0] for r in t.rows], range(25))
+        self.assertEqual(self.writer.nrows, 25)
+
+    def test_cached_table(self):
+        for i in range(25):
+            self.writer.add_row('a', (i, i))
+            self.writer.add_row('b', (i, i))
+        self.assertEqual(self.lookups, ['a', 'b'])
+
+    def test_flush_all(self):
+        self.writer.add_row('b', (0, 0))
+        for i in range(10):
+            self.writer.add_row('a', (i, i))
+
+        self.assertEqual(len(self.tables['b'].rows), 1)
+        self.assertFalse(self.writer.has_pending())
+
+    def test_flush_period(self):
+        self.writer.flush_period = 0
+        self.writer.add_row('a', (0, 0))
+        self.assertEqual(len(self.tables['a'].rows), 1)
+
+    def test_close(self):
+        self.writer.add_row('a', (0, 0))
+        self.writer.flush(close=True)
+        self.writer.add_row('a', (1, 1))
+        self.writer.flush()
+        self.assertEqual(self.lookups, ['a', 'a'])
+        self.assertEqual(len(self.tables['a'].rows), 2)
+
+    def test_no_table(self):
+        self.assertFalse(self.writer.add_row('c', (0, 0)))
+        self.assertFalse(self.writer.has_pending())
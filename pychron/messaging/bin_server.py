@@ -0,0 +1,203 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import errno
+import socket
+from multiprocessing.pool import ThreadPool
+
+# ============= local library imports  ==========================
+from messaging_server import MessagingServer
+from pychron.hardware.core.communicators.io_loop import IOLoop
+from pychron.messaging.framing import FrameDecoder, FrameError, encode_frame
+
+NWORKERS = 4
+
+
+class _Connection(object):
+    """
+    a client connection. all methods except ``send`` run in the loop thread
+    """
+
+    def __init__(self, server, sock, address):
+        self.server = server
+        self.sock = sock
+        self.address = address
+        self.fd = sock.fileno()
+        self._decoder = FrameDecoder()
+        self._out = ''
+
+    def send(self, frame):
+        """
+        thread safe
+        """
+        self.server.loop.call_soon(self._send, frame)
+
+    def on_readable(self):
+        try:
+            data = self.sock.recv(self.server.datasize)
+        except socket.error, e:
+            if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                return
+            data = None
+
+        if not data:
+            self.close()
+            return
+
+        try:
+            frames = self._decoder.feed(data)
+        except FrameError, e:
+            self.server.warning('{} {}'.format(self.address, e))
+            self.close()
+            return
+
+        for rid, payload in frames:
+            self.server.dispatch(self, rid, payload)
+
+    def close(self):
+        if self.sock is not None:
+            self.server.loop.discard(self.fd)
+            self.server.remove_connection(self)
+            try:
+                self.sock.close()
+            except socket.error:
+                pass
+            self.sock = None
+
+    def _send(self, frame):
+        if self.sock is None:
+            return
+
+        self._out += frame
+        self._on_writable()
+
+    def _on_writable(self):
+        try:
+            n = self.sock.send(self._out)
+        except socket.error, e:
+            if e.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                self.close()
+                return
+            n = 0
+
+        self._out = self._out[n:]
+        if self._out:
+            self.server.loop.add_writer(self.sock, self._on_writable)
+        else:
+            self.server.loop.remove_writer(self.sock)
+
+
+class BinaryServer(MessagingServer):
+    """
+    serve length-prefixed binary requests (see messaging.framing).
+
+    connections are read and written by an ``IOLoop`` and requests are handled by a pool of worker threads, so
+    a client may send many requests on one connection without waiting for each response. responses are sent
+    as they complete and carry the id of their request.
+
+    use "class = BinaryServer" in the General section of a server's configuration. "workers" in the Requests
+    section sets the number of worker threads
+    """
+
+    def __init__(self, parent, processor_type, datasize, addr, nworkers=None):
+        self.parent = parent
+        self.repeater = getattr(parent, 'repeater', None)
+        self.datasize = datasize
+        self.processor_type = processor_type
+
+        self.loop = IOLoop()
+        self._connections = set()
+        if nworkers is None:
+            nworkers = getattr(parent, 'nworkers', None) or NWORKERS
+        self._pool = ThreadPool(nworkers)
+
+        self.connected = True
+        self.socket = sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(addr)
+            sock.listen(16)
+            self.server_address = sock.getsockname()
+        except socket.error, e:
+            self.warning(e)
+            self.connected = False
+            self.server_address = addr
+
+    def handle_request(self):
+        """
+        accept a connection. called by RemoteCommandServer when the listening socket is readable
+        """
+        try:
+            client, addr = self.socket.accept()
+        except socket.error:
+            return
+
+        client.setblocking(0)
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.loop.start()
+        self.loop.call_soon(self._add_connection, _Connection(self, client, addr))
+
+    def add_link(self, name, connection_str):
+        self.warning('Links not supported by BinaryServer. {} not added'.format(name))
+
+    def close_links(self):
+        pass
+
+    def server_close(self):
+        self.loop.call_soon(self._close_connections)
+        self.loop.stop(timeout=5)
+        self.socket.close()
+        self._pool.close()
+
+    def dispatch(self, connection, rid, payload):
+        self.increment_packets_received()
+        self._pool.apply_async(self._handle, (connection, rid, payload))
+
+    def remove_connection(self, connection):
+        self._connections.discard(connection)
+
+    # private
+    def _add_connection(self, connection):
+        self._connections.add(connection)
+        self.loop.add_reader(connection.sock, connection.on_readable)
+
+    def _close_connections(self):
+        for c in list(self._connections):
+            c.close()
+
+    def _handle(self, connection, rid, payload):
+        try:
+            response = self.get_response(self.processor_type, payload, connection.address[0])
+        except BaseException, e:
+            self.warning('request {} failed: {}'.format(payload, e))
+            response = None
+
+        if response is None:
+            response = ''
+        else:
+            response = str(response)
+            if 'ERROR 6' in response:
+                self.increment_repeater_fails()
+
+        self.parent.cur_rpacket = payload
+        self.parent.cur_spacket = response if len(response) <= 20 else '{}...'.format(response[:20])
+
+        connection.send(encode_frame(rid, response))
+        self.increment_packets_sent()
+
+# ============= EOF =============================================
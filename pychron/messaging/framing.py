@@ -0,0 +1,75 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import struct
+
+# ============= local library imports  ==========================
+# binary framing used by BinaryServer and BinaryClient.
+#
+# each frame is an 8 byte header, payload length and request id as big endian unsigned ints, followed by
+# the payload. a response has the id of its request so several requests can be outstanding on one
+# connection and answered in any order
+HEADER = struct.Struct('!II')
+MAX_FRAME_SIZE = 2 ** 24
+MAX_REQUEST_ID = 2 ** 32 - 1
+
+
+class FrameError(Exception):
+    pass
+
+
+def encode_frame(rid, payload):
+    payload = str(payload)
+    return HEADER.pack(len(payload), rid) + payload
+
+
+class FrameDecoder(object):
+    """
+    split a byte stream into (request id, payload) frames
+    """
+
+    def __init__(self, max_size=MAX_FRAME_SIZE):
+        self._max_size = max_size
+        self._buffer = ''
+
+    def feed(self, data):
+        """
+        add received data and return the completed frames. raise FrameError if a frame is too large
+        """
+        buf = self._buffer + data
+        hsize = HEADER.size
+
+        frames = []
+        i = 0
+        n = len(buf)
+        while n - i >= hsize:
+            size, rid = HEADER.unpack_from(buf, i)
+            if size > self._max_size:
+                raise FrameError('frame of {} bytes exceeds {}'.format(size, self._max_size))
+
+            e = i + hsize + size
+            if e > n:
+                break
+
+            frames.append((rid, buf[i + hsize:e]))
+            i = e
+
+        self._buffer = buf[i:]
+        return frames
+
+# ============= EOF =============================================
@@ -94,6 +94,7 @@ class RemoteCommandServer(ConfigLoadable):
     led = Instance(LED, ())
 
     use_ipc = True
+    nworkers = None
 
     def _repeater_default(self):
         """
@@ -165,6 +166,7 @@ class RemoteCommandServer(ConfigLoadable):
 
             self.datasize = ds
             self.processor_type = ptype
+            self.nworkers = self.config_get(config, 'Requests', 'workers', cast='int', optional=True)
 
             self._server = self.server_factory(server_class, addr, ptype, ds)
 
@@ -238,7 +240,7 @@ class RemoteCommandServer(ConfigLoadable):
         self._connected = False
         if self._server is not None:
             #            self._server.shutdown()
-            self._server.socket.close()
+            self._server.server_close()
 
             self._running = False
 
@@ -0,0 +1,148 @@
+import threading
+import time
+from unittest import TestCase
+
+from pychron.globals import globalv
+from pychron.messaging.bin_server import BinaryServer
+from pychron.messaging.framing import FrameDecoder, FrameError, encode_frame
+from pychron.rpc.binary_client import BinaryClient
+
+
+class Processor(object):
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_response(self, rtype, data, sender):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if data.startswith('sleep'):
+                time.sleep(float(data.split(' ')[1]))
+            elif data == 'fail':
+                raise ValueError('fail')
+            elif data == 'none':
+                return
+            return '{}:{}'.format(rtype, data)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class Parent(object):
+    packets_received = 0
+    packets_sent = 0
+    repeater_fails = 0
+    cur_rpacket = ''
+    cur_spacket = ''
+    nworkers = 4
+
+    def __init__(self):
+        self.processor = Processor()
+
+    def info(self, *args, **kw):
+        pass
+
+    def warning(self, *args, **kw):
+        pass
+
+
+class FramingTestCase(TestCase):
+    def test_round_trip(self):
+        d = FrameDecoder()
+        data = encode_frame(1, 'abc') + encode_frame(2, '') + encode_frame(3, 'x' * 1000)
+        self.assertEqual(d.feed(data), [(1, 'abc'), (2, ''), (3, 'x' * 1000)])
+
+    def test_partial(self):
+        d = FrameDecoder()
+        data = encode_frame(7, 'hello')
+        frames = []
+        for c in data:
+            frames.extend(d.feed(c))
+        self.assertEqual(frames, [(7, 'hello')])
+
+    def test_too_large(self):
+        d = FrameDecoder(max_size=10)
+        self.assertRaises(FrameError, d.feed, encode_frame(1, 'x' * 11))
+
+
+class BinaryServerTestCase(TestCase):
+    def setUp(self):
+        self._use_ipc = globalv.use_ipc
+        globalv.use_ipc = False
+
+        self.parent = Parent()
+        self.server = BinaryServer(self.parent, 'Hardware', 1024, ('127.0.0.1', 0))
+        self._running = True
+
+        def serve():
+            import select
+
+            while self._running:
+                r, _, _ = select.select([self.server.socket], [], [], 0.05)
+                if r:
+                    self.server.handle_request()
+
+        self._thread = t = threading.Thread(target=serve)
+        t.setDaemon(True)
+        t.start()
+
+        host, port = self.server.server_address
+        self.client = BinaryClient(host, port, timeout=5)
+
+    def tearDown(self):
+        self._running = False
+        self._thread.join()
+        self.client.close()
+        self.server.server_close()
+        globalv.use_ipc = self._use_ipc
+
+    def test_ask(self):
+        self.assertEqual(self.client.ask('GetValue'), 'Hardware:GetValue')
+        self.assertEqual(self.parent.packets_received, 1)
+        self.assertEqual(self.parent.packets_sent, 1)
+
+    def test_empty_responses(self):
+        self.assertEqual(self.client.ask('none'), '')
+        self.assertEqual(self.client.ask('fail'), '')
+        self.assertEqual(self.client.ask('ok'), 'Hardware:ok')
+
+    def test_multiplexed(self):
+        cmds = ['sleep 0.3', 'a', 'sleep 0.3', 'b', 'sleep 0.3']
+        st = time.time()
+        rs = self.client.ask_many(cmds)
+        et = time.time() - st
+
+        self.assertEqual(rs, ['Hardware:{}'.format(c) for c in cmds])
+        # the slow requests ran concurrently
+        self.assertLess(et, 0.8)
+        self.assertGreater(self.parent.processor.max_active, 1)
+
+    def test_out_of_order(self):
+        slow = self.client.ask_async('sleep 0.3')
+        fast = self.client.ask_async('fast')
+        self.assertEqual(fast.result(5), 'Hardware:fast')
+        self.assertFalse(slow.done())
+        self.assertEqual(slow.result(5), 'Hardware:sleep 0.3')
+
+    def test_timeout(self):
+        self.assertIsNone(self.client.ask('sleep 0.3', timeout=0.05))
+        # the late response is dropped and the connection is still usable
+        time.sleep(0.4)
+        self.assertEqual(self.client.ask('a'), 'Hardware:a')
+
+    def test_reconnect(self):
+        self.assertEqual(self.client.ask('a'), 'Hardware:a')
+        self.client.close()
+        self.assertEqual(self.client.ask('b'), 'Hardware:b')
+
+    def test_close(self):
+        self.assertEqual(self.client.ask('a'), 'Hardware:a')
+        loop = self.server.loop
+        self.server.server_close()
+
+        # the loop thread exits after closing the client connections
+        self.assertFalse(loop._thread.is_alive())
+        self.assertFalse(self.server._connections)
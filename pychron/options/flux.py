@@ -38,6 +38,7 @@ class FluxOptions(FigureOptions):
     predicted_j_error_type = Enum(*ERROR_TYPES)
     use_weighted_fit = Bool(False)
     monte_carlo_ntrials = Int(10)
+    monte_carlo_seed = Int(0)
     use_monte_carlo = Bool(False)
     monitor_sample_name = Str
     plot_kind = Enum('1D', '2D')
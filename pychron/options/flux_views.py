@@ -45,6 +45,8 @@ class FluxSubOptions(SubOptions):
                      Item('predicted_j_error_type', label='Predicted J Error'),
                      Item('use_weighted_fit', ),
                      Item('monte_carlo_ntrials', ),
+                     Item('monte_carlo_seed', tooltip='Seed for the Monte Carlo random number generator. '
+                                                      '0 for a new random seed every fit'),
                      Item('use_monte_carlo', ),
                      label='Fits',
                      show_border=True)
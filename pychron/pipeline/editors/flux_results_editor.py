@@ -278,8 +278,10 @@ class FluxResultsEditor(BaseTraitsEditor, SelectionFigure):
 
             pts = array([[p.x, p.y] for p in self.positions])
             nominals = reg.predict(pts)
+            po = self.plotter_options
             errors = monte_carlo_error_estimation(reg, nominals, pts,
-                                                  ntrials=self.plotter_options.monte_carlo_ntrials)
+                                                  ntrials=po.monte_carlo_ntrials,
+                                                  seed=po.monte_carlo_seed or None)
             for p, j, je in zip(self.positions, nominals, errors):
                 oj = p.saved_j
 
@@ -29,6 +29,7 @@ from pychron.core.ui.strings import SpacelessStr
 from pychron.paths import paths
 from pychron.pipeline.nodes.base import BaseNode
 from pychron.pipeline.tables.xlsx_table_writer import XLSXTableWriter
+from pychron.processing.isotope import batch_fit_isotopes
 
 
 class PersistNode(BaseNode):
@@ -104,7 +105,10 @@ class IsotopeEvolutionPersistNode(DVCPersistNode):
         if not state.saveable_keys:
             return
 
-        wrapper = lambda x, prog, i, n: self._save_fit(x, prog, i, n, state.saveable_keys)
+        keys = state.saveable_keys
+        results = self._batch_fit(state.unknowns, keys)
+
+        wrapper = lambda x, prog, i, n: self._save_fit(x, prog, i, n, keys, results.get(id(x)))
         progress_iterator(state.unknowns, wrapper, threshold=1)
         # for ai in state.unknowns:
         #     self.dvc.save_fits(ai, state.saveable_keys)
@@ -116,11 +120,36 @@ class IsotopeEvolutionPersistNode(DVCPersistNode):
 
         self._persist(state, msg)
 
-    def _save_fit(self, x, prog, i, n, keys):
+    def _batch_fit(self, ans, keys):
+        """
+            fit all the intercepts and baselines of ``ans`` at once.
+
+            returns a dict of id(analysis): dict of key: BatchResult
+        """
+        pairs, isos = [], []
+        for ai in ans:
+            sisos = ai.isotopes
+            for k in keys:
+                if k in sisos:
+                    iso = sisos[k]
+                else:
+                    iso = next((i.baseline for i in sisos.itervalues() if i.detector == k), None)
+
+                if iso is not None:
+                    pairs.append((id(ai), k))
+                    isos.append(iso)
+
+        results = {}
+        for (aid, k), r in zip(pairs, batch_fit_isotopes(isos)):
+            if r is not None:
+                results.setdefault(aid, {})[k] = r
+        return results
+
+    def _save_fit(self, x, prog, i, n, keys, results):
         if prog:
             prog.change_message('Save Fits {} {}/{}'.format(x.record_id, i, n))
 
-        self.dvc.save_fits(x, keys)
+        self.dvc.save_fits(x, keys, results)
 
 
 class BlanksPersistNode(DVCPersistNode):
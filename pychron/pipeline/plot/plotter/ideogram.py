@@ -38,6 +38,8 @@ from pychron.pipeline.plot.point_move_tool import OverlayMoveTool
 from pychron.pychron_constants import PLUSMINUS, SIGMA
 
 N = 5000
+# probability curves are only evaluated within NSIGMA errors of each age
+NSIGMA = 6
 
 
 class PeakLabel(DataLabel):
@@ -409,7 +411,7 @@ class Ideogram(BaseArArFigure):
                                     location=self.options.inset_location)
             plot.overlays.append(o)
 
-            cfunc = lambda x1, x2: cumulative_probability(self.xs, self.xes, x1, x2, n=N)
+            cfunc = lambda x1, x2: cumulative_probability(self.xs, self.xes, x1, x2, n=N, nsigma=NSIGMA)
             xs, ys, xmi, xma = self._calculate_asymptotic_limits(cfunc,
                                                                  # asymptotic_width=10,
                                                                  tol=self.options.asymptotic_height_percent)
@@ -691,7 +693,7 @@ class Ideogram(BaseArArFigure):
 
         else:
             if opt.use_asymptotic_limits and calculate_limits:
-                cfunc = lambda x1, x2: cumulative_probability(ages, errors, x1, x2, n=N)
+                cfunc = lambda x1, x2: cumulative_probability(ages, errors, x1, x2, n=N, nsigma=NSIGMA)
 
                 bins, probs, x1, x2 = self._calculate_asymptotic_limits(cfunc,
                                                                         tol=(opt.asymptotic_height_percent or 10))
@@ -699,7 +701,7 @@ class Ideogram(BaseArArFigure):
 
                 return bins, probs
             else:
-                return cumulative_probability(ages, errors, xmi, xma, n=N)
+                return cumulative_probability(ages, errors, xmi, xma, n=N, nsigma=NSIGMA)
 
     def _calculate_nominal_xlimits(self):
         return self.min_x(self.options.index_attr), self.max_x(self.options.index_attr)
@@ -19,15 +19,17 @@
 #     String, Either, Dict, cached_property, Event, List, Bool, Int, Array
 # ============= standard library imports ========================
 import re
-import struct
 from binascii import hexlify
-from itertools import izip
 
-from numpy import array, Inf, polyfit
+from numpy import array, asarray, Inf, polyfit
 from uncertainties import ufloat, nominal_value, std_dev
 
+from pychron.core.helpers.binpack import pack_xy, unpack_xy
 from pychron.core.helpers.fits import natural_name_fit, fit_to_degree
+from pychron.core.helpers.xy_buffer import XYBuffer
+from pychron.core.regression.batch_regressor import BatchItem, batch_fit
 from pychron.core.regression.mean_regressor import MeanRegressor
+from pychron.core.regression.online_regressor import OnlineRegressor
 
 
 def fit_abbreviation(fit, ):
@@ -37,6 +39,26 @@ def fit_abbreviation(fit, ):
     return f
 
 
+def batch_fit_isotopes(isotopes):
+    """
+    fit the intercepts of many IsotopicMeasurements at once.
+
+    returns a list of BatchResult. None for the isotopes that are not fit by
+    their regressor (stored or user defined values) or that need to be fit individually
+    """
+    idxs, items = [], []
+    for i, iso in enumerate(isotopes):
+        item = iso.get_batch_item()
+        if item is not None:
+            idxs.append(i)
+            items.append(item)
+
+    results = [None] * len(isotopes)
+    for i, r in zip(idxs, batch_fit(items)):
+        results[i] = r
+    return results
+
+
 class BaseMeasurement(object):
     unpack_error = None
     endianness = '>'
@@ -45,6 +67,32 @@ class BaseMeasurement(object):
     use_manual_error = False
 
     _n = None
+    _buffer = None
+    _online = None
+
+    @property
+    def xs(self):
+        if self._buffer is not None:
+            return self._buffer.xs
+        return self._xs
+
+    @xs.setter
+    def xs(self, v):
+        self._release_buffer()
+        self._online = None
+        self._xs = v
+
+    @property
+    def ys(self):
+        if self._buffer is not None:
+            return self._buffer.ys
+        return self._ys
+
+    @ys.setter
+    def ys(self, v):
+        self._release_buffer()
+        self._online = None
+        self._ys = v
 
     @property
     def n(self):
@@ -68,12 +116,37 @@ class BaseMeasurement(object):
         self.mass = 0
         self.time_zero_offset = 0
 
+    def append_data(self, x, y):
+        """
+            append a point. points are appended to a growable buffer instead of copying xs and ys
+        """
+        if self._buffer is None:
+            self._buffer = XYBuffer(self._xs, self._ys)
+        self._buffer.append(x, y)
+
+        if self._online is not None:
+            self._online.add(x, y)
+
+    def reserve(self, n):
+        """
+            make room for n points e.g. the number of counts of a measurement
+        """
+        if self._buffer is None:
+            self._buffer = XYBuffer(self._xs, self._ys, capacity=n)
+        else:
+            self._buffer.reserve(n)
+
+    def _release_buffer(self):
+        buf = self._buffer
+        if buf is not None:
+            self._xs, self._ys = buf.xs, buf.ys
+            self._buffer = None
+
     def pack(self, endianness=None, as_hex=True):
         if endianness is None:
             endianness = self.endianness
 
-        fmt = '{}ff'.format(endianness)
-        txt = ''.join((struct.pack(fmt, x, y) for x, y in izip(self.xs, self.ys)))
+        txt = pack_xy(self.xs, self.ys, endianness)
         if as_hex:
             txt = hexlify(txt)
         return txt
@@ -86,28 +159,23 @@ class BaseMeasurement(object):
             print e
             return
 
-        if n_only:
-            self.n = len(xs)
-        else:
-            self.xs = array(xs)
-            self.ys = array(ys)
+        self.set_data(xs, ys, n_only)
 
         # print self.name, self.xs.shape, self.ys.shape
         # print self.name, self.ys
 
+    def set_data(self, xs, ys, n_only=False):
+        if n_only:
+            self.n = len(xs)
+        else:
+            self.xs = asarray(xs, dtype=float)
+            self.ys = asarray(ys, dtype=float)
+
     def _unpack_blob(self, blob, endianness=None):
         if endianness is None:
             endianness = self.endianness
 
-        try:
-            x, y = zip(*[struct.unpack('{}ff'.format(endianness), blob[i:i + 8]) for i in xrange(0, len(blob), 8)])
-            if self.reverse_unpack:
-                return y, x
-            else:
-                return x, y
-
-        except struct.error, e:
-            print 'unpack_blob', e
+        return unpack_xy(blob, endianness, self.reverse_unpack)
 
     def get_slope(self, n):
         if self.xs.shape[0] and self.ys.shape[0] and self.xs.shape[0] == self.ys.shape[0]:
@@ -254,6 +322,61 @@ class IsotopicMeasurement(BaseMeasurement):
             # if notify:
             #     self._dirty = True
 
+    def get_batch_item(self):
+        """
+            return a BatchItem equivalent to fitting this measurement with its regressor
+        """
+        if self.use_stored_value or self.user_defined_value or self.user_defined_error:
+            return
+
+        if self.xs.shape[0] < 2:
+            return
+
+        excluded = []
+        reg = self._regressor
+        if reg is not None:
+            excluded = list(reg._get_base_excluded())
+
+        fit = self.fit or 'linear'
+        return BatchItem(self.offset_xs, self.ys, fit, self.error_type,
+                         self.filter_outliers_dict, excluded)
+
+    def set_online_regression(self, enabled):
+        """
+            enable an OnlineRegressor, updated by append_data, to serve value and error in O(1)
+            while data is collected.
+
+            only used when outliers are not filtered. return True if it is used
+        """
+        if enabled:
+            self._online = OnlineRegressor(self.xs, self.ys)
+            return not self.filter_outliers_dict.get('filter_outliers', False)
+        else:
+            self._online = None
+
+    def _get_online_args(self):
+        """
+            return (online regressor, degree, error_calc) or None if the online regressor cannot be used
+        """
+        online = self._online
+        if online is None or self.filter_outliers_dict.get('filter_outliers', False):
+            return
+
+        fit = self.fit
+        if not fit:
+            return
+
+        if 'average' in fit.lower():
+            return online, 0, self.error_type or 'SEM'
+
+        try:
+            degree = fit_to_degree(fit)
+        except ValueError:
+            return
+
+        if self.error_type != 'CI':
+            return online, degree, self.error_type
+
     def set_uvalue(self, v):
         if isinstance(v, tuple):
             self._value, self._error = v
@@ -279,6 +402,13 @@ class IsotopicMeasurement(BaseMeasurement):
         #     return self._value
 
         if not self.use_stored_value and not self.user_defined_value and self.xs.shape[0] > 1:
+            args = self._get_online_args()
+            if args:
+                online, degree, _ = args
+                v = online.predict(self.time_zero_offset, degree)
+                if v is not None:
+                    return v
+
             v = self.regressor.predict(0)
             return v
         else:
@@ -292,6 +422,13 @@ class IsotopicMeasurement(BaseMeasurement):
         #     return self._error
 
         if not self.use_stored_value and not self.user_defined_error and self.xs.shape[0] > 1:
+            args = self._get_online_args()
+            if args:
+                online, degree, error_calc = args
+                v = online.predict_error(self.time_zero_offset, degree, error_calc)
+                if v is not None:
+                    return v
+
             v = self.regressor.predict_error(0)
             return v
         else:
@@ -19,7 +19,6 @@ import logging
 import os
 from ConfigParser import ConfigParser
 
-from numpy import append as npappend
 from traits.api import Property, Dict, Str
 from traits.has_traits import HasTraits
 from uncertainties import ufloat
@@ -195,6 +194,31 @@ class IsotopeGroup(HasTraits):
         r = ufloat(*ic)
         return r
 
+    def reserve(self, n, kind):
+        """
+            make room for n more points of ``kind`` in every isotope
+        """
+        for iso in self.isotopes.itervalues():
+            if kind in ('sniff', 'baseline', 'whiff'):
+                iso = getattr(iso, kind)
+            iso.reserve(iso.xs.shape[0] + n)
+
+    def set_online_regression(self, enabled, kind):
+        """
+            enable or disable online regression of the ``kind`` data of every isotope.
+
+            return True if every isotope is served by its online regressor
+        """
+        ret = True
+        for iso in self.isotopes.itervalues():
+            if kind == 'baseline':
+                iso = iso.baseline
+            elif kind != 'signal':
+                continue
+
+            ret = iso.set_online_regression(enabled) and ret
+        return ret
+
     def append_data(self, iso, det, x, signal, kind):
         """
             if kind is baseline then key used to match isotope is `detector` not an `isotope_name`
@@ -211,13 +235,7 @@ class IsotopeGroup(HasTraits):
             if kind == 'sniff':
                 isotope._value = signal
 
-            xs = npappend(isotope.xs, x)
-            ys = npappend(isotope.ys, signal)
-            isotope.xs = xs
-            isotope.ys = ys
-            # isotope.trait_setq(xs=xs, ys=ys)
-            # isotope.xs = hstack((isotope.xs, (x,)))
-            # isotope.ys = hstack((isotope.ys, (signal,)))
+            isotope.append_data(x, signal)
             isotope.dirty = True
 
         isotopes = self.isotopes
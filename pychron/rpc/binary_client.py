@@ -0,0 +1,170 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import errno
+import socket
+from threading import Thread, Lock
+
+# ============= local library imports  ==========================
+from pychron.hardware.core.communicators.io_loop import Future, gather
+from pychron.loggable import Loggable
+from pychron.messaging.framing import FrameDecoder, FrameError, encode_frame, MAX_REQUEST_ID
+
+
+class BinaryClient(Loggable):
+    """
+    client for a BinaryServer.
+
+    requests are sent on one connection without waiting for earlier responses. a reader thread matches
+    responses to requests by id. the connection is made when needed and remade after an error
+    """
+
+    def __init__(self, host, port, timeout=3, *args, **kw):
+        super(BinaryClient, self).__init__(*args, **kw)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self._sock = None
+        self._lock = Lock()
+        self._futures = {}
+        self._rid = 0
+
+    def ask_async(self, cmd):
+        """
+        send ``cmd`` and return a Future for the response
+        """
+        future = Future()
+        with self._lock:
+            try:
+                sock = self._get_socket()
+            except socket.error, e:
+                future.set_exception(e)
+                return future
+
+            self._rid = rid = self._rid % MAX_REQUEST_ID + 1
+            future.rid = rid
+            self._futures[rid] = future
+            try:
+                sock.sendall(encode_frame(rid, cmd))
+            except socket.error, e:
+                self._reset(sock, e)
+        return future
+
+    def ask(self, cmd, timeout=None):
+        """
+        return the response to ``cmd`` or None if there was no response within ``timeout`` seconds
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        future = self.ask_async(cmd)
+        try:
+            return future.result(timeout)
+        except socket.error, e:
+            self._discard([future])
+            self.debug('ask {} failed: {}'.format(cmd, e))
+
+    def ask_many(self, cmds, timeout=None):
+        """
+        send all ``cmds`` then wait for the responses. return the responses in order, None for failures
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        futures = [self.ask_async(c) for c in cmds]
+        rs = gather(futures, timeout)
+        self._discard([f for f in futures if not f.done()])
+        return rs
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                self._reset(self._sock, socket.error(errno.ECONNABORTED, 'connection closed'))
+
+    # private
+    def _discard(self, futures):
+        """
+        forget requests that timed out
+        """
+        with self._lock:
+            for f in futures:
+                rid = getattr(f, 'rid', None)
+                if self._futures.get(rid) is f:
+                    del self._futures[rid]
+
+    def _get_socket(self):
+        if self._sock is None:
+            sock = socket.create_connection((self.host, self.port), self.timeout)
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = sock
+
+            t = Thread(target=self._read, args=(sock,), name='BinaryClient.reader')
+            t.setDaemon(True)
+            t.start()
+        return self._sock
+
+    def _read(self, sock):
+        decoder = FrameDecoder()
+        err = None
+        while 1:
+            try:
+                data = sock.recv(2 ** 14)
+            except socket.error, e:
+                err = e
+                break
+
+            if not data:
+                err = socket.error(errno.ECONNRESET, 'connection closed by {}:{}'.format(self.host, self.port))
+                break
+
+            try:
+                frames = decoder.feed(data)
+            except FrameError, e:
+                err = socket.error(errno.EPROTO, str(e))
+                break
+
+            for rid, payload in frames:
+                with self._lock:
+                    future = self._futures.pop(rid, None)
+                if future is not None:
+                    future.set_result(payload)
+
+        with self._lock:
+            self._reset(sock, err)
+
+    def _reset(self, sock, err):
+        """
+        close ``sock`` and fail its outstanding requests. must be called with the lock held
+        """
+        if sock is not self._sock:
+            return
+
+        self._sock = None
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        sock.close()
+
+        futures, self._futures = self._futures, {}
+        for f in futures.itervalues():
+            f.set_exception(err)
+
+# ============= EOF =============================================
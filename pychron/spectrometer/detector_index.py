@@ -0,0 +1,168 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from numpy import array, asarray, zeros, vstack
+
+# ============= local library imports  ==========================
+UNTAGGED_KEYS = ['H2', 'H1', 'AX', 'L1', 'L2', 'CDD']
+
+
+def parse_data(datastr, tagged=True):
+    """
+    parse a GetData response.
+
+    tagged: "H2,1.0,H1,100.0,..." otherwise "1.0,100.0,..." for ``UNTAGGED_KEYS``
+
+    return keys, signals (float array)
+    """
+    data = datastr.split(',')
+    if tagged:
+        keys = data[::2]
+        signals = data[1::2]
+    else:
+        keys = UNTAGGED_KEYS
+        signals = data
+
+    n = min(len(keys), len(signals))
+    return keys[:n], array(signals[:n], dtype=float)
+
+
+def alias(name):
+    """
+    detector names may be sent with "_" in place of parentheses e.g. L2_CDD_ for L2(CDD)
+    """
+    if name.endswith('_'):
+        name = '{})'.format(name[:-1])
+        name = name.replace('_', '(')
+    return name
+
+
+class DetectorIndex(object):
+    """
+    map names to detectors and update the intensities of many detectors at once.
+
+    the last ``nstd`` + 1 signals of each detector are kept in a single array so the standard deviations
+    of all detectors are computed together. the detectors' ``intensities`` and ``std`` are set without
+    notification and ``intensity`` is set last, so each detector notifies once per update
+    """
+
+    def __init__(self, detectors):
+        self._detectors = {}
+        for det in detectors:
+            self._detectors[det.name] = det
+
+        self._keys = None
+        self._columns = None
+        self._dets = None
+        self._groups = None
+        self._buffer = None
+        self._pos = 0
+        self._count = 0
+
+    def get(self, name):
+        try:
+            return self._detectors[name]
+        except KeyError:
+            return self._detectors.get(alias(name))
+
+    def update(self, keys, signals):
+        """
+        set the intensities of the detectors ``keys`` to ``signals``. unknown keys are ignored
+        """
+        keys = tuple(keys)
+        if keys != self._keys:
+            self._set_keys(keys)
+
+        if not self._columns:
+            return
+
+        signals = asarray(signals, dtype=float)[self._columns]
+        buf = self._buffer
+        buf[self._pos] = signals
+        self._pos = (self._pos + 1) % len(buf)
+        self._count = min(self._count + 1, len(buf))
+
+        window = self._window()
+        for n, idx, dets in self._groups:
+            w = window[-n:, idx]
+            stds = w.std(axis=0)
+            for i, det in enumerate(dets):
+                det.trait_setq(intensities=w[:, i], std='{:0.5f}'.format(stds[i]))
+
+        for det, v in zip(self._dets, signals):
+            det.intensity = '{:0.5f}'.format(v)
+
+    def _window(self):
+        """
+        return the buffered signals in chronological order
+        """
+        buf, pos, count = self._buffer, self._pos, self._count
+        if count < len(buf):
+            return buf[:count]
+        return vstack((buf[pos:], buf[:pos]))
+
+    def _set_keys(self, keys):
+        columns, dets = [], []
+        for i, k in enumerate(keys):
+            det = self.get(k)
+            if det is not None:
+                columns.append(i)
+                dets.append(det)
+
+        groups = {}
+        for i, det in enumerate(dets):
+            groups.setdefault(det.nstd + 1, []).append(i)
+
+        self._keys = keys
+        self._columns = columns
+        self._dets = dets
+        self._groups = [(n, idx, [dets[i] for i in idx]) for n, idx in groups.iteritems()]
+        self._buffer = zeros((max(groups) if groups else 1, len(dets)))
+        self._pos = 0
+        self._count = 0
+
+
+if __name__ == '__main__':
+    import timeit
+
+    from pychron.spectrometer.base_detector import BaseDetector
+
+    # simulation data from ThermoSpectrometer._get_simulation_data
+    keys = ['H2', 'H1', 'AX', 'L1', 'L2', 'CDD']
+    signals = [1, 100, 3, 0.01, 0.01, 0.01]
+    datastr = ','.join('{},{}'.format(k, v) for k, v in zip(keys, signals))
+
+    detectors = [BaseDetector(name=k) for k in keys]
+    index = DetectorIndex(detectors)
+
+    def per_detector():
+        data = datastr.split(',')
+        for k, v in zip(data[::2], map(float, data[1::2])):
+            det = next((d for d in detectors if d.name == k), None)
+            det.set_intensity(v)
+
+    def batch():
+        ks, vs = parse_data(datastr)
+        index.update(ks, vs)
+
+    n = 5000
+    for f in (per_detector, batch):
+        t = timeit.timeit(f, number=n)
+        print '{:<15s} {:0.1f}us'.format(f.func_name, t / n * 1e6)
+
+# ============= EOF =============================================
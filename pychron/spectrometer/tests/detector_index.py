@@ -0,0 +1,61 @@
+import unittest
+
+from numpy import array
+
+from pychron.spectrometer.base_detector import BaseDetector
+from pychron.spectrometer.detector_index import DetectorIndex, parse_data, UNTAGGED_KEYS
+
+
+class DetectorIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.detectors = [BaseDetector(name=n) for n in ('H2', 'H1', 'AX', 'L2(CDD)')]
+        self.index = DetectorIndex(self.detectors)
+
+    def test_parse_tagged(self):
+        keys, signals = parse_data('H2,1.0,H1,100.5,AX,3e-3')
+        self.assertEqual(keys, ['H2', 'H1', 'AX'])
+        self.assertEqual(list(signals), [1.0, 100.5, 0.003])
+
+    def test_parse_untagged(self):
+        keys, signals = parse_data('1,2,3,4,5,6', tagged=False)
+        self.assertEqual(keys, UNTAGGED_KEYS)
+        self.assertEqual(list(signals), [1, 2, 3, 4, 5, 6])
+
+    def test_parse_truncated(self):
+        keys, signals = parse_data('H2,1.0,H1')
+        self.assertEqual(keys, ['H2'])
+        self.assertEqual(list(signals), [1.0])
+
+    def test_get(self):
+        self.assertIs(self.index.get('H1'), self.detectors[1])
+        self.assertIs(self.index.get('L2_CDD_'), self.detectors[3])
+        self.assertIsNone(self.index.get('L1'))
+
+    def test_update(self):
+        self.index.update(['H2', 'L1', 'H1'], array([1.0, 2.0, 3.0]))
+        self.assertEqual(self.detectors[0].intensity, '1.00000')
+        self.assertEqual(self.detectors[1].intensity, '3.00000')
+
+    def test_update_matches_set_intensity(self):
+        ref = BaseDetector(name='H1', nstd=3)
+        det = BaseDetector(name='H1', nstd=3)
+        index = DetectorIndex([det])
+
+        for v in (1, 5, 2, 8, 3, 9, 4):
+            ref.set_intensity(v)
+            index.update(['H1'], [v])
+
+            self.assertEqual(det.intensity, ref.intensity)
+            self.assertEqual(det.std, ref.std)
+            self.assertEqual(list(det.intensities), list(ref.intensities))
+
+    def test_notifications(self):
+        changes = []
+        det = self.detectors[0]
+        det.on_trait_change(lambda name, new: changes.append(name), 'intensity,std,intensities')
+        self.index.update(['H2'], [1.0])
+        self.assertEqual(changes, ['intensity'])
+
+
+if __name__ == '__main__':
+    unittest.main()
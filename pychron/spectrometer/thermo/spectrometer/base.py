@@ -33,6 +33,7 @@ from pychron.pychron_constants import QTEGRA_INTEGRATION_TIMES, \
 from pychron.spectrometer import get_spectrometer_config_path, \
     get_spectrometer_config_name, set_spectrometer_config_name
 from pychron.spectrometer.base_detector import BaseDetector
+from pychron.spectrometer.detector_index import DetectorIndex, parse_data
 from pychron.spectrometer.thermo.detector.base import ThermoDetector
 from pychron.spectrometer.thermo.magnet.base import ThermoMagnet
 from pychron.spectrometer.thermo.source.base import ThermoSource
@@ -106,6 +107,7 @@ class ThermoSpectrometer(SpectrometerDevice):
     _config = None
     _debug_values = None
     _saved_integration = None
+    _detector_index = None
 
     def reload_mftable(self):
         self.magnet.reload_mftable()
@@ -297,11 +299,13 @@ class ThermoSpectrometer(SpectrometerDevice):
         if isinstance(name, BaseDetector):
             return name
         else:
-            if name.endswith('_'):
-                name = '{})'.format(name[:-1])
-                name = name.replace('_', '(')
+            return self.detector_index.get(name)
 
-            return next((det for det in self.detectors if det.name == name), None)
+    @property
+    def detector_index(self):
+        if self._detector_index is None:
+            self._detector_index = DetectorIndex(self.detectors)
+        return self._detector_index
 
     def map_isotope(self, mass):
         """
@@ -573,26 +577,17 @@ class ThermoSpectrometer(SpectrometerDevice):
             # keys, signals = self._get_simulation_data()
             # else:
             datastr = self.ask('GetData', verbose=False, quiet=True)
-            if datastr:
-                if 'ERROR' not in datastr:
-                    data = datastr.split(',')
-                    if tagged:
-                        keys = data[::2]
-                        signals = data[1::2]
-                    else:
-                        keys = ['H2', 'H1', 'AX', 'L1', 'L2', 'CDD']
-                        signals = data
-
-                signals = map(float, signals)
+            if datastr and 'ERROR' not in datastr:
+                keys, signals = parse_data(datastr, tagged)
 
         if not keys and globalv.communication_simulation:
             keys, signals = self._get_simulation_data()
 
-        for k, v in zip(keys, signals):
-            det = self.get_detector(k)
-            det.set_intensity(v)
+        signals = array(signals, dtype=float)
+        if keys:
+            self.detector_index.update(keys, signals)
 
-        return keys, array(signals)
+        return keys, signals
 
     def get_intensity(self, dkeys):
         """
@@ -706,6 +701,12 @@ class ThermoSpectrometer(SpectrometerDevice):
     # ===============================================================================
     # private
     # ===============================================================================
+    def _detectors_changed(self):
+        self._detector_index = None
+
+    def _detectors_items_changed(self):
+        self._detector_index = None
+
     def _spectrometer_configuration_changed(self, new):
         if new:
             set_spectrometer_config_name(new)
@@ -21,6 +21,10 @@ def suite():
     from pychron.experiment.tests.peak_hop_parse import PeakHopYamlCase1
     from pychron.experiment.tests.peak_hop_parse import PeakHopYamlCase2
     from pychron.spectrometer.tests.mftable import MFTableTestCase, DiscreteMFTableTestCase
+    from pychron.spectrometer.tests.detector_index import DetectorIndexTestCase
+    from pychron.messaging.tests.bin_server import FramingTestCase, BinaryServerTestCase
+    from pychron.dvc.tests.commit_queue import CommitQueueTestCase
+    from pychron.dvc.tests.offline_index import OfflineIndexTestCase
     from pychron.experiment.tests.peak_hop_parse import PeakHopTxtCase
     from pychron.entry.tests.usgs_menlo_file_source import USGSMenloFileSourceUnittest
     from pychron.canvas.canvas2D.tests.calibration_item import CalibrationObjectTestCase
@@ -28,6 +32,8 @@ def suite():
     from pychron.core.tests.spell_correct import SpellCorrectTestCase
     from pychron.core.tests.filtering_tests import FilteringTestCase
     from pychron.core.stats.tests.peak_detection_test import MultiPeakDetectionTestCase
+    from pychron.core.stats.tests.monte_carlo_test import MonteCarloTestCase
+    from pychron.core.stats.tests.probability_curves_test import ProbabilityCurvesTestCase
     from pychron.experiment.tests.repository_identifier import ExperimentIdentifierTestCase
 
     from pychron.stage.tests.stage_map import StageMapTestCase, \
@@ -35,12 +41,23 @@ def suite():
     # from pychron.entry.tests.sample_loader import SampleLoaderTestCase
     from pychron.core.helpers.tests.floatfmt import FloatfmtTestCase
     from pychron.core.helpers.tests.strtools import CamelCaseTestCase
+    from pychron.core.helpers.tests.binpack import BinpackTestCase
+    from pychron.core.helpers.tests.xy_buffer import XYBufferTestCase
+    from pychron.managers.data_managers.tests.buffered_table_writer import BufferedTableWriterTestCase
+    from pychron.experiment.tests.prefetch_reader_test import PrefetchReaderTestCase
+    from pychron.hardware.core.communicators.tests.ethernet_communicator import ConnectionPoolTestCase, \
+        LatencyHistogramTestCase, EthernetCommunicatorTestCase
+    from pychron.hardware.core.communicators.tests.async_ethernet_communicator import \
+        AsyncEthernetCommunicatorTestCase
+    from pychron.dashboard.tests.scheduler import PollSchedulerTestCase
+    from pychron.hardware.core.communicators.tests.scheduler import CommunicationSchedulerTestCase
     # from pychron.processing.tests.analysis_modifier import AnalysisModifierTestCase
     from pychron.experiment.tests.backup import BackupTestCase
     from pychron.core.xml.tests.xml_parser import XMLParserTestCase
     # from pychron.entry.tests.analysis_loader import XLSAnalysisLoaderTestCase
     from pychron.core.regression.tests.regression import OLSRegressionTest, MeanRegressionTest, \
-        FilterOLSRegressionTest, OLSRegressionTest2
+        FilterOLSRegressionTest, OLSRegressionTest2, OutlierFilterTest, BatchRegressorTest, \
+        OnlineRegressorTest
     from pychron.experiment.tests.frequency_test import FrequencyTestCase, FrequencyTemplateTestCase
     from pychron.experiment.tests.position_regex_test import XYTestCase
     from pychron.experiment.tests.renumber_aliquot_test import RenumberAliquotTestCase
@@ -53,6 +70,9 @@ def suite():
     from pychron.experiment.tests.conditionals import ConditionalsTestCase, ParseConditionalsTestCase
     from pychron.experiment.tests.identifier import IdentifierTestCase
     from pychron.experiment.tests.comment_template import CommentTemplaterTestCase
+    from pychron.dvc.tests.columnar import ColumnarTestCase
+    from pychron.dvc.tests.cache import AnalysisFileCacheTestCase
+    from pychron.dvc.tests.persistent_cache import PersistentAnalysisCacheTestCase
 
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
@@ -69,6 +89,8 @@ def suite():
              # SimilarTestCase,
              FilteringTestCase,
              MultiPeakDetectionTestCase,
+             MonteCarloTestCase,
+             ProbabilityCurvesTestCase,
              ExperimentIdentifierTestCase,
              StageMapTestCase,
              TransformTestCase,
@@ -84,7 +106,7 @@ def suite():
              InterpolationTestCase,
              DocstrContextTestCase,
              OLSRegressionTest,
-             OLSRegressionTest2,
+             OLSRegressionTest2, OutlierFilterTest, BatchRegressorTest, OnlineRegressorTest,
              MeanRegressionTest,
              FilterOLSRegressionTest,
              PlateauTestCase,
@@ -98,8 +120,17 @@ def suite():
              ParseConditionalsTestCase,
              IdentifierTestCase,
              CommentTemplaterTestCase,
+             ColumnarTestCase,
+             AnalysisFileCacheTestCase,
+             PersistentAnalysisCacheTestCase,
              FloatfmtTestCase,
-             CamelCaseTestCase)
+             CamelCaseTestCase,
+             BinpackTestCase,
+             XYBufferTestCase, BufferedTableWriterTestCase, PrefetchReaderTestCase,
+             ConnectionPoolTestCase, LatencyHistogramTestCase, EthernetCommunicatorTestCase,
+             AsyncEthernetCommunicatorTestCase, PollSchedulerTestCase,
+             CommunicationSchedulerTestCase, DetectorIndexTestCase, FramingTestCase, BinaryServerTestCase,
+             OfflineIndexTestCase, CommitQueueTestCase)
 
     for t in tests:
         suite.addTest(loader.loadTestsFromTestCase(t))
@@ -0,0 +1,65 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import struct
+import timeit
+from itertools import izip
+
+from numpy import linspace, array
+from numpy.random import random
+
+# ============= local library imports  ==========================
+from pychron.core.helpers.binpack import unpack_xy, pack_xy
+
+
+def struct_unpack(blob, endianness='>'):
+    fmt = '{}ff'.format(endianness)
+    x, y = zip(*[struct.unpack(fmt, blob[i:i + 8]) for i in xrange(0, len(blob), 8)])
+    return array(x), array(y)
+
+
+def struct_pack(xs, ys, endianness='>'):
+    fmt = '{}ff'.format(endianness)
+    return ''.join((struct.pack(fmt, x, y) for x, y in izip(xs, ys)))
+
+
+def numpy_unpack(blob, endianness='>'):
+    xs, ys = unpack_xy(blob, endianness)
+    return xs.astype(float), ys.astype(float)
+
+
+def bench(func, args, number):
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=3)) / number
+
+
+if __name__ == '__main__':
+    print '{:>8s} {:>12s} {:>12s} {:>8s} {:>12s} {:>12s} {:>8s}'.format('n', 'unpack', 'frombuffer', 'x',
+                                                                         'pack', 'tostring', 'x')
+    for n in (1000, 10000, 100000):
+        xs = linspace(0, 1000, n)
+        ys = random(n) * 1000
+        blob = pack_xy(xs, ys)
+
+        number = max(1, 100000 / n)
+        a = bench(struct_unpack, (blob,), number)
+        b = bench(numpy_unpack, (blob,), number)
+        c = bench(struct_pack, (xs, ys), number)
+        d = bench(pack_xy, (xs, ys), number)
+        print '{:>8d} {:>12.6f} {:>12.6f} {:>8.1f} {:>12.6f} {:>12.6f} {:>8.1f}'.format(n, a, b, a / b, c, d, c / d)
+
+# ============= EOF =============================================
@@ -0,0 +1,61 @@
+# ===============================================================================
+# Copyright 2016 Jake Ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import timeit
+
+from numpy import linspace, matrix, sqrt, allclose
+from numpy.random import normal
+
+# ============= local library imports  ==========================
+from pychron.core.regression.ols_regressor import PolynomialRegressor
+
+
+def loop_predict_error(reg, x):
+    """
+    per point implementation predict_error_matrix used before it was vectorized
+    """
+    sef = reg.calculate_standard_error_fit()
+    covarM = matrix(reg.var_covar)
+
+    def calc_hat(xi):
+        Xk = reg._get_X(xi).T
+        return (Xk.T * covarM * Xk)[0, 0]
+
+    return [sef * sqrt(calc_hat(xi)) for xi in x]
+
+
+def bench(func, args, number):
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=3)) / number
+
+
+if __name__ == '__main__':
+    xs = linspace(0, 100, 50)
+    print '{:>10s} {:>6s} {:>12s} {:>12s} {:>8s}'.format('fit', 'n', 'loop', 'einsum', 'x')
+    for fit in ('linear', 'parabolic', 'cubic'):
+        reg = PolynomialRegressor(xs=xs, ys=2 + 0.5 * xs + normal(size=xs.shape[0]), fit=fit)
+        reg.calculate()
+        for n in (500, 1000, 2000, 5000):
+            rx = linspace(-10, 110, n)
+            assert allclose(loop_predict_error(reg, rx), reg.predict_error_matrix(rx))
+
+            number = max(1, 5000 / n)
+            a = bench(loop_predict_error, (reg, rx), number)
+            b = bench(reg.predict_error_matrix, (rx,), number)
+            print '{:>10s} {:>6d} {:>12.6f} {:>12.6f} {:>8.1f}'.format(fit, n, a, b, a / b)
+
+# ============= EOF =============================================